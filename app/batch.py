@@ -0,0 +1,230 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from app.budgets import DEFAULT_BUDGET, Budget, BudgetExceeded, add_budget_arguments, budget_from_args, check_document
+from app.documents import DocumentStore
+from app.open_api_scorer import OpenAPIScorer
+from app.schema_cache import SchemaResultCache
+from app.scorer_registry import parse_names, select_scorers
+from app.spec_cache import SpecCache
+from app.validator import OpenAPIValidator
+
+SPEC_SUFFIXES = ('.json', '.yaml', '.yml')
+
+# One document store and schema result cache per process (and cache dir), shared by every spec a worker scores
+_document_stores: Dict[Tuple[Optional[str], Budget], DocumentStore] = {}
+_schema_results: Dict[Optional[str], SchemaResultCache] = {}
+
+
+def document_store(cache_dir: Optional[str] = None, budget: Budget = DEFAULT_BUDGET) -> DocumentStore:
+    """The store external $refs are loaded through in this process."""
+    store = _document_stores.get((cache_dir, budget))
+    if store is None:
+        cache = SpecCache(cache_dir) if cache_dir else SpecCache.from_env()
+        options = {'cache_dir': os.path.join(cache_dir, 'http')} if cache_dir else {}
+        store = _document_stores[cache_dir, budget] = DocumentStore(cache, fetch_options=options, budget=budget)
+    return store
+
+
+def schema_result_cache(cache_dir: Optional[str] = None) -> SchemaResultCache:
+    """
+    The cache SchemaTypesScorer's component results are shared through across
+    the specs scored in this process, persisted under `cache_dir` when given.
+    """
+    cache = _schema_results.get(cache_dir)
+    if cache is None:
+        directory = os.path.join(cache_dir, 'schema-results') if cache_dir else None
+        cache = _schema_results[cache_dir] = SchemaResultCache(directory=directory)
+    return cache
+
+
+def collect_sources(inputs: Iterable[str], manifest: Optional[str] = None) -> List[str]:
+    """
+    Expand directories, glob patterns and an optional manifest file into spec sources.
+    Directories are searched recursively for .json/.yaml/.yml files. Manifest files
+    list one source (path or URL) per line; blank lines and '#' comments are ignored.
+    Returns: de-duplicated sources in input order
+    """
+    sources = []
+
+    for item in inputs:
+        if item.startswith(('http://', 'https://')):
+            sources.append(item)
+        elif os.path.isdir(item):
+            sources.extend(sorted(
+                str(path) for path in Path(item).rglob('*')
+                if path.suffix.lower() in SPEC_SUFFIXES and path.is_file()
+            ))
+        elif glob.has_magic(item):
+            sources.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            sources.append(item)
+
+    if manifest:
+        base = Path(manifest).parent
+        for line in Path(manifest).read_text().splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith(('http://', 'https://')) or os.path.isabs(line):
+                sources.append(line)
+            else:
+                sources.append(str(base / line))
+
+    return list(dict.fromkeys(sources))
+
+
+def structure_errors(spec: Dict[str, Any]) -> List[str]:
+    """OpenAPIValidator.validate_structure(), reporting a spec it cannot check (too deep to walk) as invalid."""
+    try:
+        return OpenAPIValidator.validate_structure(spec)
+    except Exception as e:
+        return [f'Spec structure could not be checked : {type(e).__name__}']
+
+
+def score_source(source: str, loaded: Optional[Tuple[Optional[dict], Optional[str]]] = None,
+                 cache_dir: Optional[str] = None, only: Optional[List[str]] = None,
+                 skip: Optional[List[str]] = None, strict: bool = False,
+                 documents: Optional[DocumentStore] = None, budget: Budget = DEFAULT_BUDGET,
+                 external_refs: bool = False) -> Dict[str, Any]:
+    """
+    Load, validate and score a single spec. Never raises, so that one bad
+    spec cannot abort a batch. `loaded` is a (spec, error) pair already
+    fetched by the caller; `only` / `skip` select categories. With `strict`,
+    specs with structural errors are not scored. External $refs are only
+    followed when the caller asks for it, with `external_refs` (through the
+    process-wide document_store()) or by passing `documents`: they read local
+    files and fetch URLs named by the spec. Specs over the limits of `budget`
+    are refused, and categories that run out of time are marked truncated.
+    Returns: report entry with either 'results' or 'error'
+    """
+    if documents is None and external_refs:
+        documents = document_store(cache_dir, budget)
+    if loaded is not None:
+        spec, load_error = loaded
+        if load_error is None:
+            try:
+                check_document(spec, budget)
+            except BudgetExceeded as e:
+                spec, load_error = None, f"Failed to load : {e}"
+        if load_error is None and isinstance(spec, dict) and documents is not None:
+            documents.bundle(spec, source)
+    elif documents is not None:
+        spec, load_error = documents.load_spec(source)
+    else:
+        cache = SpecCache(cache_dir) if cache_dir else SpecCache.from_env()
+        spec, load_error = OpenAPIValidator.load_openapi_spec(source, cache, budget)
+    if load_error:
+        return {'source': source, 'error': load_error}
+
+    errors = OpenAPIValidator.validate_spec_dict(spec)
+    if not errors and strict:
+        errors = structure_errors(spec)
+    if errors:
+        return {'source': source, 'error': 'Validation failed', 'validation_errors': errors}
+
+    try:
+        results = OpenAPIScorer(spec, only=only, skip=skip, budget=budget,
+                                schema_results=schema_result_cache(cache_dir)).score_all()
+    except Exception as e:
+        # The structural errors usually point at what the scorer tripped over
+        return {'source': source, 'error': f"Failed to score : {e}",
+                'validation_errors': structure_errors(spec)}
+
+    return {'source': source, 'results': results}
+
+
+def run_batch(sources: List[str], workers: Optional[int] = None, chunksize: Optional[int] = None,
+              cache_dir: Optional[str] = None, only: Optional[List[str]] = None,
+              skip: Optional[List[str]] = None, strict: bool = False,
+              budget: Budget = DEFAULT_BUDGET, external_refs: bool = True) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # A few chunks per worker keeps the pool busy without per-spec IPC overhead
+        chunksize = max(1, len(sources) // (workers * 4))
+
+    # Remote specs are fetched up front over pooled connections instead of one urlopen per worker call
+    urls = [source for source in sources if source.startswith(('http://', 'https://'))]
+    fetched = {}
+    if urls:
+        from app.fetcher import fetch_specs
+
+        http_cache = os.path.join(cache_dir, 'http') if cache_dir else None
+        fetched = dict(zip(urls, fetch_specs(urls, cache_dir=http_cache, budget=budget)))
+    loaded = [fetched.get(source) for source in sources]
+
+    score = partial(score_source, cache_dir=cache_dir, only=only, skip=skip, strict=strict, budget=budget,
+                    external_refs=external_refs)
+    if workers == 1 or len(sources) <= 1:
+        entries = [score(source, item) for source, item in zip(sources, loaded)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(score, sources, loaded, chunksize=chunksize))
+
+    return {
+        'specs': entries,
+        'summary': summarize(entries)
+    }
+
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    scored = [entry['results']['total'] for entry in entries if 'results' in entry]
+    grades = Counter(total['grade'] for total in scored)
+
+    return {
+        'count': len(entries),
+        'scored': len(scored),
+        'failed': len(entries) - len(scored),
+        'average_score': round(sum(total['score'] for total in scored) / len(scored), 1) if scored else 0,
+        'grades': {grade: grades[grade] for grade in sorted(grades)}
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.batch',
+                                     description='Score many OpenAPI specs in parallel.')
+    parser.add_argument('inputs', nargs='*', help='spec files, directories, glob patterns or URLs')
+    parser.add_argument('--manifest', help='file listing one spec source per line')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=None, help='specs sent to a worker at a time')
+    parser.add_argument('--cache-dir', help='cache parsed specs here, keyed by content hash')
+    parser.add_argument('--only', help='comma-separated categories to score, e.g. security,response_codes')
+    parser.add_argument('--skip', help='comma-separated categories to leave out, e.g. examples')
+    parser.add_argument('--strict', action='store_true',
+                        help='fail specs that do not conform to the full OpenAPI 3.0/3.1 structure')
+    add_budget_arguments(parser)
+    parser.add_argument('-o', '--output', help='write the report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    only, skip = parse_names(args.only), parse_names(args.skip)
+    try:
+        select_scorers(only, skip)
+    except ValueError as e:
+        parser.error(str(e))
+
+    sources = collect_sources(args.inputs, args.manifest)
+    if not sources:
+        parser.error('no spec sources found')
+
+    report = run_batch(sources, workers=args.workers, chunksize=args.chunksize, cache_dir=args.cache_dir,
+                       only=only, skip=skip, strict=args.strict, budget=budget_from_args(args))
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+    return 1 if report['summary']['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,39 @@
 
 from typing import Dict, Any
+from app.issues import Index, IssueCode
 from app.scoring_strategy import ScoringStrategy
+from app.spec_index import CRUD_METHODS
 
 
 class BestPracticesScorer(ScoringStrategy):
     """Score miscellaneous best practices."""
 
+    operation_methods = CRUD_METHODS
+    path_counters = ('schemas_used',)
+
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 10
+        self.schemas_used = False
+
+    def begin(self) -> None:
+        super().begin()
+        self.schemas_used = False
+
+    def visit_parameter(self, path: str, method: str, param: Dict[str, Any]) -> None:
+        if '$ref' in param.get('schema', {}):
+            self.schemas_used = True
+
+    def visit_request_media_type(self, path: str, method: str, content_type: str, content: Dict[str, Any]) -> None:
+        if '$ref' in content.get('schema', {}):
+            self.schemas_used = True
+
+    def visit_response_media_type(self, path: str, method: str, code: str, content_type: str,
+                                  content: Dict[str, Any]) -> None:
+        if '$ref' in content.get('schema', {}):
+            self.schemas_used = True
 
-    def score(self) -> float:
+    def finish(self) -> float:
         max_points = self.max_score
         score = 0
 
@@ -18,87 +41,35 @@ class BestPracticesScorer(ScoringStrategy):
             score += 2
             for i, server in enumerate(self.spec['servers']):
                 if not server.get('description'):
-                    self.issues.append({
-                        'location': f'servers[{i}]',
-                        'message': 'Server entry missing description',
-                        'severity': 'low'
-                    })
+                    self.add_issue(IssueCode.SERVER_MISSING_DESCRIPTION, ('servers', Index(i)))
         else:
-            self.issues.append({
-                'location': 'servers',
-                'message': 'No servers defined',
-                'severity': 'medium'
-            })
+            self.add_issue(IssueCode.NO_SERVERS, ('servers',))
 
         if self.spec.get('info', {}).get('version'):
             score += 2
         else:
-            self.issues.append({
-                'location': 'info',
-                'message': 'No API version specified',
-                'severity': 'medium'
-            })
+            self.add_issue(IssueCode.NO_API_VERSION, ('info',))
 
         if 'tags' in self.spec and len(self.spec['tags']) > 0:
             score += 2
             for i, tag in enumerate(self.spec['tags']):
                 if not tag.get('description'):
-                    self.issues.append({
-                        'location': f'tags[{i}]',
-                        'message': 'Tag missing description',
-                        'severity': 'low'
-                    })
+                    self.add_issue(IssueCode.TAG_MISSING_DESCRIPTION, ('tags', Index(i)))
         else:
-            self.issues.append({
-                'location': 'tags',
-                'message': 'No tags defined',
-                'severity': 'low'
-            })
+            self.add_issue(IssueCode.NO_TAGS, ('tags',))
 
         components = self.spec.get('components', {})
         if any(components.values()):
             score += 2
-            schemas_used = False
-            for path, path_item in self.spec.get('paths', {}).items():
-                for method, operation in path_item.items():
-                    if method.lower() not in ['get', 'post', 'put', 'patch', 'delete']:
-                        continue
-
-                    for param in operation.get('parameters', []):
-                        if '$ref' in param.get('schema', {}):
-                            schemas_used = True
-
-                    if 'requestBody' in operation:
-                        for content in operation['requestBody'].get('content', {}).values():
-                            if '$ref' in content.get('schema', {}):
-                                schemas_used = True
-
-                    for response in operation.get('responses', {}).values():
-                        for content in response.get('content', {}).values():
-                            if '$ref' in content.get('schema', {}):
-                                schemas_used = True
-
-            if not schemas_used and 'schemas' in components:
-                self.issues.append({
-                    'location': 'components.schemas',
-                    'message': 'Schemas defined but not referenced',
-                    'severity': 'medium'
-                })
+            if not self.schemas_used and 'schemas' in components:
+                self.add_issue(IssueCode.SCHEMAS_NOT_REFERENCED, ('components', 'schemas'))
                 score -= 1
         else:
-            self.issues.append({
-                'location': 'components',
-                'message': 'No components defined',
-                'severity': 'low'
-            })
+            self.add_issue(IssueCode.NO_COMPONENTS, ('components',))
 
         if self.spec.get('info', {}).get('contact'):
             score += 2
         else:
-            self.issues.append({
-                'location': 'info.contact',
-                'message': 'No contact information provided',
-                'severity': 'low'
-            })
+            self.add_issue(IssueCode.NO_CONTACT, ('info', 'contact'))
 
-        return min(score, max_points)
\ No newline at end of file
+        return min(score, max_points)
@@ -0,0 +1,114 @@
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_MAX_NODES = 10_000_000
+DEFAULT_MAX_DEPTH = 512
+
+
+class Budget(NamedTuple):
+    """Limits that keep a pathological spec from stalling a run; None lifts a limit.
+
+    `max_bytes` bounds the raw document, `max_nodes` the number of values in
+    it and `max_depth` its nesting, both counted as if every YAML alias were
+    expanded. `scorer_seconds` is the time each scorer may spend on a spec.
+    """
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    max_nodes: Optional[int] = DEFAULT_MAX_NODES
+    max_depth: Optional[int] = DEFAULT_MAX_DEPTH
+    scorer_seconds: Optional[float] = None
+
+
+DEFAULT_BUDGET = Budget()
+UNLIMITED = Budget(None, None, None, None)
+
+
+class BudgetExceeded(ValueError):
+    pass
+
+
+def check_size(size: int, budget: Budget) -> None:
+    if budget.max_bytes is not None and size > budget.max_bytes:
+        raise BudgetExceeded(f'Spec is {size} bytes, more than the limit of {budget.max_bytes}')
+
+
+def check_document(document: Any, budget: Budget) -> None:
+    """
+    Raise BudgetExceeded if `document` has more values or deeper nesting than
+    `budget` allows. The document is counted one level at a time, so values
+    shared through YAML aliases count at every place they appear: an alias
+    bomb (or a recursive alias) is stopped as soon as it exceeds the budget,
+    long before it would be expanded in full.
+    """
+    max_nodes = budget.max_nodes if budget.max_nodes is not None else float('inf')
+    max_depth = budget.max_depth if budget.max_depth is not None else float('inf')
+    if max_nodes == max_depth == float('inf'):
+        return
+
+    values = 1
+    depth = 0
+    level = [document] if isinstance(document, (dict, list)) else []
+    while level:
+        depth += 1
+        if depth > max_depth:
+            raise BudgetExceeded(f'Spec nesting is deeper than the limit of {budget.max_depth}')
+        below = []
+        for node in level:
+            children = node.values() if type(node) is dict else node
+            values += len(children)
+            if values > max_nodes:
+                raise BudgetExceeded(f'Spec has more than {budget.max_nodes} values (YAML aliases expanded)')
+            below.extend([child for child in children if type(child) is dict or type(child) is list])
+        level = below
+
+
+def add_budget_arguments(parser: Any) -> None:
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help=f'refuse specs larger than this (default: {DEFAULT_MAX_BYTES})')
+    parser.add_argument('--max-nodes', type=int, default=DEFAULT_MAX_NODES,
+                        help=f'refuse specs with more values, YAML aliases expanded (default: {DEFAULT_MAX_NODES})')
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH,
+                        help=f'refuse specs nested deeper than this (default: {DEFAULT_MAX_DEPTH})')
+    parser.add_argument('--scorer-timeout', type=float, metavar='SECONDS',
+                        help='stop a category after this much time and mark it truncated')
+
+
+def budget_from_args(args: Any) -> Budget:
+    return Budget(args.max_bytes, args.max_nodes, args.max_depth, args.scorer_timeout)
+
+
+class ScorerClock:
+    """Charge each scorer for the time its callbacks take, detaching it once its budget is spent.
+
+    Used as SpecWalker's `guard`. A detached scorer is marked `truncated`; its
+    remaining callbacks are skipped and it is scored on what it saw. Scorers
+    with long loops inside a single callback can call out_of_time() to stop
+    early as well.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def start(self, scorer: Any) -> None:
+        scorer.truncated = False
+        scorer.time_left = self.seconds
+        scorer.deadline = None
+
+    def __call__(self, callback: Callable) -> Callable:
+        scorer = callback.__self__
+        clock = time.perf_counter
+
+        def guarded(*args: Any) -> None:
+            if scorer.truncated:
+                return
+            started = clock()
+            scorer.deadline = started + scorer.time_left
+            try:
+                callback(*args)
+            finally:
+                scorer.time_left -= clock() - started
+                scorer.deadline = None
+                if scorer.time_left <= 0:
+                    scorer.truncated = True
+
+        return guarded
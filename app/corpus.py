@@ -0,0 +1,326 @@
+import argparse
+import bisect
+import csv
+import json
+import math
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, TextIO, Tuple, Union
+
+from app.issues import IssueCode, Severity
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised where numpy is not installed
+    np = None
+
+GRADES = ('A', 'B', 'C', 'D', 'F')
+UNKNOWN_CODE = 'OTHER'
+MAGIC = b'OASCORP1'
+
+
+class _MessageCodes:
+    """Map rendered issue messages back to their IssueCode name."""
+
+    def __init__(self):
+        self._exact = {}
+        self._patterns: List[Tuple[re.Pattern, str]] = []
+        for code in IssueCode:
+            if '{}' in code.template:
+                pattern = '^' + '(.*)'.join(map(re.escape, code.template.split('{}'))) + '$'
+                self._patterns.append((re.compile(pattern, re.S), code.name))
+            else:
+                self._exact[code.template] = code.name
+        self._memo: Dict[str, str] = {}
+
+    def lookup(self, message: str) -> str:
+        code = self._memo.get(message)
+        if code is None:
+            code = self._exact.get(message)
+            if code is None:
+                code = next((name for pattern, name in self._patterns if pattern.match(message)), UNKNOWN_CODE)
+            self._memo[message] = code
+        return code
+
+
+class Corpus:
+    """Scores of many specs stored column-wise for fast aggregation.
+
+    Every scored spec is one row. Columns are flat `array`s: 'total', one per
+    category, 'issues.<severity>' and 'code.<ISSUE_CODE>' counts, plus the
+    grade as an index into GRADES. Categories that were not scored for a spec
+    hold NaN and are left out of aggregations. Aggregations use NumPy views of
+    the same buffers when NumPy is installed and plain Python otherwise.
+    """
+
+    def __init__(self):
+        self.sources: List[str] = []
+        self.grades = array('b')
+        self.columns: Dict[str, array] = {'total': array('d')}
+        self.failed: List[Tuple[str, str]] = []
+        self._codes = _MessageCodes()
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @classmethod
+    def from_batch(cls, report: Dict[str, Any]) -> 'Corpus':
+        """Build from the report produced by app.batch.run_batch()."""
+        corpus = cls()
+        for entry in report.get('specs', []):
+            if 'results' in entry:
+                corpus.add(entry['source'], entry['results'])
+            else:
+                corpus.failed.append((entry['source'], entry.get('error', '')))
+        return corpus
+
+    def _column(self, name: str, typecode: str) -> array:
+        column = self.columns.get(name)
+        if column is None:
+            # Earlier rows did not have this column: NaN for scores, 0 for counts
+            column = self.columns[name] = array(typecode, [math.nan if typecode == 'd' else 0]) * len(self)
+        return column
+
+    def add(self, source: str, results: Dict[str, Any]) -> None:
+        """Append one spec's OpenAPIScorer.score_all() output."""
+        row = {'total': float(results['total']['score'])}
+        counts: Dict[str, int] = {f'issues.{severity.value}': 0 for severity in Severity}
+        for name, category in results.items():
+            if name == 'total' or not isinstance(category, dict) or 'score' not in category:
+                continue
+            row[f'category.{name}'] = float(category['score'])
+            for issue in category.get('issues', ()):
+                severity = f"issues.{issue['severity']}"
+                counts[severity] = counts.get(severity, 0) + 1
+                code = f"code.{self._codes.lookup(issue['message'])}"
+                counts[code] = counts.get(code, 0) + 1
+
+        for name in row:
+            self._column(name, 'd')
+        for name in counts:
+            self._column(name, 'l')
+        for name, column in self.columns.items():
+            if name in row:
+                column.append(row[name])
+            elif name in counts:
+                column.append(counts[name])
+            else:
+                column.append(math.nan if column.typecode == 'd' else 0)
+
+        grade = results['total'].get('grade')
+        self.grades.append(GRADES.index(grade) if grade in GRADES else -1)
+        self.sources.append(source)
+
+    @property
+    def categories(self) -> List[str]:
+        return [name.partition('.')[2] for name in self.columns if name.startswith('category.')]
+
+    def column(self, name: str) -> array:
+        """A column by name: 'total', a category name, 'issues.<severity>' or 'code.<ISSUE_CODE>'."""
+        if name in self.columns:
+            return self.columns[name]
+        if f'category.{name}' in self.columns:
+            return self.columns[f'category.{name}']
+        raise KeyError(f'No column {name!r}')
+
+    @staticmethod
+    def _present(column: array) -> List[float]:
+        if column.typecode == 'd':
+            return [value for value in column if value == value]
+        return list(column)
+
+    def percentiles(self, name: str, qs: Iterable[float] = (50, 90, 99)) -> Dict[float, float]:
+        """Percentiles (0-100) of a column with linear interpolation, ignoring NaN."""
+        qs = list(qs)
+        column = self.column(name)
+        if np is not None:
+            values = np.frombuffer(column, dtype=column.typecode)
+            values = values[~np.isnan(values)] if column.typecode == 'd' else values
+            if not len(values):
+                return {q: math.nan for q in qs}
+            return dict(zip(qs, (float(value) for value in np.percentile(values, qs))))
+
+        values = sorted(self._present(column))
+        if not values:
+            return {q: math.nan for q in qs}
+        result = {}
+        for q in qs:
+            rank = (len(values) - 1) * q / 100
+            low = math.floor(rank)
+            high = min(low + 1, len(values) - 1)
+            result[q] = values[low] + (values[high] - values[low]) * (rank - low)
+        return result
+
+    def histogram(self, name: str, bins: int = 10,
+                  value_range: Optional[Tuple[float, float]] = None) -> Tuple[List[int], List[float]]:
+        """
+        Counts per equal-width bin and the bin edges, like numpy.histogram:
+        bins are half-open except the last, which includes its upper edge.
+        """
+        column = self.column(name)
+        if value_range is None:
+            values = self._present(column)
+            value_range = (min(values), max(values)) if values else (0.0, 1.0)
+        low, high = value_range
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+
+        if np is not None:
+            values = np.frombuffer(column, dtype=column.typecode)
+            values = values[~np.isnan(values)] if column.typecode == 'd' else values
+            counts, edges = np.histogram(values, bins=bins, range=(low, high))
+            return counts.tolist(), edges.tolist()
+
+        edges = [low + (high - low) * i / bins for i in range(bins)] + [high]
+        counts = [0] * bins
+        for value in self._present(column):
+            if low <= value <= high:
+                counts[min(bisect.bisect_right(edges, value) - 1, bins - 1)] += 1
+        return counts, edges
+
+    def top_k(self, name: str, k: int = 10, worst: bool = True) -> List[Tuple[str, float]]:
+        """The k lowest (or highest) rows of a column as (source, value); ties keep corpus order."""
+        column = self.column(name)
+        if np is not None:
+            values = np.frombuffer(column, dtype=column.typecode)
+            rows = np.flatnonzero(~np.isnan(values)) if column.typecode == 'd' else np.arange(len(values))
+            keys = values[rows] if worst else -values[rows]
+            order = rows[np.argsort(keys, kind='stable')[:k]]
+            return [(self.sources[i], column[i]) for i in order.tolist()]
+
+        rows = [i for i in range(len(column)) if column[i] == column[i]]
+        # sort() is stable in both directions, like the NumPy path
+        rows.sort(key=column.__getitem__, reverse=not worst)
+        return [(self.sources[i], column[i]) for i in rows[:k]]
+
+    def grade_distribution(self) -> Dict[str, int]:
+        if np is not None:
+            grades = np.frombuffer(self.grades, dtype=np.int8)
+            counts = np.bincount(grades[grades >= 0], minlength=len(GRADES)).tolist()
+        else:
+            counts = [0] * len(GRADES)
+            for grade in self.grades:
+                if grade >= 0:
+                    counts[grade] += 1
+        return dict(zip(GRADES, counts))
+
+    def sums(self, prefix: str) -> Dict[str, int]:
+        """Totals of the count columns under a prefix, e.g. 'issues.' or 'code.'."""
+        return {name[len(prefix):]: int(sum(column)) for name, column in self.columns.items()
+                if name.startswith(prefix)}
+
+    def summary(self, k: int = 10) -> Dict[str, Any]:
+        return {
+            'specs': len(self),
+            'failed': len(self.failed),
+            'grades': self.grade_distribution(),
+            'total': self.percentiles('total', (0, 25, 50, 75, 90, 100)),
+            'categories': {name: self.percentiles(name, (10, 50, 90)) for name in self.categories},
+            'issues': self.sums('issues.'),
+            'codes': self.sums('code.'),
+            'worst': self.top_k('total', k)
+        }
+
+    def to_csv(self, out: TextIO) -> None:
+        names = list(self.columns)
+        writer = csv.writer(out)
+        writer.writerow(['source', 'grade'] + names)
+        for i, source in enumerate(self.sources):
+            grade = GRADES[self.grades[i]] if self.grades[i] >= 0 else ''
+            writer.writerow([source, grade] + [self._csv_value(self.columns[name][i]) for name in names])
+
+    @staticmethod
+    def _csv_value(value: Union[int, float]) -> Union[int, float, str]:
+        return '' if value != value else value
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the columns to a compact binary file: magic, a JSON header and
+        the raw buffers in header order. Loading it back skips all parsing.
+        """
+        sources = '\0'.join(self.sources).encode('utf-8')
+        failed = json.dumps(self.failed).encode('utf-8')
+        blobs = [('sources', 'B', sources), ('failed', 'B', failed), ('grades', 'b', self.grades.tobytes())]
+        blobs += [(name, column.typecode, column.tobytes()) for name, column in self.columns.items()]
+        header = json.dumps({
+            'byteorder': sys.byteorder,
+            'rows': len(self),
+            'blobs': [(name, typecode, len(data)) for name, typecode, data in blobs]
+        }).encode('utf-8')
+
+        with open(path, 'wb') as file:
+            file.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for _, _, data in blobs:
+                file.write(data)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Corpus':
+        data = Path(path).read_bytes()
+        if not data.startswith(MAGIC):
+            raise ValueError(f'{path} is not a corpus file')
+        offset = len(MAGIC) + 4
+        (length,) = struct.unpack_from('<I', data, len(MAGIC))
+        header = json.loads(data[offset:offset + length])
+        offset += length
+
+        corpus = cls()
+        corpus.columns = {}
+        for name, typecode, size in header['blobs']:
+            blob = data[offset:offset + size]
+            offset += size
+            if name == 'sources':
+                corpus.sources = blob.decode('utf-8').split('\0') if header['rows'] else []
+            elif name == 'failed':
+                corpus.failed = [tuple(item) for item in json.loads(blob)]
+            else:
+                column = array(typecode)
+                column.frombytes(blob)
+                if header['byteorder'] != sys.byteorder:
+                    column.byteswap()
+                if name == 'grades':
+                    corpus.grades = column
+                else:
+                    corpus.columns[name] = column
+        return corpus
+
+
+def load_corpus(path: Union[str, Path]) -> Corpus:
+    """Open a saved corpus file, or build one from a JSON batch report."""
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) == MAGIC:
+            return Corpus.load(path)
+    return Corpus.from_batch(json.loads(Path(path).read_text()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.corpus',
+                                     description='Aggregate the scores of many specs.')
+    parser.add_argument('input', help='batch report (JSON from app.batch) or a saved corpus file')
+    parser.add_argument('--top', type=int, default=10, help='how many worst specs to list')
+    parser.add_argument('--category', help='list the worst specs of this category instead of the total')
+    parser.add_argument('--csv', help='export one row per spec to this CSV file')
+    parser.add_argument('--save', help='save the corpus in binary form for fast reloading')
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.input)
+    summary = corpus.summary(args.top)
+    if args.category:
+        try:
+            summary['worst'] = corpus.top_k(args.category, args.top)
+        except KeyError as e:
+            parser.error(str(e))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            corpus.to_csv(file)
+    if args.save:
+        corpus.save(args.save)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from app.issues import IssueCode
 from app.scoring_strategy import ScoringStrategy
 from typing import Dict, Any
 
@@ -5,64 +6,45 @@ from typing import Dict, Any
 class DescriptionsScorer(ScoringStrategy):
     """Check that all elements have descriptions."""
 
+    path_counters = ('total_elements',)
+
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 20
+        self.total_elements = 0
 
-    def score(self) -> float:
-        max_points = self.max_score
-        total_elements = 0
+    def begin(self) -> None:
+        super().begin()
+        self.total_elements = 0
 
         # Check info description
         if not self.spec.get('info', {}).get('description'):
-            self.issues.append({
-                'location': 'info',
-                'message': 'API missing general description',
-                'severity': 'medium'
-            })
+            self.add_issue(IssueCode.API_MISSING_DESCRIPTION, ('info',))
 
-        # Check paths and operations
-        for path, path_item in self.spec.get('paths', {}).items():
-            for method, operation in path_item.items():
-                total_elements += 1
-                if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
-                    continue
+    def visit_path(self, path: str, path_item: Dict[str, Any]) -> None:
+        # Every key of the path item counts, not only the HTTP methods
+        self.total_elements += len(path_item)
 
-                if not operation.get('description'):
-                    self.issues.append({
-                        'location': f'paths.{path}',
-                        'message': 'Path missing description',
-                        'severity': 'medium'
-                    })
+    def visit_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        if not operation.get('description'):
+            self.add_issue(IssueCode.PATH_MISSING_DESCRIPTION, ('paths', path))
 
-                # Check parameters
-                for param in operation.get('parameters', []):
-                    total_elements += 1
-                    if not param.get('description'):
-                        self.issues.append({
-                            'location': f'paths.{path}.{method}.parameters.{param['name']}',
-                            'message': 'Parameter missing description',
-                            'severity': 'low'
-                        })
+    def visit_parameter(self, path: str, method: str, param: Dict[str, Any]) -> None:
+        self.total_elements += 1
+        if not param.get('description'):
+            self.add_issue(IssueCode.PARAMETER_MISSING_DESCRIPTION, ('paths', path, method, 'parameters', param.get('name', '<unnamed>')))
 
-                # Check request body
-                if 'requestBody' in operation and not operation['requestBody'].get('description'):
-                    self.issues.append({
-                        'location': f'paths.{path}.{method}.requestBody',
-                        'message': 'Request body missing description',
-                        'severity': 'medium'
-                    })
+    def visit_request_body(self, path: str, method: str, request_body: Dict[str, Any]) -> None:
+        if not request_body.get('description'):
+            self.add_issue(IssueCode.REQUEST_BODY_MISSING_DESCRIPTION, ('paths', path, method, 'requestBody'))
 
-                # Check responses
-                for resp_code, response in operation.get('responses', {}).items():
-                    total_elements += 1
-                    if not response.get('description'):
-                        self.issues.append({
-                            'location': f'paths.{path}.{method}.responses.{resp_code}',
-                            'message': 'Response missing description',
-                            'severity': 'medium'
-                        })
+    def visit_response(self, path: str, method: str, code: str, response: Dict[str, Any]) -> None:
+        self.total_elements += 1
+        if not response.get('description'):
+            self.add_issue(IssueCode.RESPONSE_MISSING_DESCRIPTION, ('paths', path, method, 'responses', code))
 
-        points_per_element = max_points / total_elements if total_elements > 0 else 0
+    def finish(self) -> float:
+        max_points = self.max_score
+        points_per_element = max_points / self.total_elements if self.total_elements > 0 else 0
         score = max_points - (len(self.issues) * points_per_element)
-        return max(0, score)
\ No newline at end of file
+        return max(0, score)
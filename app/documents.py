@@ -0,0 +1,215 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import unquote, urljoin, urlsplit
+
+from app.budgets import DEFAULT_BUDGET, Budget, BudgetExceeded, check_document
+from app.spec_cache import SpecCache
+from app.validator import OpenAPIValidator
+
+# Root key under which the documents a spec refers to are embedded
+EXTERNAL_DOCUMENTS = 'x-external-documents'
+MAX_WORKERS = 8
+
+
+def document_id(uri: str) -> str:
+    """The key of a document under EXTERNAL_DOCUMENTS: stable across specs and safe in a JSON Pointer."""
+    return 'doc-' + hashlib.blake2b(uri.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def base_uri(source: Union[str, Path]) -> str:
+    """The absolute URI relative references in `source` are resolved against."""
+    source = str(source)
+    return source if _is_url(source) else str(Path(source).resolve())
+
+
+def _join(base: str, reference: str) -> str:
+    if _is_url(reference) or _is_url(base):
+        return urljoin(base, reference)
+    if reference.startswith('file://'):
+        reference = unquote(urlsplit(reference).path)
+    return str((Path(base).parent / unquote(reference)).resolve())
+
+
+def _ref_nodes(document: Any) -> List[Dict[str, Any]]:
+    """Every object in `document` with a string $ref."""
+    nodes = []
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get('$ref'), str):
+                nodes.append(node)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return nodes
+
+
+def _local_ref(uri: str, fragment: str) -> Optional[str]:
+    # Only JSON Pointer fragments can be rewritten; plain-name anchors stay unresolved
+    if fragment and not fragment.startswith('/'):
+        return None
+    return f'#/{EXTERNAL_DOCUMENTS}/{document_id(uri)}{fragment}'
+
+
+class DocumentStore:
+    """Load the documents that specs refer to through external $refs, each once.
+
+    bundle() finds a spec's external references ('schemas/pet.yaml#/Pet',
+    'https://example.com/common.yaml#/components/responses/Error'), loads the
+    missing documents in parallel (local files on a thread pool, URLs through
+    the async fetcher), follows the references inside those documents in the
+    same way, and embeds every document reached under EXTERNAL_DOCUMENTS, with
+    the $refs rewritten to local pointers into it. The rest of the pipeline
+    then resolves them like any other local $ref.
+
+    Loaded documents are kept for the store's lifetime and shared by every
+    spec bundled with it, so documents used by many specs of a batch are read
+    and parsed once. Their $refs are rewritten once, to absolute locations,
+    which is why they can be shared as they are. Documents that cannot be
+    loaded are recorded in `errors`, and references to them are left as they
+    were (and reported as unresolvable by the scorers).
+
+    With a `root`, only files under that directory are loaded and URLs are
+    refused, for specs that come from untrusted sources.
+    """
+
+    def __init__(self, cache: Optional[SpecCache] = None, max_workers: int = MAX_WORKERS,
+                 fetch_options: Optional[Dict[str, Any]] = None, budget: Budget = DEFAULT_BUDGET,
+                 root: Optional[Union[str, Path]] = None):
+        self.cache = cache
+        self.root = Path(root).resolve() if root is not None else None
+        self.budget = budget
+        self.max_workers = max_workers
+        self.fetch_options = fetch_options or {}
+        self.documents: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.stats = {'loaded': 0, 'reused': 0}
+        # The documents each loaded document refers to
+        self._links: Dict[str, Set[str]] = {}
+        # $refs of loaded documents waiting for the documents they point to
+        self._pending_rewrites: List[List[Tuple[Dict[str, Any], str, str]]] = []
+
+    def load_spec(self, source: Union[str, Path]) -> Tuple[Optional[dict], Optional[str]]:
+        """Like OpenAPIValidator.load_openapi_spec(), with external $refs bundled in."""
+        spec, error = OpenAPIValidator.load_openapi_spec(source, self.cache, self.budget)
+        if error is None and isinstance(spec, dict):
+            self.bundle(spec, source)
+        return spec, error
+
+    def bundle(self, spec: Dict[str, Any], source: Union[str, Path]) -> Dict[str, Any]:
+        """Embed the documents `spec` (loaded from `source`) refers to, rewriting its external $refs in place."""
+        targets = self._targets(_ref_nodes(spec), base_uri(source), local=None)
+        roots = {uri for _, uri, _ in targets}
+        self.stats['reused'] += len(roots & self.documents.keys())
+        self.prefetch(roots)
+
+        reached: Set[str] = set()
+        stack = [uri for uri in roots if uri in self.documents]
+        while stack:
+            uri = stack.pop()
+            if uri not in reached:
+                reached.add(uri)
+                stack.extend(link for link in self._links[uri] if link in self.documents)
+        if not reached:
+            return spec
+
+        self._rewrite(targets)
+        embedded = spec.setdefault(EXTERNAL_DOCUMENTS, {})
+        if isinstance(embedded, dict):
+            for uri in sorted(reached):
+                embedded[document_id(uri)] = self.documents[uri]
+        return spec
+
+    def prefetch(self, uris: Iterable[str]) -> None:
+        """Load `uris` and everything they refer to, level by level, each level in parallel."""
+        pending = {uri for uri in uris if uri not in self.documents and uri not in self.errors}
+        while pending:
+            pending = {uri for uri in pending if self._allowed(uri)}
+            loaded = self._load_all(sorted(pending))
+            pending = set()
+            for uri, document, error in loaded:
+                if error is not None:
+                    self.errors[uri] = error
+                    continue
+                self.documents[uri] = document
+                self.stats['loaded'] += 1
+                targets = self._targets(_ref_nodes(document), uri, local=uri)
+                self._links[uri] = {target for _, target, _ in targets if target != uri}
+                pending.update(link for link in self._links[uri]
+                               if link not in self.documents and link not in self.errors)
+                self._pending_rewrites.append(targets)
+            # Rewritten only now, so that refs to documents that failed to load keep their original text
+            for targets in self._pending_rewrites:
+                if not any(uri in pending for _, uri, _ in targets):
+                    self._rewrite(targets)
+            self._pending_rewrites = [targets for targets in self._pending_rewrites
+                                      if any(uri in pending for _, uri, _ in targets)]
+
+    def _allowed(self, uri: str) -> bool:
+        if self.root is None:
+            return True
+        if _is_url(uri):
+            self.errors[uri] = 'Refused: URLs are not followed for this spec'
+            return False
+        if not Path(uri).is_relative_to(self.root):
+            self.errors[uri] = f'Refused: {uri} is outside {self.root}'
+            return False
+        return True
+
+    @staticmethod
+    def _targets(nodes: List[Dict[str, Any]], base: str,
+                 local: Optional[str]) -> List[Tuple[Dict[str, Any], str, str]]:
+        """(node, document uri, fragment) for each $ref; local refs count only inside an external document."""
+        targets = []
+        for node in nodes:
+            reference, _, fragment = node['$ref'].partition('#')
+            if reference:
+                try:
+                    targets.append((node, _join(base, reference), fragment))
+                except ValueError:
+                    # Not a usable path (e.g. an embedded NUL); left for the scorers to report
+                    continue
+            elif local is not None:
+                targets.append((node, local, fragment))
+        return targets
+
+    def _rewrite(self, targets: List[Tuple[Dict[str, Any], str, str]]) -> None:
+        for node, uri, fragment in targets:
+            if uri in self.documents:
+                ref = _local_ref(uri, fragment)
+                if ref is not None:
+                    node['$ref'] = ref
+
+    def _load_all(self, uris: List[str]) -> List[Tuple[str, Any, Optional[str]]]:
+        urls = [uri for uri in uris if _is_url(uri)]
+        files = [uri for uri in uris if not _is_url(uri)]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(files) + bool(urls)))) as executor:
+            fetched = executor.submit(self._fetch_urls, urls) if urls else None
+            results = list(executor.map(self._load_file, files))
+            if fetched is not None:
+                results.extend(fetched.result())
+        return results
+
+    def _load_file(self, uri: str) -> Tuple[str, Any, Optional[str]]:
+        document, error = OpenAPIValidator.load_openapi_spec(uri, self.cache, self.budget)
+        return uri, document, error
+
+    def _fetch_urls(self, urls: List[str]) -> List[Tuple[str, Any, Optional[str]]]:
+        from app.fetcher import fetch_specs
+
+        results = []
+        for url, (document, error) in zip(urls, fetch_specs(urls, budget=self.budget, **self.fetch_options)):
+            if error is None:
+                try:
+                    check_document(document, self.budget)
+                except BudgetExceeded as e:
+                    document, error = None, f"Failed to load : {e}"
+            results.append((url, document, error))
+        return results
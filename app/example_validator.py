@@ -0,0 +1,550 @@
+import re
+import re._parser
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from app.issues import Index, render_location
+from app.ref_resolver import RefResolver
+from app.structure import structure_repr
+
+# Nested schema applications allowed while checking one example; also stops
+# schemas that only refer back to themselves (A: {allOf: [$ref A]}). Schemas
+# nested deeper than this are not compiled either
+MAX_DEPTH = 64
+# Only the first items of an array example are checked against `items`
+MAX_ARRAY_ITEMS = 1000
+# Schema applications allowed per example; larger examples are left unchecked
+MAX_NODES = 20000
+# Longest string matched against a spec's `pattern`; longer examples are left unchecked
+MAX_PATTERN_INPUT = 256
+# Variable repeats allowed in one pattern: each one multiplies the work a near-miss can cost
+MAX_PATTERN_REPEATS = 3
+# Ref-free schemas compiled in one spec are reused by later specs in the same process
+SHARED_CACHE_SIZE = 512
+
+# A failed check: where in the example (keys and Index()es) and why
+Failure = Tuple[Tuple, str]
+# Checks take (instance, budget, depth) and return a Failure or None
+Check = Callable[[Any, '_Budget', int], Optional[Failure]]
+
+
+class LimitExceeded(Exception):
+    """An example was too large or too deeply nested to check."""
+
+
+class _Budget:
+    __slots__ = ('nodes',)
+
+    def __init__(self):
+        self.nodes = 0
+
+
+class _Compiled:
+    __slots__ = ('check', 'refs')
+
+    def __init__(self, check: Check, refs: Set[str]):
+        self.check = check
+        # Every $ref this schema depends on, directly or through other schemas
+        self.refs = refs
+
+
+JSON_TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'array': (list,),
+    'object': (dict,),
+    'null': (type(None),),
+}
+
+
+def _too_deep(instance: Any, budget: '_Budget', depth: int) -> Optional[Failure]:
+    # Stands in for a subschema past MAX_DEPTH; checking would have gone past it anyway
+    raise LimitExceeded()
+
+
+_REPEATS = (re._parser.MAX_REPEAT, re._parser.MIN_REPEAT, re._parser.POSSESSIVE_REPEAT)
+
+
+def _may_backtrack(pattern: re.Pattern) -> bool:
+    """
+    Whether `pattern` has a repeat around something that can itself match in
+    several ways (another variable repeat, an alternation, a backreference):
+    '(a+)+$', '(a|aa)*b', or more than MAX_PATTERN_REPEATS variable repeats
+    in all. Such patterns can take exponential (or high polynomial) time on a
+    near-miss, inside the regex engine where no time limit can stop them.
+    """
+    try:
+        parsed = re._parser.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return True
+    variable = 0
+    # (subpattern items, inside a repeat)
+    stack = [(list(parsed), False)]
+    while stack:
+        items, repeated = stack.pop()
+        for op, value in items:
+            if op in _REPEATS:
+                low, high, body = value
+                if low != high:
+                    variable += 1
+                    if repeated or variable > MAX_PATTERN_REPEATS:
+                        return True
+                stack.append((list(body), repeated or high > 1))
+            elif op is re._parser.BRANCH:
+                if repeated:
+                    return True
+                stack.extend((list(branch), repeated) for branch in value[1])
+            elif op is re._parser.GROUPREF or op is re._parser.GROUPREF_EXISTS:
+                return True
+            elif op is re._parser.SUBPATTERN:
+                stack.append((list(value[3]), repeated))
+            elif op in (re._parser.ASSERT, re._parser.ASSERT_NOT):
+                stack.append((list(value[1]), repeated))
+    return False
+
+
+def _search(pattern: re.Pattern, text: str) -> bool:
+    if len(text) > MAX_PATTERN_INPUT:
+        raise LimitExceeded()
+    return pattern.search(text) is not None
+
+
+def _type_name(instance: Any) -> str:
+    for name, types in JSON_TYPES.items():
+        if type(instance) in types:
+            return name
+    return type(instance).__name__
+
+
+def _is_type(instance: Any, name: str) -> bool:
+    if name == 'integer' and type(instance) is float:
+        return instance.is_integer()
+    types = JSON_TYPES.get(name)
+    return types is None or type(instance) in types
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    """Equality as JSON Schema sees it: true is not 1, but 1 is 1.0."""
+    if type(a) is bool or type(b) is bool:
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _size_failure(size: int, low: int, high: Optional[int], what: str, keyword: str) -> Optional[Failure]:
+    if size < low:
+        return (), f'{what} {size} is below min{keyword} {low}'
+    if high is not None and size > high:
+        return (), f'{what} {size} is above max{keyword} {high}'
+    return None
+
+
+def _number(value: Any) -> bool:
+    return type(value) in (int, float)
+
+
+class _Shared:
+    """A small process-wide LRU of compiled checks for schemas without $refs, keyed by structure."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: 'OrderedDict[str, _Compiled]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[_Compiled]:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+            return compiled
+
+    def put(self, key: str, compiled: _Compiled) -> None:
+        with self._lock:
+            self._entries[key] = compiled
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+_shared = _Shared(SHARED_CACHE_SIZE)
+
+
+class ExampleValidator:
+    """Check example values against the schemas of one spec.
+
+    Each schema is compiled into a check function once: by identity, since
+    every response referring to the same component schema resolves to the
+    same object, and otherwise by structure, so that identical inline schemas
+    share a check too. $refs are resolved with the spec's resolver; when the
+    resolver is tracing (incremental scoring), a cached check still reports
+    every $ref it was compiled from. Supported keywords are those of OpenAPI
+    3.0 schemas and the common JSON Schema 2020-12 ones used by 3.1; formats
+    are not checked.
+    """
+
+    def __init__(self, resolver: RefResolver, openapi: str = '3.0'):
+        self.resolver = resolver
+        self.v31 = isinstance(openapi, str) and openapi.startswith('3.1')
+        # id(schema) -> (schema, compiled); the schema is kept so that its id stays unique
+        self._by_id: Dict[int, Tuple[Any, _Compiled]] = {}
+        self._by_structure: Dict[str, _Compiled] = {}
+        self._patterns: Dict[str, Optional[re.Pattern]] = {}
+        self._collecting: List[Set[str]] = []
+        # Schemas being compiled, and how many subschemas were left as _too_deep so far
+        self._compile_depth = 0
+        self._cut = 0
+
+    def validate(self, instance: Any, schema: Any) -> Optional[str]:
+        """
+        The first way `instance` violates `schema`, or None when it conforms
+        or is too large to check (see MAX_DEPTH, MAX_NODES).
+        """
+        compiled = self._compiled(schema)
+        if self.resolver.trace is not None:
+            self.resolver.trace.update(compiled.refs)
+        try:
+            failure = compiled.check(instance, _Budget(), 0)
+        except (LimitExceeded, RecursionError, OverflowError):
+            return None
+        if failure is None:
+            return None
+        location, message = failure
+        where = render_location(location)
+        return f'{where}: {message}' if where else message
+
+    def _compiled(self, schema: Any) -> _Compiled:
+        entry = self._by_id.get(id(schema))
+        if entry is not None:
+            compiled = entry[1]
+        else:
+            # 3.0 and 3.1 read some keywords differently (nullable, exclusiveMinimum)
+            key = f'{self.v31}:{structure_repr(schema)}'
+            compiled = self._by_structure.get(key) or _shared.get(key)
+            if compiled is None:
+                cut = self._cut
+                compiled = self._compile(schema)
+                # A check cut short here may be complete when the schema is met less deep in another spec
+                if not compiled.refs and self._cut == cut:
+                    _shared.put(key, compiled)
+            self._by_structure[key] = compiled
+            self._by_id[id(schema)] = (schema, compiled)
+        if self._collecting:
+            self._collecting[-1].update(compiled.refs)
+        return compiled
+
+    def _compile(self, schema: Any) -> _Compiled:
+        refs: Set[str] = set()
+        # Registered before the keywords are compiled, so that recursive schemas find it
+        checks: List[Check] = []
+        compiled = _Compiled(self._run(checks), refs)
+        self._by_id[id(schema)] = (schema, compiled)
+        self._collecting.append(refs)
+        self._compile_depth += 1
+        try:
+            checks.extend(self._keywords(schema))
+        finally:
+            self._compile_depth -= 1
+            self._collecting.pop()
+        return compiled
+
+    @staticmethod
+    def _run(checks: List[Check]) -> Check:
+        def check(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+            budget.nodes += 1
+            if depth > MAX_DEPTH or budget.nodes > MAX_NODES:
+                raise LimitExceeded()
+            for keyword in checks:
+                failure = keyword(instance, budget, depth + 1)
+                if failure is not None:
+                    return failure
+            return None
+        return check
+
+    def _sub(self, schema: Any) -> Check:
+        if self._compile_depth > MAX_DEPTH:
+            self._cut += 1
+            return _too_deep
+        return self._compiled(schema).check
+
+    def _pattern(self, pattern: Any) -> Optional[re.Pattern]:
+        if not isinstance(pattern, str):
+            return None
+        if pattern not in self._patterns:
+            try:
+                compiled = re.compile(pattern)
+            except re.error:
+                # Patterns Python cannot compile (ECMA-only syntax) are not checked
+                compiled = None
+            # Neither are those that could backtrack for ever on a spec's example
+            self._patterns[pattern] = compiled if compiled is not None and not _may_backtrack(compiled) else None
+        return self._patterns[pattern]
+
+    def _keywords(self, schema: Any) -> List[Check]:
+        if schema is True or schema is None or (isinstance(schema, dict) and not schema):
+            return []
+        if schema is False:
+            return [lambda instance, budget, depth: ((), 'no value is allowed here')]
+        if not isinstance(schema, dict):
+            return []
+
+        checks: List[Check] = []
+        ref = schema.get('$ref')
+        if isinstance(ref, str):
+            self._collecting[-1].add(ref)
+            target = self.resolver.resolve_ref(ref)
+            if target is not None:
+                # A schema being compiled is already registered, so cycles of $refs end here
+                checks.append(self._sub(target))
+            if not self.v31:
+                # In 3.0 the other keywords next to a $ref are ignored
+                return checks
+
+        checks.extend(self._type_keywords(schema))
+        checks.extend(self._value_keywords(schema))
+        checks.extend(self._string_keywords(schema))
+        checks.extend(self._number_keywords(schema))
+        checks.extend(self._array_keywords(schema))
+        checks.extend(self._object_keywords(schema))
+        checks.extend(self._composition_keywords(schema))
+        return checks
+
+    def _type_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        declared = schema.get('type')
+        if isinstance(declared, str):
+            names = [declared]
+        elif isinstance(declared, list) and all(isinstance(name, str) for name in declared):
+            names = list(declared)
+        else:
+            return []
+        if schema.get('nullable') is True and not self.v31:
+            names.append('null')
+        expected = ' or '.join(repr(name) for name in names)
+
+        def check(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+            for name in names:
+                if _is_type(instance, name):
+                    return None
+            return (), f'expected {expected}, got {_type_name(instance)}'
+        return [check]
+
+    @staticmethod
+    def _value_keywords(schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        values = schema.get('enum')
+        if isinstance(values, list) and values:
+            def check_enum(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                for value in values:
+                    if json_equal(instance, value):
+                        return None
+                return (), f'{instance!r} is not one of {values!r}'
+            checks.append(check_enum)
+        if 'const' in schema:
+            const = schema['const']
+
+            def check_const(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                return None if json_equal(instance, const) else ((), f'expected {const!r}')
+            checks.append(check_const)
+        return checks
+
+    def _string_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        min_length, max_length = schema.get('minLength'), schema.get('maxLength')
+        if type(min_length) is int or type(max_length) is int:
+            low = min_length if type(min_length) is int else 0
+            high = max_length if type(max_length) is int else None
+
+            def check_length(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is str:
+                    return _size_failure(len(instance), low, high, 'string length', 'Length')
+                return None
+            checks.append(check_length)
+        pattern = self._pattern(schema['pattern']) if 'pattern' in schema else None
+        if pattern is not None:
+            def check_pattern(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is str and not _search(pattern, instance):
+                    return (), f'{instance!r} does not match {pattern.pattern!r}'
+                return None
+            checks.append(check_pattern)
+        return checks
+
+    def _number_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        bounds = []
+        minimum, maximum = schema.get('minimum'), schema.get('maximum')
+        exclusive_min, exclusive_max = schema.get('exclusiveMinimum'), schema.get('exclusiveMaximum')
+        if _number(minimum):
+            bounds.append((minimum, exclusive_min is True, True))
+        if _number(maximum):
+            bounds.append((maximum, exclusive_max is True, False))
+        # JSON Schema 2020-12 (OpenAPI 3.1) gives the exclusive bounds as numbers
+        if _number(exclusive_min) and type(exclusive_min) is not bool:
+            bounds.append((exclusive_min, True, True))
+        if _number(exclusive_max) and type(exclusive_max) is not bool:
+            bounds.append((exclusive_max, True, False))
+        multiple_of = schema.get('multipleOf')
+        if not _number(multiple_of) or multiple_of <= 0:
+            multiple_of = None
+        if not bounds and multiple_of is None:
+            return []
+
+        def check(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+            if type(instance) not in (int, float):
+                return None
+            for bound, exclusive, lower in bounds:
+                if lower and (instance < bound or (exclusive and instance == bound)):
+                    return (), f'{instance!r} is below the minimum of {bound!r}'
+                if not lower and (instance > bound or (exclusive and instance == bound)):
+                    return (), f'{instance!r} is above the maximum of {bound!r}'
+            if multiple_of is not None:
+                quotient = instance / multiple_of
+                # Allow for float rounding (0.3 / 0.1); past 2 ** 53 floats cannot tell
+                if abs(quotient) < 2 ** 53 and abs(quotient - round(quotient)) > 1e-9:
+                    return (), f'{instance!r} is not a multiple of {multiple_of!r}'
+            return None
+        return [check]
+
+    def _array_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        min_items, max_items = schema.get('minItems'), schema.get('maxItems')
+        if type(min_items) is int or type(max_items) is int:
+            low = min_items if type(min_items) is int else 0
+            high = max_items if type(max_items) is int else None
+
+            def check_size(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is list:
+                    return _size_failure(len(instance), low, high, 'array size', 'Items')
+                return None
+            checks.append(check_size)
+
+        prefix = schema.get('prefixItems') if self.v31 else None
+        prefix_checks = [self._sub(item) for item in prefix] if isinstance(prefix, list) else []
+        items = schema.get('items')
+        item_check = self._sub(items) if isinstance(items, (dict, bool)) else None
+        if prefix_checks or item_check is not None:
+            def check_items(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is not list:
+                    return None
+                for i, item in enumerate(instance[:MAX_ARRAY_ITEMS]):
+                    check = prefix_checks[i] if i < len(prefix_checks) else item_check
+                    if check is None:
+                        continue
+                    failure = check(item, budget, depth)
+                    if failure is not None:
+                        return (Index(i),) + failure[0], failure[1]
+                return None
+            checks.append(check_items)
+        return checks
+
+    def _object_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        required = schema.get('required')
+        if isinstance(required, list) and required:
+            names = [name for name in required if isinstance(name, str)]
+
+            def check_required(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is dict:
+                    for name in names:
+                        if name not in instance:
+                            return (), f"missing required property '{name}'"
+                return None
+            checks.append(check_required)
+
+        min_properties, max_properties = schema.get('minProperties'), schema.get('maxProperties')
+        if type(min_properties) is int or type(max_properties) is int:
+            low = min_properties if type(min_properties) is int else 0
+            high = max_properties if type(max_properties) is int else None
+
+            def check_count(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is dict:
+                    return _size_failure(len(instance), low, high, 'property count', 'Properties')
+                return None
+            checks.append(check_count)
+
+        properties = schema.get('properties')
+        property_checks = {name: self._sub(sub) for name, sub in properties.items()} \
+            if isinstance(properties, dict) else {}
+        patterns = schema.get('patternProperties') if self.v31 else None
+        pattern_checks = [(self._pattern(pattern), self._sub(sub)) for pattern, sub in patterns.items()] \
+            if isinstance(patterns, dict) else []
+        checked = [(pattern, check) for pattern, check in pattern_checks if pattern is not None]
+        additional = schema.get('additionalProperties')
+        additional_check = self._sub(additional) if isinstance(additional, (dict, bool)) else None
+        if len(checked) != len(pattern_checks):
+            # Which names the patterns not checked would cover is unknown, so additional ones cannot be told apart
+            additional_check = None
+        pattern_checks = checked
+        if property_checks or pattern_checks or additional_check is not None:
+            def check_properties(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                if type(instance) is not dict:
+                    return None
+                for name, value in instance.items():
+                    matched = False
+                    check = property_checks.get(name)
+                    if check is not None:
+                        matched = True
+                        failure = check(value, budget, depth)
+                        if failure is not None:
+                            return (name,) + failure[0], failure[1]
+                    for pattern, check in pattern_checks:
+                        if isinstance(name, str) and _search(pattern, name):
+                            matched = True
+                            failure = check(value, budget, depth)
+                            if failure is not None:
+                                return (name,) + failure[0], failure[1]
+                    if not matched and additional_check is not None:
+                        if additional is False:
+                            return (name,), 'additional property is not allowed'
+                        failure = additional_check(value, budget, depth)
+                        if failure is not None:
+                            return (name,) + failure[0], failure[1]
+                return None
+            checks.append(check_properties)
+        return checks
+
+    def _composition_keywords(self, schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        all_of = schema.get('allOf')
+        if isinstance(all_of, list) and all_of:
+            all_checks = [self._sub(sub) for sub in all_of]
+
+            def check_all(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                for check in all_checks:
+                    failure = check(instance, budget, depth)
+                    if failure is not None:
+                        return failure
+                return None
+            checks.append(check_all)
+
+        any_of = schema.get('anyOf')
+        if isinstance(any_of, list) and any_of:
+            any_checks = [self._sub(sub) for sub in any_of]
+
+            def check_any(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                for check in any_checks:
+                    if check(instance, budget, depth) is None:
+                        return None
+                return (), 'does not match any schema in anyOf'
+            checks.append(check_any)
+
+        one_of = schema.get('oneOf')
+        if isinstance(one_of, list) and one_of:
+            one_checks = [self._sub(sub) for sub in one_of]
+
+            def check_one(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                matches = sum(check(instance, budget, depth) is None for check in one_checks)
+                if matches != 1:
+                    return (), f'matches {matches} schemas in oneOf instead of exactly one'
+                return None
+            checks.append(check_one)
+
+        if 'not' in schema and isinstance(schema['not'], (dict, bool)):
+            not_check = self._sub(schema['not'])
+
+            def check_not(instance: Any, budget: _Budget, depth: int) -> Optional[Failure]:
+                return ((), 'matches the schema in not') if not_check(instance, budget, depth) is None else None
+            checks.append(check_not)
+        return checks
@@ -1,47 +1,85 @@
+from app.example_validator import ExampleValidator
+from app.issues import Issue, IssueCode
+from app.ref_resolver import RefResolver
 from app.scoring_strategy import ScoringStrategy
-from typing import Dict, Any
+from app.spec_index import CRUD_METHODS
+from typing import Dict, Any, List, Tuple
 
 
 class ExamplesScorer(ScoringStrategy):
+    operation_methods = CRUD_METHODS
+    path_counters = ('num_examples',)
+
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 10
+        self.num_examples = 0
+        self._request_issues = []
+        self._validator = None
+
+    def begin(self) -> None:
+        super().begin()
+        self.num_examples = 0
+        self._request_issues = []
+        resolver = self.index.resolver if self.index is not None else RefResolver(self.spec)
+        self._validator = ExampleValidator(resolver, self.spec.get('openapi'))
+
+    # Check response examples
+    def visit_response_media_type(self, path: str, method: str, code: str, content_type: str,
+                                  content: Dict[str, Any]) -> None:
+        location = ('paths', path, method, 'responses', code, 'content', content_type)
+        if 'example' in content or 'examples' in content:
+            invalid = self._invalid_examples(IssueCode.INVALID_RESPONSE_EXAMPLE, location, content)
+            if invalid:
+                self.add_issues(invalid)
+            else:
+                self.num_examples += 1
+        else:
+            self.add_issue(IssueCode.MISSING_RESPONSE_EXAMPLE, location)
+
+    # Check request body examples
+    def visit_request_media_type(self, path: str, method: str, content_type: str, content: Dict[str, Any]) -> None:
+        location = ('paths', path, method, 'requestBody', 'content', content_type)
+        if 'example' in content or 'examples' in content:
+            invalid = self._invalid_examples(IssueCode.INVALID_REQUEST_EXAMPLE, location, content)
+            if invalid:
+                self._request_issues.extend(invalid)
+            else:
+                self.num_examples += 1
+        else:
+            self._request_issues.append(Issue(IssueCode.MISSING_REQUEST_EXAMPLE, location))
 
-    def score(self) -> float:
+    def _invalid_examples(self, code: IssueCode, location: Tuple, content: Dict[str, Any]) -> List[Issue]:
+        """Issues for the examples of a media type that contradict its schema."""
+        schema = content.get('schema')
+        if schema is None:
+            return []
+        issues = []
+        if 'example' in content:
+            error = self._validator.validate(content['example'], schema)
+            if error:
+                issues.append(Issue(code, location + ('example',), (error,)))
+        examples = content.get('examples')
+        if isinstance(examples, dict):
+            for name, example in examples.items():
+                example = self._validator.resolver.resolve(example)
+                if isinstance(example, dict) and 'value' in example:
+                    error = self._validator.validate(example['value'], schema)
+                    if error:
+                        issues.append(Issue(code, location + ('examples', name), (error,)))
+        return issues
+
+    def leave_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        # Request body issues are reported after the operation's response issues
+        if self._request_issues:
+            self.add_issues(self._request_issues)
+            self._request_issues = []
+
+    def finish(self) -> float:
         max_points = self.max_score
-        score = 0
         points_per_example = 1
-
-        for path, path_item in self.spec.get('paths', {}).items():
-            for method, operation in path_item.items():
-                if method.lower() not in ['get', 'post', 'put', 'patch', 'delete']:
-                    continue
-
-                # Check response examples
-                responses = operation.get('responses', {})
-                for code, response in responses.items():
-                    for content_type, content in response.get('content', {}).items():
-                        if 'example' in content or 'examples' in content:
-                            score += points_per_example
-                        else:
-                            self.issues.append({
-                                'location': f'paths.{path}.{method}.responses.{code}.content.{content_type}',
-                                'message': 'Missing response example',
-                                'severity': 'low'
-                            })
-
-                # Check request body examples
-                if 'requestBody' in operation:
-                    for content_type, content in operation['requestBody'].get('content', {}).items():
-                        if 'example' in content or 'examples' in content:
-                            score += points_per_example
-                        else:
-                            self.issues.append({
-                                'location': f'paths.{path}.{method}.requestBody.content.{content_type}',
-                                'message': 'Missing request example',
-                                'severity': 'low'
-                            })
+        score = self.num_examples * points_per_example
 
         point_per_element = max_points / (score + len(self.issues)) if (score + len(self.issues)) > 0 else 0
         minus_points = point_per_element * len(self.issues)
-        return max(0, max_points - minus_points)
\ No newline at end of file
+        return max(0, max_points - minus_points)
@@ -0,0 +1,315 @@
+import asyncio
+import hashlib
+import json
+import ssl
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+from app.budgets import DEFAULT_BUDGET, Budget, check_size
+from app.spec_cache import SpecCache
+from app.validator import parse_spec_content
+
+MAX_REDIRECTS = 5
+# Bodies are read off the socket in pieces of this size when their length is not known up front
+READ_SIZE = 1 << 16
+USER_AGENT = 'open-api-scorer'
+
+
+class FetchError(Exception):
+    pass
+
+
+class _Response:
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, keep_alive: bool):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.keep_alive = keep_alive
+
+
+class _ResponseMetadata:
+    """Validators remembered for a URL, plus the content key of its last parsed body."""
+
+    def __init__(self, directory: Optional[Path]):
+        self.directory = directory
+        self._memory: Dict[str, Dict[str, str]] = {}
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, url: str) -> Path:
+        return self.directory / f'{hashlib.sha256(url.encode()).hexdigest()}.json'
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        if url in self._memory:
+            return self._memory[url]
+        if self.directory is None:
+            return None
+        try:
+            meta = json.loads(self._entry(url).read_text())
+        except (OSError, ValueError):
+            return None
+        self._memory[url] = meta
+        return meta
+
+    def put(self, url: str, meta: Dict[str, str]) -> None:
+        self._memory[url] = meta
+        if self.directory is not None:
+            self._entry(url).write_text(json.dumps(meta))
+
+
+class AsyncSpecFetcher:
+    """Fetch remote specs concurrently over pooled keep-alive HTTP/1.1 connections.
+
+    Connections are reused per (scheme, host, port). Responses carrying an ETag
+    or Last-Modified header are remembered, and later fetches send
+    If-None-Match / If-Modified-Since so an unchanged spec comes back as a 304
+    and its cached parse is reused. Bodies larger than `budget.max_bytes`,
+    before or after decompression, are refused as soon as that is known.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_concurrency: int = 32,
+                 max_connections_per_host: int = 4, timeout: float = 30.0, budget: Budget = DEFAULT_BUDGET):
+        self.timeout = timeout
+        self.budget = budget
+        self.max_connections_per_host = max_connections_per_host
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        # Parsed specs fetched by this instance, keyed by content key
+        self._parsed: Dict[str, Any] = {}
+
+        cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.spec_cache = SpecCache(cache_dir / 'specs') if cache_dir is not None else None
+        self.metadata = _ResponseMetadata(cache_dir / 'responses' if cache_dir is not None else None)
+        self.stats = {'requests': 0, 'connections': 0, 'not_modified': 0}
+
+    async def __aenter__(self) -> 'AsyncSpecFetcher':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[Tuple[Optional[dict], Optional[str]]]:
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    async def fetch(self, url: str) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Fetch and parse one spec.
+        Returns: (parsed_spec_dict, error) — error is None if successful
+        """
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(self._fetch(url), self.timeout), None
+            except asyncio.TimeoutError:
+                return None, f"Failed to load : timed out after {self.timeout}s"
+            except Exception as e:
+                return None, f"Failed to load : {e}"
+
+    async def _fetch(self, url: str) -> Any:
+        meta = self.metadata.get(url)
+        cached = self._cached_spec(meta) if meta else None
+
+        headers = {}
+        if cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._request(target, headers)
+            if response.status in (301, 302, 303, 307, 308) and 'location' in response.headers:
+                target = urljoin(target, response.headers['location'])
+                continue
+            break
+        else:
+            raise FetchError(f'Too many redirects for {url}')
+
+        if response.status == 304 and cached is not None:
+            self.stats['not_modified'] += 1
+            return cached
+        if response.status != 200:
+            raise FetchError(f'HTTP {response.status} for {target}')
+
+        key = SpecCache.key(response.body)
+        spec = self._parsed.get(key)
+        if spec is None and self.spec_cache is not None:
+            spec = self.spec_cache.get(key)
+        if spec is None:
+            spec = parse_spec_content(response.body.decode('utf-8-sig'))
+            if self.spec_cache is not None:
+                self.spec_cache.put(key, spec)
+        self._parsed[key] = spec
+
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if etag or last_modified:
+            self.metadata.put(url, {'etag': etag or '', 'last_modified': last_modified or '', 'key': key})
+        return spec
+
+    def _cached_spec(self, meta: Dict[str, str]) -> Optional[Any]:
+        key = meta.get('key')
+        if not key:
+            return None
+        spec = self._parsed.get(key)
+        if spec is None and self.spec_cache is not None:
+            spec = self.spec_cache.get(key)
+            if spec is not None:
+                self._parsed[key] = spec
+        return spec
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> _Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise FetchError(f'Unsupported URL scheme: {url}')
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        origin = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        host_header = parts.hostname if parts.port is None else f'{parts.hostname}:{parts.port}'
+        lines = [
+            f'GET {path} HTTP/1.1',
+            f'Host: {host_header}',
+            f'User-Agent: {USER_AGENT}',
+            'Accept: application/json, application/yaml;q=0.9, */*;q=0.8',
+            'Accept-Encoding: gzip, deflate',
+            'Connection: keep-alive',
+        ]
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        limit = self._host_limits.setdefault(origin, asyncio.Semaphore(self.max_connections_per_host))
+        async with limit:
+            # A pooled connection may have been closed by the server; retry once on a fresh one
+            for attempt in range(2):
+                reader, writer, reused = await self._connection(origin)
+                try:
+                    self.stats['requests'] += 1
+                    writer.write(request)
+                    await writer.drain()
+                    response = await self._read_response(reader)
+                except (ConnectionError, asyncio.IncompleteReadError, FetchError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    # Timed out or cancelled mid-response; the connection state is unknown
+                    writer.close()
+                    raise
+                if response.keep_alive:
+                    self._idle.setdefault(origin, []).append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    async def _connection(self, origin: Tuple[str, str, int]):
+        idle = self._idle.get(origin)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = origin
+        ssl_context = None
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        self.stats['connections'] += 1
+        return reader, writer, False
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> _Response:
+        status_line = await reader.readline()
+        if not status_line:
+            raise FetchError('Connection closed before response')
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise FetchError(f'Malformed status line: {status_line!r}')
+        version, status = parts[0], int(parts[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        # Raising BudgetExceeded part-way leaves the rest unread; _request() then closes the connection
+        if status == 304 or status == 204 or 100 <= status < 200:
+            body = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skip trailers
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                total += size
+                check_size(total, self.budget)
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            check_size(length, self.budget)
+            body = await reader.readexactly(length)
+        else:
+            chunks = []
+            total = 0
+            while True:
+                chunk = await reader.read(READ_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                check_size(total, self.budget)
+                chunks.append(chunk)
+            body = b''.join(chunks)
+            keep_alive = False
+
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding in ('gzip', 'deflate'):
+            body = self._decompress(body, zlib.MAX_WBITS | 16 if encoding == 'gzip' else zlib.MAX_WBITS)
+
+        return _Response(status, headers, body, keep_alive)
+
+    def _decompress(self, body: bytes, wbits: int) -> bytes:
+        # Stops one byte past the limit, so that a small compressed body cannot expand without bound
+        limit = self.budget.max_bytes
+        decompressor = zlib.decompressobj(wbits)
+        data = decompressor.decompress(body, limit + 1 if limit is not None else 0)
+        check_size(len(data), self.budget)
+        data += decompressor.flush()
+        if not decompressor.eof:
+            raise FetchError('Truncated compressed body')
+        return data
+
+
+def fetch_specs(urls: Iterable[str], **options) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """Synchronous wrapper: fetch all URLs concurrently and return (spec, error) pairs in order."""
+    async def run():
+        async with AsyncSpecFetcher(**options) as fetcher:
+            return await fetcher.fetch_all(urls)
+
+    return asyncio.run(run())
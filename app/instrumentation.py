@@ -0,0 +1,114 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+
+
+class Span:
+    """Measurements for one scorer run (or the whole score_all)."""
+
+    __slots__ = ('name', 'wall_time', 'cpu_time', 'nodes_visited', 'issues', 'peak_bytes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.nodes_visited = 0
+        self.issues = 0
+        self.peak_bytes: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_time': round(self.wall_time, 6),
+            'cpu_time': round(self.cpu_time, 6),
+            'nodes_visited': self.nodes_visited,
+            'issues': self.issues,
+            'peak_bytes': self.peak_bytes
+        }
+
+    def __repr__(self) -> str:
+        return f'Span({self.name!r}, wall_time={self.wall_time:.6f})'
+
+
+class InstrumentationHook:
+    """Receives every finished span; subclass to forward spans to a collector."""
+
+    def on_span(self, span: Span) -> None:
+        pass
+
+
+class Instrumentation:
+    """Opt-in timing and counters for scorer runs.
+
+    Pass an instance to OpenAPIScorer or ScoringStrategy.get_result() to get a
+    `_metrics` block in the output. Without one nothing below is executed, so
+    a plain run pays nothing for it. With `trace_memory`, peak allocation is
+    taken from tracemalloc, which also slows the measured code down.
+    """
+
+    def __init__(self, hooks: Iterable[InstrumentationHook] = (), trace_memory: bool = True):
+        self.hooks: List[InstrumentationHook] = list(hooks)
+        self.trace_memory = trace_memory
+        self.spans: List[Span] = []
+        # [baseline, peak] of traced memory for every open span
+        self._memory_stack: List[List[int]] = []
+        self._started_tracing = False
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.append(hook)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """Measure the enclosed block; spans may nest (score_all around each scorer)."""
+        span = Span(name)
+        if self.trace_memory:
+            self._enter_memory()
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_time = time.perf_counter() - wall
+            span.cpu_time = time.process_time() - cpu
+            if self.trace_memory:
+                span.peak_bytes = self._leave_memory()
+
+        self.spans.append(span)
+        for hook in self.hooks:
+            hook.on_span(span)
+
+    def _enter_memory(self) -> None:
+        import tracemalloc
+
+        if not self._memory_stack:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+        else:
+            # reset_peak() below would lose the enclosing span's peak so far
+            parent = self._memory_stack[-1]
+            parent[1] = max(parent[1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        self._memory_stack.append([current, current])
+
+    def _leave_memory(self) -> int:
+        import tracemalloc
+
+        baseline, peak = self._memory_stack.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if self._memory_stack:
+            parent = self._memory_stack[-1]
+            parent[1] = max(parent[1], peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+        return peak - baseline
+
+    @staticmethod
+    def counting(span: Span) -> Callable[[Callable], Callable]:
+        """Wrap walker callbacks so each dispatched node is counted on `span`."""
+        def wrap(callback: Callable) -> Callable:
+            def counted(*args):
+                span.nodes_visited += 1
+                return callback(*args)
+            return counted
+        return wrap
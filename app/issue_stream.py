@@ -0,0 +1,159 @@
+import json
+from typing import Dict, Any, Callable, List, Optional, TextIO, Tuple
+
+from app.issues import Issue
+from app.open_api_scorer import OpenAPIScorer
+from app.scoring_strategy import ScoringStrategy
+from app.spec_walker import SpecWalker
+
+# Lowest total for each grade, as in OpenAPIScorer._calculate_grade
+GRADE_THRESHOLDS = {'A': 91, 'B': 81, 'C': 71, 'D': 51}
+
+
+def parse_threshold(value: str) -> float:
+    """A --fail-under value: a total score ('75') or the lowest passing grade ('B')."""
+    grade = value.strip().upper()
+    if grade in GRADE_THRESHOLDS:
+        return GRADE_THRESHOLDS[grade]
+    return float(value)
+
+
+class NdjsonWriter:
+    """Write one JSON object per line; issues past `max_issues` are counted but not written."""
+
+    def __init__(self, out: TextIO, max_issues: Optional[int] = None):
+        self.out = out
+        self.max_issues = max_issues
+        self.issues = 0
+        self.written = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.written < self.issues
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.out.write(json.dumps(record) + '\n')
+
+    def issue(self, category: str, issue: Issue) -> None:
+        self.issues += 1
+        if self.max_issues is not None and self.written >= self.max_issues:
+            return
+        self.written += 1
+        self.write({'type': 'issue', 'category': category, **issue.to_dict()})
+
+    def flush(self) -> None:
+        self.out.flush()
+
+
+class GatedScorer:
+    """Score a spec category by category, optionally streaming issues as they are found.
+
+    Issues go to `on_issue(category, issue)` the moment a scorer records them,
+    and each category's summary to `on_category(name, summary)` when it is done.
+    With `fail_under`, categories are scored one walk each (largest weight
+    first) and scoring stops as soon as the remaining categories, at zero or at
+    full marks, could no longer move the total across the threshold.
+    """
+
+    def __init__(self, spec: Dict[str, Any], fail_under: Optional[float] = None,
+                 on_issue: Optional[Callable[[str, Issue], None]] = None,
+                 on_category: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 only: Optional[List[str]] = None, skip: Optional[List[str]] = None):
+        self.scorer = OpenAPIScorer(spec, only=only, skip=skip)
+        self.fail_under = fail_under
+        self.on_issue = on_issue
+        self.on_category = on_category
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Returns: the categories that were scored, 'total' when all of them were,
+        and a '_gate' block when `fail_under` is set
+        """
+        scorers = self.scorer.scorers
+        names = {id(scorer): name for name, scorer in scorers.items()}
+        if self.on_issue is not None:
+            def sink(scorer: ScoringStrategy, issue: Issue) -> None:
+                self.on_issue(names[id(scorer)], issue)
+
+            for scorer in scorers.values():
+                scorer.issue_sink = sink
+
+        walker = SpecWalker(self.scorer.spec, self.scorer.index)
+        results = {}
+        if self.fail_under is None:
+            # Nothing can be decided early, so one shared walk serves every scorer
+            walker.walk(scorers.values())
+            for name, scorer in scorers.items():
+                results[name] = self._finish(name, scorer)
+            results.update(self.scorer._total(results))
+            return results
+
+        order = sorted(scorers, key=lambda name: -scorers[name].max_score)
+        max_total = sum(scorer.max_score for scorer in scorers.values())
+        remaining = max_total
+        bounds = (0.0, 100.0)
+        for position, name in enumerate(order):
+            scorer = scorers[name]
+            walker.walk([scorer])
+            results[name] = self._finish(name, scorer)
+            remaining -= scorer.max_score
+
+            scored = sum(category['score'] for category in results.values())
+            bounds = self._scale(scored, max_total), self._scale(scored + remaining, max_total)
+            if position + 1 < len(order) and (bounds[0] >= self.fail_under or bounds[1] < self.fail_under):
+                break
+
+        if len(results) == len(order):
+            results = {name: results[name] for name in scorers}
+            results.update(self.scorer._total(results))
+            bounds = (results['total']['score'],) * 2
+
+        results['_gate'] = {
+            'fail_under': self.fail_under,
+            'passed': bounds[0] >= self.fail_under,
+            'score_range': list(bounds),
+            'skipped': [name for name in order if name not in results]
+        }
+        return results
+
+    def _finish(self, name: str, scorer: ScoringStrategy) -> Dict[str, Any]:
+        score = scorer.finish()
+        if self.on_category is not None:
+            self.on_category(name, {'score': score, 'max': scorer.max_score, 'issues': len(scorer.issues)})
+            # Issues were already handed out one by one
+            return {'score': score, 'max': scorer.max_score, 'issues': []}
+        return scorer.result(score)
+
+    @staticmethod
+    def _scale(total: float, max_total: int) -> float:
+        # Same renormalization and rounding as OpenAPIScorer._total
+        if max_total and max_total != 100:
+            total = total * 100 / max_total
+        return round(total, 1)
+
+
+def stream_ndjson(spec: Dict[str, Any], out: TextIO, max_issues: Optional[int] = None,
+                  fail_under: Optional[float] = None, only: Optional[List[str]] = None,
+                  skip: Optional[List[str]] = None) -> Tuple[Dict[str, Any], NdjsonWriter]:
+    """
+    Score `spec`, writing NDJSON to `out`: an 'issue' line per issue as it is
+    found, a 'category' line per scored category, a 'total' line (when every
+    category was scored), a 'gate' line (with `fail_under`) and finally a
+    'summary' line counting the issues found and written.
+    """
+    writer = NdjsonWriter(out, max_issues)
+
+    def on_category(name: str, summary: Dict[str, Any]) -> None:
+        writer.write({'type': 'category', 'category': name, **summary})
+        writer.flush()
+
+    results = GatedScorer(spec, fail_under, writer.issue, on_category, only, skip).run()
+
+    if 'total' in results:
+        writer.write({'type': 'total', **results['total']})
+    if '_gate' in results:
+        writer.write({'type': 'gate', **results['_gate']})
+    writer.write({'type': 'summary', 'issues': writer.issues, 'written': writer.written,
+                  'truncated': writer.truncated})
+    writer.flush()
+    return results, writer
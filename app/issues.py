@@ -0,0 +1,116 @@
+from enum import Enum
+from typing import Dict, Any, Optional, Tuple
+
+
+class Severity(Enum):
+    LOW = 'low'
+    MEDIUM = 'medium'
+    HIGH = 'high'
+
+
+class IssueCode(Enum):
+    """Every finding a scorer can report, with its message template and severity."""
+
+    API_MISSING_DESCRIPTION = ('API missing general description', Severity.MEDIUM)
+    PATH_MISSING_DESCRIPTION = ('Path missing description', Severity.MEDIUM)
+    PARAMETER_MISSING_DESCRIPTION = ('Parameter missing description', Severity.LOW)
+    REQUEST_BODY_MISSING_DESCRIPTION = ('Request body missing description', Severity.MEDIUM)
+    RESPONSE_MISSING_DESCRIPTION = ('Response missing description', Severity.MEDIUM)
+
+    SCHEMA_MISSING_TYPE = ('Schema missing type definition', Severity.HIGH)
+    NESTED_SCHEMA_MISSING_TYPE = ('Nested schema missing type definition', Severity.MEDIUM)
+    INLINE_SCHEMA_MISSING_TYPE = ('Inline schema missing type definition', Severity.MEDIUM)
+    PARAMETER_MISSING_SCHEMA = ('Parameter missing schema definition', Severity.MEDIUM)
+    REQUEST_BODY_MISSING_SCHEMA = ('Request body missing schema definition', Severity.MEDIUM)
+
+    INCONSISTENT_PATH_NAMING = ('Inconsistent path naming', Severity.LOW)
+    COLLECTION_METHODS = ('would be better if it had both get,post methods', Severity.MEDIUM)
+    ITEM_METHODS = ('would be better if it had get,post,delete methods', Severity.MEDIUM)
+
+    MISSING_EXPECTED_RESPONSE = ('Missing expected {} response for {}', Severity.MEDIUM)
+    MISSING_ERROR_RESPONSE = ('Missing 500 error response for {}', Severity.LOW)
+
+    MISSING_RESPONSE_EXAMPLE = ('Missing response example', Severity.LOW)
+    MISSING_REQUEST_EXAMPLE = ('Missing request example', Severity.LOW)
+    INVALID_RESPONSE_EXAMPLE = ('Response example does not match its schema: {}', Severity.MEDIUM)
+    INVALID_REQUEST_EXAMPLE = ('Request example does not match its schema: {}', Severity.MEDIUM)
+
+    NO_SECURITY_SCHEMES = ('No security schemes defined', Severity.HIGH)
+    SECURITY_NOT_USED = ('Security schemes defined but not used', Severity.HIGH)
+
+    NO_SERVERS = ('No servers defined', Severity.MEDIUM)
+    SERVER_MISSING_DESCRIPTION = ('Server entry missing description', Severity.LOW)
+    NO_API_VERSION = ('No API version specified', Severity.MEDIUM)
+    NO_TAGS = ('No tags defined', Severity.LOW)
+    TAG_MISSING_DESCRIPTION = ('Tag missing description', Severity.LOW)
+    NO_COMPONENTS = ('No components defined', Severity.LOW)
+    SCHEMAS_NOT_REFERENCED = ('Schemas defined but not referenced', Severity.MEDIUM)
+    NO_CONTACT = ('No contact information provided', Severity.LOW)
+
+    def __init__(self, template: str, severity: Severity):
+        self.template = template
+        self.severity = severity
+
+
+class Index(int):
+    """A list position inside an issue location; rendered as `[i]` instead of `.i`."""
+
+    __slots__ = ()
+
+
+def render_location(location: Tuple) -> str:
+    """Render a location tuple in the dotted form used in the JSON output."""
+    parts = []
+    for part in location:
+        if isinstance(part, Index):
+            parts.append(f'[{int(part)}]')
+        else:
+            if parts:
+                parts.append('.')
+            parts.append(str(part))
+    return ''.join(parts)
+
+
+class Issue:
+    """A single finding. Location is kept structured and rendered only when serialized."""
+
+    __slots__ = ('code', 'location', 'args', '_rendered')
+
+    def __init__(self, code: IssueCode, location: Tuple, args: Tuple = ()):
+        self.code = code
+        self.location = location
+        self.args = args
+        # The rendered location; issues reused by the incremental scorer are serialized on every run
+        self._rendered: Optional[str] = None
+
+    @property
+    def severity(self) -> Severity:
+        return self.code.severity
+
+    @property
+    def message(self) -> str:
+        return self.code.template.format(*self.args) if self.args else self.code.template
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._rendered is None:
+            self._rendered = render_location(self.location)
+        return {
+            'location': self._rendered,
+            'message': self.message,
+            'severity': self.code.severity.value
+        }
+
+    def __reduce__(self):
+        # Shard partials cross process boundaries; this is far cheaper than the default for slotted objects
+        return Issue, (self.code, self.location, self.args)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return self.code is other.code and self.location == other.location and self.args == other.args
+
+    def __hash__(self) -> int:
+        return hash((self.code, self.location, self.args))
+
+    def __repr__(self) -> str:
+        return f'Issue({self.code.name}, {render_location(self.location)!r})'
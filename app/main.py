@@ -1,32 +1,149 @@
+import argparse
 import json
+import sys
+from app.budgets import add_budget_arguments, budget_from_args
 from app.open_api_scorer import OpenAPIScorer
+from app.scorer_registry import parse_names, select_scorers
+from app.spec_cache import SpecCache
 from app.validator import OpenAPIValidator
 
+DEFAULT_SOURCE = 'https://petstore3.swagger.io/api/v3/openapi.json'
+
+
 def main():
-    # if len(sys.argv) != 2:
-    #     print("Usage: python -m app.main <path_to_json_file>")
-    #     sys.exit(1)
-    #
-    # source = Path(sys.argv[1])
-    source = 'https://petstore3.swagger.io/api/v3/openapi.json'
+    parser = argparse.ArgumentParser(prog='python -m app.main', description='Score an OpenAPI spec.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_SOURCE, help='spec file path or URL')
+    parser.add_argument('--stream', action='store_true',
+                        help='stream the paths of a local file instead of loading it whole')
+    parser.add_argument('--cache-dir', help='cache parsed specs here, keyed by content hash')
+    parser.add_argument('--metrics', action='store_true',
+                        help='add per-scorer timing, node and memory counters as `_metrics`')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='score the paths of one large spec in this many processes')
+    parser.add_argument('--format', choices=('json', 'ndjson'), default='json',
+                        help='ndjson streams each issue as a line as soon as it is found')
+    parser.add_argument('--max-issues', type=int, help='with --format ndjson, write at most this many issue lines')
+    parser.add_argument('--fail-under', metavar='SCORE|GRADE',
+                        help='exit with status 1 below this total (e.g. 75) or grade (e.g. B); '
+                             'stops scoring once the outcome is certain')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running: re-score the file whenever it changes and print what changed')
+    parser.add_argument('--strict', action='store_true',
+                        help='check the full OpenAPI 3.0/3.1 structure and exit with status 1 on any error')
+    parser.add_argument('--positions', action='store_true',
+                        help='add the line and column of each issue in the (local) spec file')
+    add_budget_arguments(parser)
+    parser.add_argument('--only', help='comma-separated categories to score, e.g. security,response_codes')
+    parser.add_argument('--skip', help='comma-separated categories to leave out, e.g. examples')
+    args = parser.parse_args()
+    budget = budget_from_args(args)
+
+    only, skip = parse_names(args.only), parse_names(args.skip)
+    try:
+        select_scorers(only, skip)
+    except ValueError as e:
+        parser.error(str(e))
+
+    fail_under = None
+    if args.fail_under is not None:
+        from app.issue_stream import parse_threshold
+
+        try:
+            fail_under = parse_threshold(args.fail_under)
+        except ValueError:
+            parser.error(f'--fail-under expects a score or a grade, not {args.fail_under!r}')
+    if args.max_issues is not None and args.format != 'ndjson':
+        parser.error('--max-issues requires --format ndjson')
+    gated = args.format == 'ndjson' or fail_under is not None
+    if gated and (args.stream or args.metrics or args.workers != 1):
+        parser.error('--format ndjson and --fail-under cannot be combined with --stream, --metrics or --workers')
+
+    if args.scorer_timeout is not None and (args.stream or args.workers != 1 or gated or args.watch):
+        parser.error('--scorer-timeout cannot be combined with --stream, --workers, --format ndjson, --fail-under '
+                     'or --watch')
+
+    if args.positions:
+        if args.stream or args.workers != 1 or gated or args.watch:
+            parser.error('--positions cannot be combined with --stream, --workers, --format ndjson, --fail-under '
+                         'or --watch')
+        if args.source.startswith(('http://', 'https://')):
+            parser.error('--positions needs a local file')
+
+    if args.watch:
+        if args.stream or args.metrics or args.workers != 1 or gated or args.strict:
+            parser.error('--watch cannot be combined with --stream, --metrics, --workers, --format ndjson, '
+                         '--fail-under or --strict')
+        if args.source.startswith(('http://', 'https://')):
+            parser.error('--watch needs a local file')
+        from app.watch import watch
+
+        return watch(args.source, cache=SpecCache(args.cache_dir) if args.cache_dir else SpecCache.from_env(),
+                     only=only, skip=skip)
+
+    if args.stream:
+        from app.spec_stream import score_streaming
 
-    spec, load_error = OpenAPIValidator.load_openapi_spec(source)
+        results, error = score_streaming(args.source, only, skip)
+        if error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 1
+        print(json.dumps(results, indent=2))
+        return 0
 
+    from app.documents import DocumentStore
+
+    cache = SpecCache(args.cache_dir) if args.cache_dir else SpecCache.from_env()
+    spec, load_error = DocumentStore(cache, budget=budget).load_spec(args.source)
+
+    # Keep stdout pure NDJSON
+    log = sys.stderr if args.format == 'ndjson' else sys.stdout
     if load_error:
-        print(f"Load error: {load_error}")
+        print(f"Load error: {load_error}", file=log)
+        if args.strict:
+            return 1
     else:
         errors = OpenAPIValidator.validate_spec_dict(spec)
+        if not errors and args.strict:
+            errors = OpenAPIValidator.validate_structure(spec)
         if errors:
-            print("Validation errors:")
+            print("Validation errors:", file=log)
             for e in errors:
-                print(f" - {e}")
+                print(f" - {e}", file=log)
+            if args.strict:
+                return 1
+        else:
+            print("OpenAPI spec loaded and validated successfully!", file=log)
+
+    if gated:
+        from app.issue_stream import GatedScorer, stream_ndjson
+
+        if args.format == 'ndjson':
+            results, _ = stream_ndjson(spec, sys.stdout, args.max_issues, fail_under, only, skip)
         else:
-            print("OpenAPI spec loaded and validated successfully!")
+            results = GatedScorer(spec, fail_under, only=only, skip=skip).run()
+            print(json.dumps(results, indent=2))
+        return 1 if fail_under is not None and not results['_gate']['passed'] else 0
+
+    instrumentation = None
+    if args.metrics:
+        from app.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation()
+
+    if args.workers != 1 and instrumentation is None and isinstance(spec, dict):
+        from app.sharding import score_sharded
+
+        results = score_sharded(spec, workers=args.workers or None, only=only, skip=skip)
+    else:
+        scorer = OpenAPIScorer(spec, instrumentation=instrumentation, only=only, skip=skip, budget=budget)
+        results = scorer.score_all()
+        if args.positions:
+            from app.positions import PositionIndex, add_positions
 
-    scorer = OpenAPIScorer(spec)
-    results = scorer.score_all()
+            add_positions(results, scorer, PositionIndex.from_file(args.source))
     print(json.dumps(results, indent=2))
+    return 0
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
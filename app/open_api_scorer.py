@@ -1,46 +1,119 @@
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
 
-from app.best_practices_scorer import BestPracticesScorer
-from app.descriptions_scorer import DescriptionsScorer
-from app.examples_scorer import ExamplesScorer
-from app.paths_operations_scorer import PathsOperationsScorer
-from app.response_codes_scorer import ResponseCodesScorer
-from app.schema_types_scorer import SchemaTypesScorer
-from app.security_scorer import SecurityScorer
+from app.scorer_registry import find_scorer, load_scorer, select_scorers
+from app.spec_index import SpecIndex
+from app.spec_walker import SpecWalker
+
+if TYPE_CHECKING:
+    from app.budgets import Budget
+    from app.instrumentation import Instrumentation
+    from app.schema_cache import SchemaResultCache
+
+
+def __getattr__(name: str) -> Any:
+    # The scorer classes used to be imported here eagerly; keep `from app.open_api_scorer import XScorer` working
+    if name.endswith('Scorer'):
+        try:
+            return find_scorer(name)
+        except KeyError:
+            pass
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class OpenAPIScorer:
-    def __init__(self, spec: Dict[str, Any]):
+    def __init__(self, spec: Dict[str, Any], index: Optional[SpecIndex] = None,
+                 instrumentation: Optional['Instrumentation'] = None,
+                 only: Optional[List[str]] = None, skip: Optional[List[str]] = None,
+                 budget: Optional['Budget'] = None, schema_results: Optional['SchemaResultCache'] = None):
+        """
+        `only` / `skip` select categories by registry name; unselected scorers
+        are never built or run, and the total is rescaled to 100 over the rest.
+        With a `budget` setting scorer_seconds, a category that runs out of
+        time stops, keeps the score of what it saw and is marked truncated.
+        `schema_results` shares the schema_types component checks with other
+        scorers using the same cache (see app.schema_cache).
+        """
         if not isinstance(spec, dict):
             raise ValueError("Spec must be a dictionary")
 
         self.spec = spec
-        self.scorers = {
-            'schema_types': SchemaTypesScorer(spec),
-            'descriptions': DescriptionsScorer(spec),
-            'paths_operations': PathsOperationsScorer(spec),
-            'response_codes': ResponseCodesScorer(spec),
-            'examples': ExamplesScorer(spec),
-            'security': SecurityScorer(spec),
-            'best_practices': BestPracticesScorer(spec)
-        }
-
-    def score_all(self) -> Dict[str, Any]:
+        self.index = index if index is not None else SpecIndex(spec)
+        self.instrumentation = instrumentation
+        self.scorers = {name: load_scorer(name)(spec) for name in select_scorers(only, skip)}
+        if schema_results is not None and 'schema_types' in self.scorers:
+            self.scorers['schema_types'].result_cache = schema_results
+        self.clock = None
+        if budget is not None and budget.scorer_seconds is not None:
+            from app.budgets import ScorerClock
+
+            self.clock = ScorerClock(budget.scorer_seconds)
+
+    def score_all(self, path_items: Optional[Iterable[Tuple[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Score every category. `path_items` streams (path, path_item) pairs in
+        place of spec['paths'], e.g. from StreamingSpec.iter_paths().
+        """
+        if self.instrumentation is not None:
+            return self._score_instrumented(path_items)
+
+        self._start_clock()
+        # One traversal feeds every scorer
+        SpecWalker(self.spec, self.index, guard=self.clock).walk(self.scorers.values(), path_items)
+        return self.collect_results()
+
+    def _start_clock(self) -> None:
+        if self.clock is not None:
+            for scorer in self.scorers.values():
+                self.clock.start(scorer)
+
+    def _score_instrumented(self, path_items: Optional[Iterable[Tuple[str, Any]]]) -> Dict[str, Any]:
+        # Each scorer gets its own walk so its time and node count are its own
+        if path_items is not None:
+            path_items = list(path_items)
+        instrumentation = self.instrumentation
+        metrics = {}
+        results = {}
+        self._start_clock()
+
+        with instrumentation.span('score_all') as total_span:
+            for name, scorer in self.scorers.items():
+                with instrumentation.span(name) as span:
+                    SpecWalker(self.spec, self.index, instrumentation.counting(span),
+                               guard=self.clock).walk([scorer], path_items)
+                    results[name] = scorer.result(scorer.finish())
+                    span.issues = len(scorer.issues)
+                metrics[name] = span.to_dict()
+                total_span.nodes_visited += span.nodes_visited
+                total_span.issues += span.issues
+            results.update(self._total(results))
+
+        metrics['total'] = total_span.to_dict()
+        results['_metrics'] = metrics
+        return results
+
+    def collect_results(self) -> Dict[str, Any]:
+        """Finish every scorer after its walk and add the total."""
         results = {}
 
         for name, scorer in self.scorers.items():
-            results[name] = scorer.get_result()
+            results[name] = scorer.result(scorer.finish())
 
+        results.update(self._total(results))
+        return results
+
+    def _total(self, results: Dict[str, Any]) -> Dict[str, Any]:
         total = sum(category['score'] for category in results.values())
+        max_total = sum(category['max'] for category in results.values())
+        if max_total and max_total != 100:
+            # Weights are relative: a partial selection (or plugins) still totals 100
+            total = total * 100 / max_total
         percentage = round((total / 100) * 100, 1)
 
-        results['total'] = {
+        return {'total': {
             'score': round(total, 1),
             'max': 100,
             'grade': self._calculate_grade(percentage)
-        }
-
-        return results
+        }}
 
     def _calculate_grade(self, percentage: float) -> str:
         if percentage >= 91:
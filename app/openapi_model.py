@@ -0,0 +1,365 @@
+import re
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+# A rule checks constraints between the fields of one object. It returns its
+# violations as (message, key) pairs, key None for the object itself, or None
+Violations = Optional[List[Tuple[str, Optional[str]]]]
+Rule = Callable[[Dict[str, Any]], Violations]
+
+
+class Primitive:
+    """A JSON scalar. `types` are matched exactly, so True is not an integer."""
+
+    __slots__ = ('label', 'types')
+
+    def __init__(self, label: str, types: Tuple[type, ...]):
+        self.label = label
+        self.types = types
+
+
+STRING = Primitive('a string', (str,))
+BOOLEAN = Primitive('a boolean', (bool,))
+INTEGER = Primitive('an integer', (int,))
+NUMBER = Primitive('a number', (int, float))
+ANY = Primitive('any value', ())
+
+
+class RefString:
+    """The string value of a `$ref`; collected so that local targets can be checked afterwards."""
+
+    __slots__ = ()
+
+
+REF = RefString()
+
+
+class Enum:
+    __slots__ = ('values',)
+
+    def __init__(self, *values: str):
+        self.values = values
+
+
+class Obj:
+    """An object with fixed fields, optional patterned fields and `x-` extensions."""
+
+    __slots__ = ('name', 'fields', 'required', 'patterned', 'closed', 'rules')
+
+    def __init__(self, name: str, fields: Dict[str, Any], required: Sequence[str] = (),
+                 patterned: Sequence[Tuple[str, Any]] = (), closed: bool = True, rules: Sequence[Rule] = ()):
+        self.name = name
+        self.fields = fields
+        self.required = tuple(required)
+        self.patterned = [(re.compile(pattern), desc) for pattern, desc in patterned]
+        # Closed objects report unknown fields (other than extensions)
+        self.closed = closed
+        self.rules = tuple(rules)
+
+
+class MapOf:
+    """An object used as a map: every value has the same shape."""
+
+    __slots__ = ('value', 'key_pattern')
+
+    def __init__(self, value: Any, key_pattern: Optional[str] = None):
+        self.value = value
+        self.key_pattern = re.compile(key_pattern) if key_pattern else None
+
+
+class ListOf:
+    __slots__ = ('item', 'min_items')
+
+    def __init__(self, item: Any, min_items: int = 0):
+        self.item = item
+        self.min_items = min_items
+
+
+class RefOr:
+    """A Reference Object ({'$ref': ...}) or the given object."""
+
+    __slots__ = ('target',)
+
+    def __init__(self, target: Any):
+        self.target = target
+
+
+class Either:
+    """The first alternative whose JSON type matches the value."""
+
+    __slots__ = ('options',)
+
+    def __init__(self, *options: Any):
+        self.options = options
+
+
+class Named:
+    """A reference to another entry of the model, so that definitions can be recursive."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+COMPONENT_KEY = r'^[a-zA-Z0-9.\-_]+$'
+RESPONSE_CODE = r'^(?:[1-5](?:[0-9]{2}|XX))$'
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+
+def _count(value: Dict[str, Any], fields: Tuple[str, ...]) -> int:
+    # Rules run for every object of their kind; a loop beats sum() over a generator
+    count = 0
+    for field in fields:
+        if field in value:
+            count += 1
+    return count
+
+
+def _exactly_one(*fields: str) -> Rule:
+    message = f"must have exactly one of {', '.join(repr(f) for f in fields)}"
+
+    def rule(value: Dict[str, Any]) -> Violations:
+        if _count(value, fields) != 1:
+            return [(message, None)]
+    return rule
+
+
+def _at_most_one(*fields: str) -> Rule:
+    message = f"must not have both {' and '.join(repr(f) for f in fields)}"
+
+    def rule(value: Dict[str, Any]) -> Violations:
+        if _count(value, fields) > 1:
+            return [(message, None)]
+    return rule
+
+
+def _path_parameter_required(value: Dict[str, Any]) -> Violations:
+    if value.get('in') == 'path' and value.get('required') is not True:
+        return [("path parameters must have 'required: true'", 'required')]
+
+
+def _single_content(value: Dict[str, Any]) -> Violations:
+    content = value.get('content')
+    if isinstance(content, dict) and len(content) != 1:
+        return [('must contain exactly one media type', 'content')]
+
+
+def _at_least_one_response(value: Dict[str, Any]) -> Violations:
+    if not any(not (isinstance(key, str) and key.startswith('x-')) for key in value):
+        return [('must contain at least one response', None)]
+
+
+def _array_items(value: Dict[str, Any]) -> Violations:
+    if value.get('type') == 'array' and 'items' not in value:
+        return [("schemas of type 'array' must define 'items'", None)]
+
+
+SECURITY_FIELDS = {
+    'apiKey': ('name', 'in'),
+    'http': ('scheme',),
+    'oauth2': ('flows',),
+    'openIdConnect': ('openIdConnectUrl',),
+    'mutualTLS': (),
+}
+
+
+def _security_scheme_fields(value: Dict[str, Any]) -> Violations:
+    scheme_type = value.get('type')
+    if isinstance(scheme_type, str):
+        return [(f"security schemes of type '{scheme_type}' must have '{field}'", None)
+                for field in SECURITY_FIELDS.get(scheme_type, ()) if field not in value]
+
+
+def build_model(version: str) -> Dict[str, Any]:
+    """The object model of OpenAPI `version` ('3.0' or '3.1'), keyed by object name; the root is 'OpenAPI'."""
+    v31 = version == '3.1'
+
+    def since_31(fields: Dict[str, Any]) -> Dict[str, Any]:
+        return fields if v31 else {}
+
+    schema = Named('Schema')
+    schema_or_ref = schema if v31 else RefOr(schema)
+    model: Dict[str, Any] = {}
+
+    model['OpenAPI'] = Obj('OpenAPI', {
+        'openapi': STRING,
+        'info': Named('Info'),
+        **since_31({'jsonSchemaDialect': STRING, 'webhooks': MapOf(RefOr(Named('PathItem')))}),
+        'servers': ListOf(Named('Server')),
+        'paths': Named('Paths'),
+        'components': Named('Components'),
+        'security': ListOf(Named('SecurityRequirement')),
+        'tags': ListOf(Named('Tag')),
+        'externalDocs': Named('ExternalDocumentation'),
+    }, required=('openapi', 'info') if v31 else ('openapi', 'info', 'paths'),
+        rules=(_at_least_one_of_root,) if v31 else ())
+
+    model['Info'] = Obj('Info', {
+        'title': STRING, **since_31({'summary': STRING}), 'description': STRING, 'termsOfService': STRING,
+        'contact': Named('Contact'), 'license': Named('License'), 'version': STRING,
+    }, required=('title', 'version'))
+    model['Contact'] = Obj('Contact', {'name': STRING, 'url': STRING, 'email': STRING})
+    model['License'] = Obj('License', {'name': STRING, **since_31({'identifier': STRING}), 'url': STRING},
+                           required=('name',), rules=(_at_most_one('identifier', 'url'),) if v31 else ())
+    model['Server'] = Obj('Server', {
+        'url': STRING, 'description': STRING, 'variables': MapOf(Named('ServerVariable')),
+    }, required=('url',))
+    model['ServerVariable'] = Obj('ServerVariable', {
+        'enum': ListOf(STRING, min_items=1), 'default': STRING, 'description': STRING,
+    }, required=('default',))
+
+    model['Components'] = Obj('Components', {
+        'schemas': MapOf(schema_or_ref, COMPONENT_KEY),
+        'responses': MapOf(RefOr(Named('Response')), COMPONENT_KEY),
+        'parameters': MapOf(RefOr(Named('Parameter')), COMPONENT_KEY),
+        'examples': MapOf(RefOr(Named('Example')), COMPONENT_KEY),
+        'requestBodies': MapOf(RefOr(Named('RequestBody')), COMPONENT_KEY),
+        'headers': MapOf(RefOr(Named('Header')), COMPONENT_KEY),
+        'securitySchemes': MapOf(RefOr(Named('SecurityScheme')), COMPONENT_KEY),
+        'links': MapOf(RefOr(Named('Link')), COMPONENT_KEY),
+        'callbacks': MapOf(RefOr(Named('Callback')), COMPONENT_KEY),
+        **since_31({'pathItems': MapOf(RefOr(Named('PathItem')), COMPONENT_KEY)}),
+    })
+
+    model['Paths'] = Obj('Paths', {}, patterned=[('^/', Named('PathItem'))])
+    model['PathItem'] = Obj('PathItem', {
+        '$ref': REF, 'summary': STRING, 'description': STRING,
+        **{method: Named('Operation') for method in HTTP_METHODS},
+        'servers': ListOf(Named('Server')),
+        'parameters': ListOf(RefOr(Named('Parameter'))),
+    })
+    model['Operation'] = Obj('Operation', {
+        'tags': ListOf(STRING), 'summary': STRING, 'description': STRING,
+        'externalDocs': Named('ExternalDocumentation'), 'operationId': STRING,
+        'parameters': ListOf(RefOr(Named('Parameter'))),
+        'requestBody': RefOr(Named('RequestBody')),
+        'responses': Named('Responses'),
+        'callbacks': MapOf(RefOr(Named('Callback'))),
+        'deprecated': BOOLEAN,
+        'security': ListOf(Named('SecurityRequirement')),
+        'servers': ListOf(Named('Server')),
+    }, required=() if v31 else ('responses',))
+    model['ExternalDocumentation'] = Obj('ExternalDocumentation', {'description': STRING, 'url': STRING},
+                                         required=('url',))
+
+    parameter_fields = {
+        'description': STRING, 'required': BOOLEAN, 'deprecated': BOOLEAN, 'allowEmptyValue': BOOLEAN,
+        'style': STRING, 'explode': BOOLEAN, 'allowReserved': BOOLEAN, 'schema': schema_or_ref,
+        'example': ANY, 'examples': MapOf(RefOr(Named('Example'))), 'content': MapOf(Named('MediaType')),
+    }
+    model['Parameter'] = Obj('Parameter', {
+        'name': STRING, 'in': Enum('query', 'header', 'path', 'cookie'), **parameter_fields,
+    }, required=('name', 'in'), rules=(
+        _path_parameter_required, _exactly_one('schema', 'content'), _single_content, _at_most_one('example', 'examples')
+    ))
+    model['Header'] = Obj('Header', parameter_fields, rules=(
+        _exactly_one('schema', 'content'), _single_content, _at_most_one('example', 'examples')
+    ))
+    model['RequestBody'] = Obj('RequestBody', {
+        'description': STRING, 'content': MapOf(Named('MediaType')), 'required': BOOLEAN,
+    }, required=('content',))
+    model['MediaType'] = Obj('MediaType', {
+        'schema': schema_or_ref, 'example': ANY, 'examples': MapOf(RefOr(Named('Example'))),
+        'encoding': MapOf(Named('Encoding')),
+    }, rules=(_at_most_one('example', 'examples'),))
+    model['Encoding'] = Obj('Encoding', {
+        'contentType': STRING, 'headers': MapOf(RefOr(Named('Header'))), 'style': STRING,
+        'explode': BOOLEAN, 'allowReserved': BOOLEAN,
+    })
+    model['Responses'] = Obj('Responses', {'default': RefOr(Named('Response'))},
+                             patterned=[(RESPONSE_CODE, RefOr(Named('Response')))],
+                             rules=() if v31 else (_at_least_one_response,))
+    model['Response'] = Obj('Response', {
+        'description': STRING, 'headers': MapOf(RefOr(Named('Header'))),
+        'content': MapOf(Named('MediaType')), 'links': MapOf(RefOr(Named('Link')), COMPONENT_KEY),
+    }, required=('description',))
+    model['Callback'] = MapOf(RefOr(Named('PathItem')))
+    model['Example'] = Obj('Example', {
+        'summary': STRING, 'description': STRING, 'value': ANY, 'externalValue': STRING,
+    }, rules=(_at_most_one('value', 'externalValue'),))
+    model['Link'] = Obj('Link', {
+        'operationRef': STRING, 'operationId': STRING, 'parameters': MapOf(ANY), 'requestBody': ANY,
+        'description': STRING, 'server': Named('Server'),
+    }, rules=(_at_most_one('operationRef', 'operationId'),))
+    model['Tag'] = Obj('Tag', {
+        'name': STRING, 'description': STRING, 'externalDocs': Named('ExternalDocumentation'),
+    }, required=('name',))
+
+    scheme_types = ('apiKey', 'http', 'mutualTLS', 'oauth2', 'openIdConnect') if v31 else \
+        ('apiKey', 'http', 'oauth2', 'openIdConnect')
+    model['SecurityScheme'] = Obj('SecurityScheme', {
+        'type': Enum(*scheme_types), 'description': STRING, 'name': STRING,
+        'in': Enum('query', 'header', 'cookie'), 'scheme': STRING, 'bearerFormat': STRING,
+        'flows': Named('OAuthFlows'), 'openIdConnectUrl': STRING,
+    }, required=('type',), rules=(_security_scheme_fields,))
+    model['OAuthFlows'] = Obj('OAuthFlows', {
+        'implicit': _flow('ImplicitFlow', ('authorizationUrl',)),
+        'password': _flow('PasswordFlow', ('tokenUrl',)),
+        'clientCredentials': _flow('ClientCredentialsFlow', ('tokenUrl',)),
+        'authorizationCode': _flow('AuthorizationCodeFlow', ('authorizationUrl', 'tokenUrl')),
+    })
+    model['SecurityRequirement'] = MapOf(ListOf(STRING))
+    model['Discriminator'] = Obj('Discriminator', {'propertyName': STRING, 'mapping': MapOf(STRING)},
+                                 required=('propertyName',), closed=not v31)
+    model['XML'] = Obj('XML', {
+        'name': STRING, 'namespace': STRING, 'prefix': STRING, 'attribute': BOOLEAN, 'wrapped': BOOLEAN,
+    })
+
+    model['Schema'] = _schema_31(schema) if v31 else _schema_30(schema)
+    return model
+
+
+def _at_least_one_of_root(value: Dict[str, Any]) -> Violations:
+    if not any(field in value for field in ('paths', 'components', 'webhooks')):
+        return [("must have at least one of 'paths', 'components' or 'webhooks'", None)]
+
+
+def _flow(name: str, urls: Tuple[str, ...]) -> Obj:
+    return Obj(name, {
+        'authorizationUrl': STRING, 'tokenUrl': STRING, 'refreshUrl': STRING, 'scopes': MapOf(STRING),
+    }, required=urls + ('scopes',))
+
+
+SCHEMA_TYPES = ('array', 'boolean', 'integer', 'number', 'object', 'string')
+
+
+def _schema_30(schema: Named) -> Obj:
+    schema_or_ref = RefOr(schema)
+    return Obj('Schema', {
+        'title': STRING, 'multipleOf': NUMBER, 'maximum': NUMBER, 'exclusiveMaximum': BOOLEAN,
+        'minimum': NUMBER, 'exclusiveMinimum': BOOLEAN, 'maxLength': INTEGER, 'minLength': INTEGER,
+        'pattern': STRING, 'maxItems': INTEGER, 'minItems': INTEGER, 'uniqueItems': BOOLEAN,
+        'maxProperties': INTEGER, 'minProperties': INTEGER, 'required': ListOf(STRING, min_items=1),
+        'enum': ListOf(ANY, min_items=1), 'type': Enum(*SCHEMA_TYPES),
+        'allOf': ListOf(schema_or_ref, min_items=1), 'oneOf': ListOf(schema_or_ref, min_items=1),
+        'anyOf': ListOf(schema_or_ref, min_items=1), 'not': schema_or_ref, 'items': schema_or_ref,
+        'properties': MapOf(schema_or_ref), 'additionalProperties': Either(BOOLEAN, schema_or_ref),
+        'description': STRING, 'format': STRING, 'default': ANY, 'nullable': BOOLEAN,
+        'discriminator': Named('Discriminator'), 'readOnly': BOOLEAN, 'writeOnly': BOOLEAN,
+        'xml': Named('XML'), 'externalDocs': Named('ExternalDocumentation'), 'example': ANY, 'deprecated': BOOLEAN,
+    }, rules=(_array_items,))
+
+
+def _schema_31(schema: Named) -> Either:
+    # JSON Schema 2020-12: boolean schemas, $ref next to other keywords, unknown keywords allowed
+    schemas = ListOf(schema, min_items=1)
+    return Either(BOOLEAN, Obj('Schema', {
+        '$schema': STRING, '$id': STRING, '$ref': REF, '$anchor': STRING, '$dynamicRef': STRING,
+        '$dynamicAnchor': STRING, '$defs': MapOf(schema), '$comment': STRING,
+        'type': Either(Enum(*SCHEMA_TYPES, 'null'), ListOf(Enum(*SCHEMA_TYPES, 'null'), min_items=1)),
+        'enum': ListOf(ANY), 'const': ANY, 'multipleOf': NUMBER, 'maximum': NUMBER, 'exclusiveMaximum': NUMBER,
+        'minimum': NUMBER, 'exclusiveMinimum': NUMBER, 'maxLength': INTEGER, 'minLength': INTEGER,
+        'pattern': STRING, 'maxItems': INTEGER, 'minItems': INTEGER, 'uniqueItems': BOOLEAN,
+        'maxContains': INTEGER, 'minContains': INTEGER, 'maxProperties': INTEGER, 'minProperties': INTEGER,
+        'required': ListOf(STRING), 'dependentRequired': MapOf(ListOf(STRING)),
+        'properties': MapOf(schema), 'patternProperties': MapOf(schema), 'dependentSchemas': MapOf(schema),
+        'additionalProperties': schema, 'unevaluatedProperties': schema, 'propertyNames': schema,
+        'items': schema, 'prefixItems': schemas, 'contains': schema, 'unevaluatedItems': schema,
+        'allOf': schemas, 'anyOf': schemas, 'oneOf': schemas, 'not': schema,
+        'if': schema, 'then': schema, 'else': schema,
+        'title': STRING, 'description': STRING, 'default': ANY, 'deprecated': BOOLEAN, 'readOnly': BOOLEAN,
+        'writeOnly': BOOLEAN, 'examples': ListOf(ANY), 'format': STRING, 'contentEncoding': STRING,
+        'contentMediaType': STRING, 'contentSchema': schema,
+        'discriminator': Named('Discriminator'), 'xml': Named('XML'),
+        'externalDocs': Named('ExternalDocumentation'), 'example': ANY,
+    }, closed=False))
@@ -1,46 +1,46 @@
 from typing import Dict, Any
 
+from app.issues import Issue, IssueCode
 from app.scoring_strategy import ScoringStrategy
+from app.spec_index import CRUD_METHODS
 
 
 class PathsOperationsScorer(ScoringStrategy):
+    path_counters = ('num_paths', 'inconsistent_names')
+
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 15
+        self.num_paths = 0
+        self.inconsistent_names = False
+
+    def begin(self) -> None:
+        super().begin()
+        self.num_paths = 0
+        self.inconsistent_names = False
+
+    def visit_path(self, path: str, path_item: Dict[str, Any]) -> None:
+        self.num_paths += 1
+
+        # Check for consistent naming
+        if '_' in path or ' ' in path:
+            self.inconsistent_names = True
 
-    def score(self) -> float:
+        methods = set(m.lower() for m in path_item.keys() if m.lower() in CRUD_METHODS)
+
+        if not path.endswith('}') and not methods.issuperset({'get', 'post'}):
+            self.add_issue(IssueCode.COLLECTION_METHODS, ('paths', path))
+
+        if path.endswith('}') and not methods.issuperset({'get', 'put', 'delete'}):
+            self.add_issue(IssueCode.ITEM_METHODS, ('paths', path))
+
+    def finish(self) -> float:
         max_points = self.max_score
         score = max_points
-        paths = self.spec.get('paths', {})
-        path_names = list(paths.keys())
 
-        # Check for consistent naming
-        inconsistent_names = any('_' in path for path in path_names) or any(' ' in path for path in path_names)
-        if inconsistent_names:
-            self.issues.append({
-                'location': 'paths',
-                'message': 'Inconsistent path naming',
-                'severity': 'low'
-            })
+        if self.inconsistent_names:
+            self.add_issues([Issue(IssueCode.INCONSISTENT_PATH_NAMING, ('paths',))], first=True)
             score -= 1
 
-        crud_methods = {'get', 'post', 'put', 'patch', 'delete'}
-        for path, path_item in paths.items():
-            methods = set(m.lower() for m in path_item.keys() if m.lower() in crud_methods)
-
-            if not path.endswith('}') and not methods.issuperset({'get', 'post'}):
-                self.issues.append({
-                    'location': f'paths.{path}',
-                    'message': 'would be better if it had both get,post methods',
-                    'severity': 'medium'
-                })
-
-            if path.endswith('}') and not methods.issuperset({'get', 'put', 'delete'}):
-                self.issues.append({
-                    'location': f'paths.{path}',
-                    'message': 'would be better if it had get,post,delete methods',
-                    'severity': 'medium'
-                })
-
-        score -= len(self.issues) * (max_points / len(path_names)) if path_names else 0
-        return max(0, score)
\ No newline at end of file
+        score -= len(self.issues) * (max_points / self.num_paths) if self.num_paths else 0
+        return max(0, score)
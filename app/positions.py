@@ -0,0 +1,227 @@
+import json
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
+
+from app.issues import Index
+
+if TYPE_CHECKING:
+    from app.open_api_scorer import OpenAPIScorer
+    from app.ref_resolver import RefResolver
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SCALAR = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null')
+
+
+def escape(key: Any) -> str:
+    """One JSON Pointer reference token."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def json_offsets(text: str) -> Dict[str, int]:
+    """
+    Offset of every value in a JSON document, keyed by JSON Pointer; for
+    object members, the offset of the member's key. `text` must be valid JSON.
+    """
+    scanstring = json.decoder.scanstring
+    whitespace = _WHITESPACE.match
+    # [pointer, index of the next element] of each open container; the index is None for objects
+    stack: List[List] = []
+    pointer = ''
+    position = whitespace(text, 0).end()
+    offsets = {pointer: position}
+    while True:
+        char = text[position]
+        opened = False
+        if char == '{' or char == '[':
+            position = whitespace(text, position + 1).end()
+            if text[position] == ('}' if char == '{' else ']'):
+                position += 1
+            else:
+                stack.append([pointer, None if char == '{' else 0])
+                opened = True
+        elif char == '"':
+            position = scanstring(text, position + 1)[1]
+        else:
+            match = _SCALAR.match(text, position)
+            if match is None:
+                raise ValueError(f'Unexpected character at offset {position}')
+            position = match.end()
+
+        if not opened:
+            # Close the containers this value ended, up to the next member or element
+            while True:
+                position = whitespace(text, position).end()
+                if not stack:
+                    return offsets
+                char = text[position]
+                if char == ',':
+                    position = whitespace(text, position + 1).end()
+                    break
+                if char != '}' and char != ']':
+                    raise ValueError(f'Unexpected character at offset {position}')
+                stack.pop()
+                position += 1
+
+        container = stack[-1]
+        if container[1] is None:
+            start = position
+            key, position = scanstring(text, position + 1)
+            pointer = f'{container[0]}/{escape(key)}'
+            position = whitespace(text, position).end()
+            if text[position] != ':':
+                raise ValueError(f'Unexpected character at offset {position}')
+            position = whitespace(text, position + 1).end()
+            offsets[pointer] = start
+        else:
+            pointer = f'{container[0]}/{container[1]}'
+            container[1] += 1
+            offsets[pointer] = position
+
+
+def yaml_positions(text: str) -> Dict[str, Tuple[int, int]]:
+    """
+    0-based (line, column) of every node of a YAML document, keyed by JSON
+    Pointer; for mapping entries, the position of the key. A node reached
+    through several aliases is only located under the first of them.
+    """
+    import yaml
+    from app.validator import yaml_loader
+
+    root = yaml.compose(text, Loader=yaml_loader())
+    if root is None:
+        return {}
+    positions = {'': (root.start_mark.line, root.start_mark.column)}
+    expanded = set()
+    stack = [('', root)]
+    while stack:
+        pointer, node = stack.pop()
+        if id(node) in expanded:
+            continue
+        expanded.add(id(node))
+        if isinstance(node, yaml.MappingNode):
+            for key, value in node.value:
+                if isinstance(key, yaml.ScalarNode):
+                    child = f'{pointer}/{escape(key.value)}'
+                    positions.setdefault(child, (key.start_mark.line, key.start_mark.column))
+                    stack.append((child, value))
+        elif isinstance(node, yaml.SequenceNode):
+            for index, value in enumerate(node.value):
+                child = f'{pointer}/{index}'
+                positions.setdefault(child, (value.start_mark.line, value.start_mark.column))
+                stack.append((child, value))
+    return positions
+
+
+class PositionIndex:
+    """Source positions of the nodes of one JSON or YAML document, by JSON Pointer.
+
+    Nothing is computed until the first lookup, so keeping an index around for
+    a spec costs only its text. The first lookup scans the text once into a
+    table of offsets (for YAML, taken from the composed node marks) and the
+    start of every line; after that each lookup is a dict access and a
+    bisection, and the text itself is dropped.
+    """
+
+    def __init__(self, text: str):
+        self._text: Optional[str] = text
+        self._offsets: Optional[Dict[str, int]] = None
+        self._lines: Optional[array] = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'PositionIndex':
+        return cls(Path(path).read_bytes().decode('utf-8-sig'))
+
+    def _build(self) -> None:
+        text = self._text
+        lines = array('q', [0])
+        lines.extend(match.end() for match in re.finditer('\n', text))
+        offsets: Dict[str, int] = {}
+        try:
+            if text.lstrip()[:1] in ('{', '['):
+                try:
+                    offsets = json_offsets(text)
+                except (ValueError, IndexError):
+                    offsets = {}
+            if not offsets:
+                offsets = {pointer: lines[line] + column
+                           for pointer, (line, column) in yaml_positions(text).items() if line < len(lines)}
+        except Exception:
+            # Positions are a convenience; a document the scanners cannot read simply has none
+            offsets = {}
+        self._offsets, self._lines, self._text = offsets, lines, None
+
+    def position(self, pointer: str) -> Optional[Tuple[int, int]]:
+        """1-based (line, column) of the node at `pointer`, or None if the document has no such node."""
+        if self._offsets is None:
+            self._build()
+        offset = self._offsets.get(pointer)
+        if offset is None:
+            return None
+        line = bisect_right(self._lines, offset)
+        return line, offset - self._lines[line - 1] + 1
+
+    def __contains__(self, pointer: str) -> bool:
+        if self._offsets is None:
+            self._build()
+        return pointer in self._offsets
+
+
+def _named(items: List[Any], name: Any, resolver: Optional['RefResolver']) -> Optional[int]:
+    for index, item in enumerate(items):
+        if resolver is not None:
+            item = resolver.resolve(item)
+        if isinstance(item, dict) and item.get('name') == name:
+            return index
+    return None
+
+
+def issue_pointer(spec: Any, location: Tuple, resolver: Optional['RefResolver'] = None) -> Optional[str]:
+    """
+    JSON Pointer of the deepest node of `spec` along an issue location. Names
+    in list positions (parameters are located by name) are mapped back to
+    their index; a part that does not exist, or lies behind a $ref, ends the
+    walk. Returns None when not even the first part exists.
+    """
+    node = spec
+    pointer = ''
+    for part in location:
+        if isinstance(node, dict):
+            if part not in node:
+                part = next((key for key in node if str(key) == str(part)), None)
+                if part is None:
+                    break
+            node = node[part]
+            pointer = f'{pointer}/{escape(part)}'
+        elif isinstance(node, list):
+            if isinstance(part, Index):
+                index = int(part)
+            else:
+                index = _named(node, part, resolver)
+            if index is None or not 0 <= index < len(node):
+                break
+            node = node[index]
+            pointer = f'{pointer}/{index}'
+        else:
+            break
+    return pointer or None
+
+
+def add_positions(results: Dict[str, Any], scorer: 'OpenAPIScorer', positions: PositionIndex) -> Dict[str, Any]:
+    """
+    Add 'line' and 'column' to the issues in `results` (from `scorer`'s last
+    score_all()) that can be placed in the source.
+    """
+    resolver = scorer.index.resolver
+    for name, strategy in scorer.scorers.items():
+        category = results.get(name)
+        if not isinstance(category, dict):
+            continue
+        for issue, entry in zip(strategy.issues, category['issues']):
+            pointer = issue_pointer(scorer.spec, issue.location, resolver)
+            position = positions.position(pointer) if pointer is not None else None
+            if position is not None:
+                entry['line'], entry['column'] = position
+    return results
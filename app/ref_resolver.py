@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Optional, Set
+from urllib.parse import unquote
+
+_MISSING = object()
+
+
+class RefResolver:
+    """Resolve local JSON Pointer $refs ('#/components/...') against one spec.
+
+    Every ref string is resolved at most once; chains of refs are followed and
+    all refs along a chain share the memoized target, so the resolved node is
+    the object inside the spec itself rather than a copy. Unresolvable and
+    cyclic refs are recorded in `errors` and resolve to the referencing node.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.errors: Dict[str, str] = {}
+        # When set, every ref looked up is added to it (used to track dependencies)
+        self.trace: Optional[Set[str]] = None
+        self._memo: Dict[str, Any] = {}
+
+    def resolve(self, node: Any) -> Any:
+        if not isinstance(node, dict):
+            return node
+        ref = node.get('$ref')
+        if not isinstance(ref, str):
+            return node
+        target = self.resolve_ref(ref)
+        return node if target is None else target
+
+    def resolve_ref(self, ref: str) -> Optional[Any]:
+        if self.trace is not None:
+            self.trace.add(ref)
+        target = self._memo.get(ref, _MISSING)
+        if target is not _MISSING:
+            return target
+
+        chain: List[str] = []
+        current = ref
+        while True:
+            target = self._memo.get(current, _MISSING)
+            if target is not _MISSING:
+                break
+            if current in chain:
+                self._fail(chain, f'Circular $ref: {" -> ".join(chain + [current])}')
+                return None
+            chain.append(current)
+
+            target = self._lookup(current)
+            if target is _MISSING:
+                self._fail(chain, f'Unresolvable $ref: {current}')
+                return None
+            next_ref = target.get('$ref') if isinstance(target, dict) else None
+            if not isinstance(next_ref, str):
+                break
+            current = next_ref
+
+        for chained in chain:
+            self._memo[chained] = target
+        return target
+
+    def _fail(self, chain: List[str], message: str) -> None:
+        for chained in chain:
+            self._memo[chained] = None
+            self.errors.setdefault(chained, message)
+
+    def _lookup(self, ref: str) -> Any:
+        # Only local refs are supported; external documents are left unresolved
+        if not ref.startswith('#'):
+            return _MISSING
+
+        node = self.spec
+        pointer = unquote(ref[1:])
+        if not pointer:
+            return node
+        if not pointer.startswith('/'):
+            return _MISSING
+
+        for token in pointer[1:].split('/'):
+            token = token.replace('~1', '/').replace('~0', '~')
+            if isinstance(node, dict):
+                node = node.get(token, _MISSING)
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                return _MISSING
+            if node is _MISSING:
+                return _MISSING
+        return node
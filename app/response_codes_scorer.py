@@ -1,48 +1,45 @@
+from app.issues import IssueCode
 from app.scoring_strategy import ScoringStrategy
 from typing import Dict, Any
 
 
 class ResponseCodesScorer(ScoringStrategy):
+    required_codes = {
+        'get': ['200'],
+        'post': ['201'],
+        'put': ['200'],
+        'patch': ['200'],
+        'delete': ['204']
+    }
+    operation_methods = frozenset(required_codes)
+    path_counters = ('num_methods',)
 
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 15
+        self.num_methods = 0
 
-    def score(self) -> float:
+    def begin(self) -> None:
+        super().begin()
+        self.num_methods = 0
+
+    def visit_path(self, path: str, path_item: Dict[str, Any]) -> None:
+        # Every key of the path item counts towards the denominator
+        self.num_methods += len(path_item)
+
+    def visit_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        responses = operation.get('responses', {})
+        for required_code in self.required_codes[method.lower()]:
+
+            if required_code not in responses:
+                self.add_issue(IssueCode.MISSING_EXPECTED_RESPONSE, ('paths', path, method, 'responses'),
+                               required_code, method.upper())
+
+        if '500' not in responses:
+            self.add_issue(IssueCode.MISSING_ERROR_RESPONSE, ('paths', path, method, 'responses'), method.upper())
+
+    def finish(self) -> float:
         max_points = self.max_score
-        required_codes = {
-            'get': ['200'],
-            'post': ['201'],
-            'put': ['200'],
-            'patch': ['200'],
-            'delete': ['204']
-        }
-        num_methods = 0
-
-        for path, path_item in self.spec.get('paths', {}).items():
-            for method, operation in path_item.items():
-                num_methods += 1
-                method_lower = method.lower()
-                if method_lower not in required_codes:
-                    continue
-
-                responses = operation.get('responses', {})
-                for required_code in required_codes[method_lower]:
-
-                    if required_code not in responses:
-                        self.issues.append({
-                            'location': f'paths.{path}.{method}.responses',
-                            'message': f'Missing expected {required_code} response for {method.upper()}',
-                            'severity': 'medium'
-                        })
-
-                if '500' not in responses:
-                    self.issues.append({
-                        'location': f'paths.{path}.{method}.responses',
-                        'message': f'Missing 500 error response for {method.upper()}',
-                        'severity': 'low'
-                    })
-
-        points_per_response = max_points / num_methods if num_methods > 0 else 0
+        points_per_response = max_points / self.num_methods if self.num_methods > 0 else 0
         score = max_points - (len(self.issues) * points_per_response)
         return max(0, round(score, 1))
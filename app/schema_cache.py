@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+from app.issues import IssueCode
+from app.ref_resolver import RefResolver
+from app.spec_cache import SpecCache
+from app.structure import structure_repr
+
+# Bump when the per-schema checks change so stale entries are never returned
+RESULTS_FORMAT = 'schema-results-v2'
+DEFAULT_SIZE = 4096
+
+# The issues found in one component, located relative to it, whether it counts as bad,
+# and the $refs in it that lead outside components.schemas
+SchemaResult = Tuple[Tuple[Tuple[IssueCode, Tuple, Tuple], ...], bool, Tuple[str, ...]]
+
+
+class SchemaKeys:
+    """Structural keys for the components of one spec.
+
+    A component's result depends on the component itself and, when it is a
+    $ref, on the schema that ref resolves to (whether that has a type); refs
+    nested inside it are returned, not followed. So the key combines the
+    digest of the component with the digest of its resolved target, each
+    computed once per object, and the same schema copied into different specs
+    gets the same key unless what it resolves to differs. Like
+    structural_hash(), repr() keeps key order, which decides issue order;
+    structure_repr() writes it out at any depth.
+    """
+
+    def __init__(self, resolver: RefResolver):
+        self.resolver = resolver
+        # id(node) -> (node, digest); the node is kept so that its id stays unique
+        self._digests: Dict[int, Tuple[Any, str]] = {}
+
+    def _digest(self, node: Any) -> str:
+        entry = self._digests.get(id(node))
+        if entry is None:
+            digest = hashlib.blake2b(structure_repr(node).encode('utf-8', 'surrogatepass'), digest_size=16)
+            entry = self._digests[id(node)] = (node, digest.hexdigest())
+        return entry[1]
+
+    def key(self, schema: Any) -> str:
+        resolved = self.resolver.resolve(schema)
+        target = self._digest(resolved) if resolved is not schema else ''
+        return hashlib.blake2b(f'{RESULTS_FORMAT}\0{self._digest(schema)}\0{target}'.encode(),
+                               digest_size=16).hexdigest()
+
+
+class SchemaResultCache:
+    """Per-component results of SchemaTypesScorer, keyed by SchemaKeys.key().
+
+    Kept in a process-wide LRU of `size` entries, so components shared by
+    many specs of a batch are checked once; with a directory the entries are
+    also written through to a SpecCache there, which keeps them across runs
+    and evicts the least recently used ones past its size limit.
+    """
+
+    def __init__(self, size: int = DEFAULT_SIZE, directory: Optional[Union[str, Path]] = None):
+        self.size = size
+        self.store = SpecCache(directory) if directory is not None else None
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries: 'OrderedDict[str, SchemaResult]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SchemaResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return result
+        result = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if result is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['hits'] += 1
+                self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: SchemaResult) -> None:
+        with self._lock:
+            self._remember(key, result)
+        if self.store is not None:
+            self.store.put(key, result)
+
+    def _remember(self, key: str, result: SchemaResult) -> None:
+        self._entries[key] = result
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
@@ -1,71 +1,250 @@
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set, Tuple
 
+from app.issues import Index, IssueCode
 from app.scoring_strategy import ScoringStrategy
 
+if TYPE_CHECKING:
+    from app.schema_cache import SchemaResult, SchemaResultCache
+
+# Keywords holding one subschema, a list of subschemas and a map of named subschemas
+SUBSCHEMA_KEYWORDS = ('items', 'additionalProperties', 'not')
+SUBSCHEMA_LIST_KEYWORDS = ('allOf', 'oneOf', 'anyOf', 'prefixItems')
+SUBSCHEMA_MAP_KEYWORDS = ('properties',)
+SUBSCHEMA_ANY = frozenset(SUBSCHEMA_KEYWORDS + SUBSCHEMA_LIST_KEYWORDS + SUBSCHEMA_MAP_KEYWORDS)
+# A nested schema with any of these gets its meaning from them and needs no type of its own
+TYPE_FREE_KEYWORDS = frozenset(('$ref', 'allOf', 'oneOf', 'anyOf', 'not', 'enum', 'const'))
+COMPONENT_SCHEMAS = '#/components/schemas/'
+
+
+def _needs_type(schema: Dict[str, Any]) -> bool:
+    return bool(schema) and not schema.get('type') and TYPE_FREE_KEYWORDS.isdisjoint(schema)
+
+
+def _materialize(link: Optional[Tuple]) -> Tuple:
+    parts = []
+    while link is not None:
+        link, keys = link
+        parts.append(keys)
+    return tuple(key for keys in reversed(parts) for key in keys)
+
+
+def walk_schema(schema: Any) -> Tuple[List[Tuple], List[str]]:
+    """
+    Walk `schema` and everything nested in it with an explicit stack, in
+    document order. Returns the locations (relative to `schema`) of nested
+    schemas that need a type but have none, and the $refs met on the way
+    that lead outside components.schemas. $refs are not followed: every
+    component is walked on its own, and the caller walks the other targets
+    once each. A node shared through YAML aliases is walked once.
+    """
+    untyped = []
+    refs = []
+    seen = set()
+    # Locations are linked (parent, keys) pairs, only turned into tuples for the nodes reported
+    stack = [(schema, None)]
+    while stack:
+        node, location = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        ref = node.get('$ref')
+        if isinstance(ref, str):
+            if not ref.startswith(COMPONENT_SCHEMAS):
+                refs.append(ref)
+            continue
+        if location is not None and _needs_type(node):
+            untyped.append(_materialize(location))
+        # Most schemas are leaves; only those with subschemas are worth remembering
+        if SUBSCHEMA_ANY.isdisjoint(node) or id(node) in seen:
+            continue
+        seen.add(id(node))
+
+        children = []
+        for keyword in SUBSCHEMA_MAP_KEYWORDS:
+            members = node.get(keyword)
+            if isinstance(members, dict):
+                children.extend((member, (location, (keyword, name))) for name, member in members.items())
+        for keyword in SUBSCHEMA_KEYWORDS:
+            if keyword in node:
+                children.append((node[keyword], (location, (keyword,))))
+        for keyword in SUBSCHEMA_LIST_KEYWORDS:
+            members = node.get(keyword)
+            if isinstance(members, list):
+                children.extend((member, (location, (keyword, Index(i)))) for i, member in enumerate(members))
+        stack.extend(reversed(children))
+    return untyped, refs
+
+
+def _ref_location(ref: str) -> Tuple:
+    from urllib.parse import unquote
+
+    return tuple(token.replace('~1', '/').replace('~0', '~') for token in unquote(ref[1:]).split('/')[1:])
+
 
 class SchemaTypesScorer(ScoringStrategy):
     """Score the schema and types quality."""
 
+    path_counters = ('num_params', 'num_bad_params', 'num_contents', 'num_bad_contents', 'pending_refs')
+    # Shared results of the component checks (see app.schema_cache), set per scorer through
+    # OpenAPIScorer(schema_results=...); None checks every component
+    result_cache: Optional['SchemaResultCache'] = None
+
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 20
+        self.schemas_score = self.max_score
+        self.num_schemas = 0
+        self.num_bad_schemas = 0
+        self.num_params = 0
+        self.num_bad_params = 0
+        self.num_contents = 0
+        self.num_bad_contents = 0
+        # $refs to schemas outside components.schemas met in inline schemas, walked in finish()
+        self.pending_refs: List[str] = []
+        self._walked: Set[int] = set()
+
+    def begin(self) -> None:
+        super().begin()
+        self.schemas_score = self.max_score
+        self.num_schemas = 0
+        self.num_bad_schemas = 0
+        self.num_params = 0
+        self.num_bad_params = 0
+        self.num_contents = 0
+        self.num_bad_contents = 0
+        self.pending_refs = []
+        self._walked = set()
+
+        # Check schemas in components
+        cache = self.result_cache
+        if cache is not None:
+            from app.schema_cache import SchemaKeys
+
+            keys = SchemaKeys(self.index.resolver)
+        refs = []
+        for schema_name, schema in self.spec.get('components', {}).get('schemas', {}).items():
+            if self.out_of_time():
+                break
+            if cache is None:
+                issues, bad, component_refs = self.check_component(schema)
+            else:
+                key = keys.key(schema)
+                result = cache.get(key)
+                if result is None:
+                    result = self.check_component(schema)
+                    cache.put(key, result)
+                issues, bad, component_refs = result
+            for code, location, args in issues:
+                self.add_issue(code, ('components', 'schemas', schema_name) + location, *args)
+            self.num_schemas += 1
+            self.num_bad_schemas += bad
+            refs.extend(component_refs)
+        self._walk_targets(refs)
+
+    def check_component(self, schema: Any) -> 'SchemaResult':
+        """
+        The issues in one entry of components.schemas, located relative to it,
+        whether it is bad, and the $refs in it that lead outside components.schemas.
+        """
+        resolved = self.index.resolver.resolve(schema)
+        issues = []
+        if not isinstance(resolved, dict) or not resolved.get('type'):
+            issues.append((IssueCode.SCHEMA_MISSING_TYPE, (), ()))
+        untyped, refs = walk_schema(schema)
+        issues.extend((IssueCode.NESTED_SCHEMA_MISSING_TYPE, location, ()) for location in untyped)
+        return tuple(issues), bool(issues), tuple(refs)
+
+    def _walk_targets(self, refs: List[str]) -> None:
+        """Check the schemas `refs` lead to like components, each target once, following the refs in them."""
+        resolver = self.index.resolver
+        pending = list(reversed(refs))
+        while pending and not self.out_of_time():
+            ref = pending.pop()
+            target = resolver.resolve_ref(ref)
+            if target is None or id(target) in self._walked:
+                continue
+            self._walked.add(id(target))
+            location = _ref_location(ref)
+            issues, bad, target_refs = self.check_component(target)
+            for code, relative, args in issues:
+                self.add_issue(code, location + relative, *args)
+            self.num_schemas += 1
+            self.num_bad_schemas += bad
+            pending.extend(reversed(target_refs))
+
+    def _check_inline(self, schema: Any, location: Tuple) -> bool:
+        """Report the untyped nodes of a schema defined in place; whether there were any."""
+        if not isinstance(schema, dict):
+            return False
+        ref = schema.get('$ref')
+        if isinstance(ref, str):
+            if not ref.startswith(COMPONENT_SCHEMAS):
+                self.pending_refs.append(ref)
+            return False
+        if SUBSCHEMA_ANY.isdisjoint(schema):
+            # The common case, a plain typed value, needs no walk
+            if not _needs_type(schema):
+                return False
+            untyped, refs = [()], []
+        else:
+            untyped, refs = walk_schema(schema)
+            if _needs_type(schema):
+                untyped.insert(0, ())
+        for relative in untyped:
+            self.add_issue(IssueCode.INLINE_SCHEMA_MISSING_TYPE if not relative else
+                           IssueCode.NESTED_SCHEMA_MISSING_TYPE, location + relative)
+        if refs:
+            self.pending_refs.extend(refs)
+        return bool(untyped)
+
+    # Check parameters and request bodies
+    def visit_parameter(self, path: str, method: str, param: Dict[str, Any]) -> None:
+        self.num_params += 1
+        location = ('paths', path, method, 'parameters', param.get('name', '<unnamed>'))
+        if 'schema' not in param:
+            self.add_issue(IssueCode.PARAMETER_MISSING_SCHEMA, location)
+            self.num_bad_params += 1
+        elif self._check_inline(param['schema'], location + ('schema',)):
+            self.num_bad_params += 1
+
+    def visit_request_media_type(self, path: str, method: str, content_type: str, content: Dict[str, Any]) -> None:
+        self.num_contents += 1
+        location = ('paths', path, method, 'requestBody', 'content', content_type)
+        if 'schema' not in content:
+            self.num_bad_contents += 1
+            self.add_issue(IssueCode.REQUEST_BODY_MISSING_SCHEMA, location)
+        elif self._check_inline(content['schema'], location + ('schema',)):
+            self.num_bad_contents += 1
+
+    def visit_response_media_type(self, path: str, method: str, code: str, content_type: str,
+                                  content: Dict[str, Any]) -> None:
+        # Responses without a schema are common (and fine) for non-JSON payloads; only inline schemas are checked
+        if 'schema' in content:
+            self.num_contents += 1
+            if self._check_inline(content['schema'], ('paths', path, method, 'responses', code, 'content',
+                                                      content_type, 'schema')):
+                self.num_bad_contents += 1
+
+    def finish(self) -> float:
+        if self.pending_refs:
+            self._walk_targets(list(dict.fromkeys(self.pending_refs)))
 
-    def score(self) -> float:
         max_points = self.max_score
         score_one = max_points
         score_two = max_points
         score_three = max_points
-        num_schemas = len(self.spec.get('components', {}).get('schemas', {}))
-        minus_points_per_bad_schema = max_points / num_schemas if num_schemas > 0 else 0
 
-        # Check schemas in components
-        for schema_name, schema in self.spec.get('components', {}).get('schemas', {}).items():
-            if not schema.get('type'):
-                self.issues.append({
-                    'location': f'components.schemas.{schema_name}',
-                    'message': 'Schema missing type definition',
-                    'severity': 'high'
-                })
+        if self.num_schemas != 0:
+            minus_points_per_bad_schema = max_points / self.num_schemas
+            for _ in range(self.num_bad_schemas):
                 score_one -= minus_points_per_bad_schema
+        self.schemas_score = score_one
+
+        if self.num_params != 0:
+            minus_points_per_bad_parameter = max_points / self.num_params
+            score_two -= minus_points_per_bad_parameter * self.num_bad_params
+
+        if self.num_contents != 0:
+            minus_point_per_bad_content = max_points / self.num_contents
+            score_three -= minus_point_per_bad_content * self.num_bad_contents
 
-        # Check parameters and request bodies
-        num_params = 0
-        num_bad_params = 0
-        num_contents = 0
-        num_bad_contents = 0
-
-        for path, path_item in self.spec.get('paths', {}).items():
-            for method, operation in path_item.items():
-                if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
-                    continue
-
-                for param in operation.get('parameters', []):
-                    num_params += 1
-                    if 'schema' not in param:
-                        self.issues.append({
-                            'location': f'paths.{path}.{method}.parameters.{param['name']}',
-                            'message': 'Parameter missing schema definition',
-                            'severity': 'medium'
-                        })
-                        num_bad_params += 1
-
-                if 'requestBody' in operation:
-                    for content_type, content in operation['requestBody'].get('content', {}).items():
-                        num_contents += 1
-                        if 'schema' not in content:
-                            num_bad_contents += 1
-                            self.issues.append({
-                                'location': f'paths.{path}.{method}.requestBody.content.{content_type}',
-                                'message': 'Request body missing schema definition',
-                                'severity': 'medium'
-                            })
-
-        if num_params != 0:
-            minus_points_per_bad_parameter = max_points / num_params
-            score_two -= minus_points_per_bad_parameter * num_bad_params
-
-        if num_contents != 0:
-            minus_point_per_bad_content = max_points / num_contents
-            score_three -= minus_point_per_bad_content * num_bad_contents
-
-        return (score_one + score_two + score_three) / 3
\ No newline at end of file
+        return (score_one + score_two + score_three) / 3
@@ -0,0 +1,117 @@
+import importlib
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+# Third-party scorers register under this entry point group, e.g. in pyproject.toml:
+#   [project.entry-points."open_api_scorer.scorers"]
+#   naming = "my_package.naming:NamingScorer"
+ENTRY_POINT_GROUP = 'open_api_scorer.scorers'
+
+# Category name -> 'module:Class'. Modules are imported only when a scorer is first needed.
+SCORERS: Dict[str, str] = {
+    'schema_types': 'app.schema_types_scorer:SchemaTypesScorer',
+    'descriptions': 'app.descriptions_scorer:DescriptionsScorer',
+    'paths_operations': 'app.paths_operations_scorer:PathsOperationsScorer',
+    'response_codes': 'app.response_codes_scorer:ResponseCodesScorer',
+    'examples': 'app.examples_scorer:ExamplesScorer',
+    'security': 'app.security_scorer:SecurityScorer',
+    'best_practices': 'app.best_practices_scorer:BestPracticesScorer'
+}
+
+_loaded: Dict[str, Type] = {}
+_plugins_discovered = False
+
+
+def _declares_plugins() -> bool:
+    # importlib.metadata costs ~100ms to import; only pay for it if some distribution declares our group
+    marker = f'[{ENTRY_POINT_GROUP}]'
+    for entry in sys.path:
+        try:
+            names = os.listdir(entry or '.')
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith(('.dist-info', '.egg-info')):
+                continue
+            try:
+                with open(os.path.join(entry or '.', name, 'entry_points.txt'), encoding='utf-8') as file:
+                    if marker in file.read():
+                        return True
+            except OSError:
+                continue
+    return False
+
+
+def discover_plugins() -> None:
+    """Add scorers published through entry points; built-in names cannot be overridden."""
+    global _plugins_discovered
+    if _plugins_discovered:
+        return
+    _plugins_discovered = True
+    if not _declares_plugins():
+        return
+
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        SCORERS.setdefault(entry_point.name, entry_point.value)
+
+
+def register_scorer(name: str, scorer: Union[str, Type]) -> None:
+    """Register a scorer class, or a 'module:Class' string to import when first used."""
+    if isinstance(scorer, str):
+        SCORERS[name] = scorer
+        _loaded.pop(name, None)
+    else:
+        SCORERS[name] = f'{scorer.__module__}:{scorer.__qualname__}'
+        _loaded[name] = scorer
+
+
+def scorer_names() -> List[str]:
+    discover_plugins()
+    return list(SCORERS)
+
+
+def parse_names(value: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated CLI value ('security,response_codes') into names."""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def select_scorers(only: Optional[Iterable[str]] = None, skip: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Names of the scorers to run, in registry order.
+    `only` keeps just the given categories; `skip` drops categories.
+    """
+    names = scorer_names()
+    only = list(only) if only is not None else None
+    skip = list(skip or ())
+    unknown = [name for name in (only or []) + skip if name not in SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown scorer: {', '.join(unknown)} (available: {', '.join(names)})")
+
+    selected = [name for name in names if (only is None or name in only) and name not in skip]
+    if not selected:
+        raise ValueError('No scorers selected')
+    return selected
+
+
+def load_scorer(name: str) -> Type:
+    """Import and return the scorer class registered under `name`."""
+    scorer_class = _loaded.get(name)
+    if scorer_class is None:
+        if name not in SCORERS:
+            raise KeyError(f'Unknown scorer: {name}')
+        module_name, _, class_name = SCORERS[name].partition(':')
+        scorer_class = _loaded[name] = getattr(importlib.import_module(module_name), class_name)
+    return scorer_class
+
+
+def find_scorer(class_name: str) -> Type:
+    """Look a registered scorer up by its class name."""
+    for name, target in SCORERS.items():
+        if target.rpartition(':')[2] == class_name:
+            return load_scorer(name)
+    raise KeyError(f'Unknown scorer class: {class_name}')
@@ -1,20 +1,154 @@
-from typing import Dict, Any, List
+import time
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
+from app.issues import Issue, IssueCode
+from app.spec_index import HTTP_METHODS, SpecIndex
+from app.spec_walker import SpecWalker
+
+if TYPE_CHECKING:
+    from app.instrumentation import Instrumentation
+
+
+def _frozen(counter: Any) -> Any:
+    # Partials may be cached and merged many times, so the lists in them are copied to tuples
+    return tuple(counter) if isinstance(counter, list) else counter
+
 
 class ScoringStrategy(ABC):
+    # Lower-cased HTTP methods whose operations are dispatched to this scorer
+    operation_methods = HTTP_METHODS
+    # Attributes accumulated while walking path items (ints are summed, lists extended, flags OR-ed).
+    # Together with the issues they form the partial state of a slice of the paths, where lists become tuples.
+    path_counters: Tuple[str, ...] = ()
+
     def __init__(self, spec: Dict[str, Any]):
         self.spec = spec
         self.max_score = 0
         self.issues = []
+        # Set by the walker before begin(); lets scorers query the prebuilt SpecIndex
+        self.index = None
+        # Called with (scorer, issue) as each issue is recorded, e.g. to stream it out
+        self.issue_sink: Optional[Callable[['ScoringStrategy', Issue], None]] = None
+        # Time budget state, managed by app.budgets.ScorerClock; a truncated scorer stopped before the end
+        self.truncated = False
+        self.time_left: Optional[float] = None
+        self.deadline: Optional[float] = None
 
-    @abstractmethod
-    def score(self) -> float:
+    def add_issue(self, code: IssueCode, location: Tuple, *args: Any) -> None:
+        issue = Issue(code, location, args)
+        self.issues.append(issue)
+        if self.issue_sink is not None:
+            self.issue_sink(self, issue)
+
+    def add_issues(self, issues: List[Issue], first: bool = False) -> None:
+        """Record issues built earlier (held back for ordering); `first` puts them before the others."""
+        if first:
+            self.issues[:0] = issues
+        else:
+            self.issues.extend(issues)
+        if self.issue_sink is not None:
+            for issue in issues:
+                self.issue_sink(self, issue)
+
+    def out_of_time(self) -> bool:
+        """For long loops inside one callback: whether the time budget is spent (the scorer is then truncated)."""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.truncated = True
+        return self.truncated
+
+    @classmethod
+    def handles(cls, callback: str) -> bool:
+        """Whether this scorer overrides the given visitor callback."""
+        return getattr(cls, callback) is not getattr(ScoringStrategy, callback)
+
+    def begin(self) -> None:
+        """Reset per-run state; called by the walker before traversal starts."""
+        self.issues = []
+
+    def visit_path(self, path: str, path_item: Dict[str, Any]) -> None:
+        pass
+
+    def visit_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        pass
+
+    def visit_parameter(self, path: str, method: str, param: Dict[str, Any]) -> None:
+        pass
+
+    def visit_request_body(self, path: str, method: str, request_body: Dict[str, Any]) -> None:
         pass
 
-    def get_result(self) -> Dict[str, Any]:
-        return {
-            'score': self.score(),
+    def visit_request_media_type(self, path: str, method: str, content_type: str, content: Dict[str, Any]) -> None:
+        pass
+
+    def visit_response(self, path: str, method: str, code: str, response: Dict[str, Any]) -> None:
+        pass
+
+    def visit_response_media_type(self, path: str, method: str, code: str, content_type: str,
+                                  content: Dict[str, Any]) -> None:
+        pass
+
+    def leave_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        pass
+
+    def take_partial(self) -> Tuple[List, Tuple]:
+        """Detach the issues and path counters gathered so far, leaving them empty."""
+        partial = (self.issues, tuple(_frozen(getattr(self, name)) for name in self.path_counters))
+        self.issues = []
+        for name in self.path_counters:
+            setattr(self, name, type(getattr(self, name))())
+        return partial
+
+    def merge_partial(self, partial: Tuple[List, Tuple]) -> None:
+        issues, counters = partial
+        self.issues.extend(issues)
+        for name, value in zip(self.path_counters, counters):
+            current = getattr(self, name)
+            if isinstance(current, list):
+                current.extend(value)
+            else:
+                setattr(self, name, (current or value) if isinstance(current, bool) else current + value)
+
+    def merge_partials(self, partials: List[Tuple[List, Tuple]]) -> None:
+        """Merge many partials in order; cheaper than merging them one by one."""
+        for issues, _ in partials:
+            self.issues.extend(issues)
+        columns = zip(*(counters for _, counters in partials))
+        for name, column in zip(self.path_counters, columns):
+            current = getattr(self, name)
+            if isinstance(current, list):
+                current.extend(chain.from_iterable(column))
+            else:
+                setattr(self, name, (current or any(column)) if isinstance(current, bool) else current + sum(column))
+
+    @abstractmethod
+    def finish(self) -> float:
+        """Compute the score from the state collected during the walk."""
+
+    def score(self, index: Optional[SpecIndex] = None,
+              wrap_callback: Optional[Callable[[Callable], Callable]] = None) -> float:
+        SpecWalker(self.spec, index, wrap_callback).walk([self])
+        return self.finish()
+
+    def result(self, score: float) -> Dict[str, Any]:
+        result = {
+            'score': score,
             'max': self.max_score,
-            'issues': self.issues
-        }
\ No newline at end of file
+            'issues': [issue.to_dict() for issue in self.issues]
+        }
+        if self.truncated:
+            result['truncated'] = True
+        return result
+
+    def get_result(self, instrumentation: Optional['Instrumentation'] = None,
+                   index: Optional[SpecIndex] = None) -> Dict[str, Any]:
+        """Score and serialize; with an Instrumentation, add a `_metrics` block for this run."""
+        if instrumentation is None:
+            return self.result(self.score(index))
+
+        with instrumentation.span(type(self).__name__) as span:
+            result = self.result(self.score(index, instrumentation.counting(span)))
+            span.issues = len(self.issues)
+        result['_metrics'] = span.to_dict()
+        return result
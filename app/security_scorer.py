@@ -1,15 +1,27 @@
+from app.issues import IssueCode
 from app.scoring_strategy import ScoringStrategy
+from app.spec_index import CRUD_METHODS
 from typing import Dict, Any
 
 
 class SecurityScorer(ScoringStrategy):
+    operation_methods = CRUD_METHODS
+    path_counters = ('operation_security',)
 
     def __init__(self, spec: Dict[str, Any]):
         super().__init__(spec)
         self.max_score = 10
+        self.operation_security = False
 
-    def score(self) -> float:
-        max_points = self.max_score
+    def begin(self) -> None:
+        super().begin()
+        self.operation_security = False
+
+    def visit_operation(self, path: str, method: str, operation: Dict[str, Any]) -> None:
+        if operation.get('security') is not None:
+            self.operation_security = True
+
+    def finish(self) -> float:
         score = 0
 
         security_schemes = self.spec.get('components', {}).get('securitySchemes', {})
@@ -17,28 +29,13 @@ class SecurityScorer(ScoringStrategy):
             score += 3
 
             global_security = self.spec.get('security', [])
-            security_used = bool(global_security)
-
-            for path, path_item in self.spec.get('paths', {}).items():
-                for method, operation in path_item.items():
-                    if method.lower() not in ['get', 'post', 'put', 'patch', 'delete']:
-                        continue
-                    if operation.get('security') is not None:
-                        security_used = True
+            security_used = bool(global_security) or self.operation_security
 
             if security_used:
                 score += 7
             else:
-                self.issues.append({
-                    'location': 'security',
-                    'message': 'Security schemes defined but not used',
-                    'severity': 'high'
-                })
+                self.add_issue(IssueCode.SECURITY_NOT_USED, ('security',))
         else:
-            self.issues.append({
-                'location': 'components.securitySchemes',
-                'message': 'No security schemes defined',
-                'severity': 'high'
-            })
+            self.add_issue(IssueCode.NO_SECURITY_SCHEMES, ('components', 'securitySchemes'))
 
-        return score
\ No newline at end of file
+        return score
@@ -0,0 +1,351 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app.batch import score_source
+from app.documents import DocumentStore
+from app.spec_cache import SpecCache
+from app.validator import parse_spec_content
+from app.watch import FileWatcher
+
+DEFAULT_PORT = 8080
+MAX_HEADER_LINES = 100
+REQUEST_SOURCE = '<request>'
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity',
+    500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout'
+}
+
+
+def _file_state(uris: Iterable[str]) -> Dict[str, Optional[Tuple[int, int, int]]]:
+    return {uri: FileWatcher._stat_one(Path(uri)) for uri in uris}
+
+
+def score_content(source: str, content: bytes, spec_root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Worker entry point: parse, validate and score raw spec bytes. External
+    $refs are only followed for files read from `spec_root`, and only to
+    other files under it; request bodies are scored as they are. The entry
+    then lists the files the refs led to under 'files', with their state.
+    """
+    try:
+        loaded = parse_spec_content(content.decode('utf-8-sig')), None
+    except Exception as e:
+        loaded = None, f"Failed to load : {e}"
+    # A fresh store per spec: the referenced files may change between requests
+    documents = DocumentStore(root=spec_root) if spec_root is not None and source != REQUEST_SOURCE else None
+    entry = score_source(source, loaded, documents=documents)
+    if documents is not None:
+        entry['files'] = _file_state(sorted({*documents.documents, *documents.errors}))
+    return entry
+
+
+def _warm_worker() -> None:
+    # Runs once per worker process so the first real request does not pay for imports
+    import app.open_api_scorer  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ScoringService:
+    """Score specs over HTTP from a warm process pool.
+
+    POST /score takes the spec (JSON or YAML) as the request body, or
+    `?path=` naming a file under `spec_root`. The response is the output of
+    OpenAPIScorer.score_all(); load and validation failures come back as 422.
+    Results are kept in an LRU cache keyed by the content hash (for files,
+    checked against the state of the files their $refs led to), and identical
+    payloads already being scored share one job. At most `max_pending` jobs
+    are queued; beyond that requests get 503 rather than piling up.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = 256, max_pending: Optional[int] = None,
+                 timeout: float = 60.0, max_body_bytes: int = 64 * 1024 * 1024,
+                 spec_root: Optional[str] = None, executor: Optional[Executor] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.spec_root = Path(spec_root).resolve() if spec_root else None
+        self.score_function: Callable[[str, bytes], Dict[str, Any]] = partial(
+            score_content, spec_root=str(self.spec_root) if self.spec_root else None)
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server: Optional[asyncio.AbstractServer] = None
+        # key -> (status, payload, state of the referenced files)
+        self._cache: 'OrderedDict[str, Tuple[int, Dict[str, Any], Dict[str, Any]]]' = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._pending = 0
+        self._started = time.monotonic()
+        self.stats = {
+            'requests': 0, 'scored': 0, 'cache_hits': 0, 'shared': 0,
+            'rejected': 0, 'timeouts': 0, 'errors': 0, 'scoring_seconds': 0.0
+        }
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> Tuple[str, int]:
+        if self._executor is None:
+            # The event loop process may run threads (asyncio.to_thread), which fork() does not mix with
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else None)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=_warm_worker)
+        # Submitting one task per worker up front starts every process before the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._respond(writer, e.status, {'error': str(e)}, e.headers, keep_alive=False)
+                    return
+                if request is None:
+                    return
+
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, payload, extra = await self.handle(method, target, body)
+                await self._respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise HttpError(400, 'Malformed request line')
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HttpError(400, 'Too many headers')
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            raise HttpError(411, 'Chunked request bodies are not supported; send Content-Length')
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, 'Invalid Content-Length')
+        if length > self.max_body_bytes:
+            raise HttpError(413, f'Request body exceeds {self.max_body_bytes} bytes')
+        body = await reader.readexactly(length) if length else b''
+        return parts[0].upper(), parts[1], headers, body
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                       headers: Dict[str, str], keep_alive: bool) -> None:
+        body = json.dumps(payload).encode()
+        lines = [
+            f'HTTP/1.1 {status} {REASONS.get(status, "Unknown")}',
+            'Content-Type: application/json',
+            f'Content-Length: {len(body)}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+        ]
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Route one request. Returns: (status, JSON payload, extra headers)"""
+        self.stats['requests'] += 1
+        url = urlsplit(target)
+        try:
+            if url.path == '/health':
+                self._require(method, 'GET')
+                return 200, {'status': 'ok', 'workers': self.workers}, {}
+            if url.path == '/metrics':
+                self._require(method, 'GET')
+                return 200, self.metrics(), {}
+            if url.path == '/score':
+                self._require(method, 'POST')
+                return await self._score(parse_qs(url.query), body)
+            raise HttpError(404, f'No route for {url.path}')
+        except HttpError as e:
+            return e.status, {'error': str(e)}, e.headers
+
+    @staticmethod
+    def _require(method: str, allowed: str) -> None:
+        if method != allowed:
+            raise HttpError(405, f'Use {allowed}', {'Allow': allowed})
+
+    async def _score(self, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        source = REQUEST_SOURCE
+        if 'path' in query:
+            source, body = await self._read_reference(query['path'][0])
+        if not body:
+            raise HttpError(400, 'Send the spec as the request body or reference it with ?path=')
+
+        # Files are scored with the files they refer to, so the same content at another path is another job
+        key = SpecCache.key(body if source == REQUEST_SOURCE else os.fsencode(source) + b'\0' + body)
+        cached = self._cache.get(key)
+        # A few stat() calls; cheap enough for the event loop, and nothing else can touch the entry meanwhile
+        if cached is not None and cached[2] and _file_state(cached[2]) != cached[2]:
+            # A file the spec refers to changed since it was scored
+            del self._cache[key]
+            cached = None
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return cached[0], cached[1], {}
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['shared'] += 1
+        else:
+            if self._pending >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise HttpError(503, 'Too many specs being scored; retry later', {'Retry-After': '1'})
+            future = self._submit(key, source, body)
+
+        try:
+            # shield(): a timed-out request must not cancel a job other requests may share
+            status, payload = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise HttpError(504, f'Scoring did not finish within {self.timeout}s')
+        return status, payload, {}
+
+    def _submit(self, key: str, source: str, body: bytes) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        # Jobs keep their slot until the worker is done, even if the request timed out
+        self._pending += 1
+        job = loop.run_in_executor(self._executor, self.score_function, source, body)
+        result = loop.create_future()
+        self._in_flight[key] = result
+
+        def done(job: asyncio.Future) -> None:
+            self._pending -= 1
+            self._in_flight.pop(key, None)
+            self.stats['scoring_seconds'] += time.perf_counter() - started
+            if job.cancelled() or job.exception() is not None:
+                self.stats['errors'] += 1
+                error = 'cancelled' if job.cancelled() else job.exception()
+                result.set_result((500, {'error': f'Failed to score : {error}'}))
+                return
+
+            entry = job.result()
+            if 'results' in entry:
+                status, payload = 200, entry['results']
+            else:
+                status, payload = 422, {name: value for name, value in entry.items()
+                                        if name not in ('source', 'files')}
+            self.stats['scored'] += 1
+            self._cache[key] = (status, payload, entry.get('files', {}))
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            result.set_result((status, payload))
+
+        job.add_done_callback(done)
+        return result
+
+    async def _read_reference(self, reference: str) -> Tuple[str, bytes]:
+        if self.spec_root is None:
+            raise HttpError(403, 'File references are disabled; start the service with --spec-root')
+        path = (self.spec_root / reference).resolve()
+        if not path.is_relative_to(self.spec_root):
+            raise HttpError(403, f'{reference} is outside the spec root')
+        try:
+            content = await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            raise HttpError(404, f'Cannot read {reference}: {e.strerror}')
+        if len(content) > self.max_body_bytes:
+            raise HttpError(413, f'{reference} exceeds {self.max_body_bytes} bytes')
+        return str(path), content
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['scoring_seconds'] = round(stats['scoring_seconds'], 3)
+        stats.update({
+            'pending': self._pending,
+            'max_pending': self.max_pending,
+            'cache_entries': len(self._cache),
+            'cache_size': self.cache_size,
+            'uptime_seconds': round(time.monotonic() - self._started, 1)
+        })
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.service',
+                                     description='Serve OpenAPI scoring over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache-size', type=int, default=256, help='results kept in the LRU cache')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='specs queued or being scored before answering 503 (default: 4 per worker)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='seconds before a request gets 504')
+    parser.add_argument('--max-body-bytes', type=int, default=64 * 1024 * 1024)
+    parser.add_argument('--spec-root', help='allow POST /score?path=... for files under this directory')
+    args = parser.parse_args(argv)
+
+    service = ScoringService(workers=args.workers, cache_size=args.cache_size, max_pending=args.max_pending,
+                             timeout=args.timeout, max_body_bytes=args.max_body_bytes, spec_root=args.spec_root)
+
+    async def run():
+        host, port = await service.start(args.host, args.port)
+        print(f'Scoring service listening on http://{host}:{port}', file=sys.stderr)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
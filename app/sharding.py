@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.ref_resolver import RefResolver
+from app.scorer_registry import select_scorers
+from app.spec_index import SpecIndex
+from app.spec_walker import SpecWalker
+
+# Below this many path items per worker, pool start-up costs more than it saves
+MIN_PATHS_PER_WORKER = 200
+
+# Set in each worker process by _init_worker
+_worker_state: Optional[Tuple[List[Tuple[str, Any]], List[Any], SpecWalker]] = None
+
+
+def _path_items(spec: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    paths = spec.get('paths', {})
+    return list(paths.items()) if isinstance(paths, dict) else []
+
+
+def _build(spec: Dict[str, Any], names: List[str]):
+    from app.open_api_scorer import OpenAPIScorer
+
+    # The index stays empty: path items are walked one at a time and only the resolver is shared
+    scorer = OpenAPIScorer(spec, index=SpecIndex(resolver=RefResolver(spec)), only=names)
+    return scorer, list(scorer.scorers.values()), SpecWalker(spec, scorer.index)
+
+
+def _init_worker(spec: Dict[str, Any], names: List[str]) -> None:
+    global _worker_state
+    _, scorers, walker = _build(spec, names)
+    _worker_state = (_path_items(spec), scorers, walker)
+
+
+def _score_shard(start: int, stop: int) -> List[Tuple[List, Tuple]]:
+    """Walk path items [start, stop) and return every scorer's partial state, in scorer order."""
+    items, scorers, walker = _worker_state
+    walker.start(scorers)
+    for scorer in scorers:
+        # Anything begin() reported is reported once, by the parent
+        scorer.take_partial()
+    for path, path_item in items[start:stop]:
+        walker.walk_path(path, path_item)
+    return [scorer.take_partial() for scorer in scorers]
+
+
+def score_sharded(spec: Dict[str, Any], workers: Optional[int] = None, shard_size: Optional[int] = None,
+                  only: Optional[List[str]] = None, skip: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Score `spec` like OpenAPIScorer(spec, only=only, skip=skip).score_all(),
+    splitting its paths into contiguous shards scored in a process pool.
+    Shard partials are merged back in path order, so the result is identical.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Spec must be a dictionary")
+
+    names = select_scorers(only, skip)
+    scorer, scorers, walker = _build(spec, names)
+    walker.start(scorers)
+    head = [s.take_partial() for s in scorers]
+
+    count = len(_path_items(spec))
+    workers = min(workers or os.cpu_count() or 1, max(1, count // MIN_PATHS_PER_WORKER))
+    if shard_size is None:
+        # A few shards per worker evens out path items of very different sizes
+        shard_size = max(1, -(-count // (workers * 4)))
+    shards = [(start, min(start + shard_size, count)) for start in range(0, count, shard_size)]
+
+    if workers <= 1 or len(shards) <= 1:
+        for path, path_item in _path_items(spec):
+            walker.walk_path(path, path_item)
+        shard_partials = [[s.take_partial() for s in scorers]]
+    else:
+        # fork lets workers share the parsed spec instead of each unpickling a copy,
+        # but is only safe while this process has no other threads
+        if sys.platform.startswith('linux') and threading.active_count() == 1:
+            method = 'fork'
+        else:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(method)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(spec, names)) as executor:
+            shard_partials = list(executor.map(_score_shard, *zip(*shards)))
+
+    for i, s in enumerate(scorers):
+        s.merge_partial(head[i])
+        s.merge_partials([partials[i] for partials in shard_partials])
+    return scorer.collect_results()
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Bump when parsing changes so stale entries are never returned
+CACHE_FORMAT = b'spec-cache-v1\0'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction frees this much headroom below max_bytes, so the directory is not rescanned on every later put()
+EVICT_TO = 0.9
+CACHE_DIR_ENV = 'OPENAPI_SCORER_CACHE_DIR'
+
+
+class SpecCache:
+    """On-disk cache of parsed specs keyed by a hash of the raw file content.
+
+    Entries are pickles of the parsed document. Reading an entry refreshes its
+    mtime; once the directory grows past `max_bytes` the least recently used
+    entries are evicted. The directory is scanned for its size once, and then
+    only when the running total of what this instance wrote crosses the limit
+    (entries written by other processes are counted at that rescan).
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Size of the directory as of the last scan, plus what was written since; None until the first put()
+        self._size: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> Optional['SpecCache']:
+        directory = os.environ.get(CACHE_DIR_ENV)
+        return cls(directory) if directory else None
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        return hashlib.sha256(CACHE_FORMAT + content).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f'{key}.pickle'
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entry(key)
+        try:
+            with entry.open('rb') as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or foreign entry; drop it and re-parse
+            entry.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        if self._size is None:
+            self._size = self.evict()
+        entry = self._entry(key)
+        try:
+            replaced = entry.stat().st_size
+        except OSError:
+            replaced = 0
+
+        # Write-then-rename so concurrent readers never see a partial entry
+        import tempfile
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp, entry)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self._size = self.evict()
+
+    def evict(self) -> int:
+        """Past `max_bytes`, evict the least recently used entries down to EVICT_TO of it. Returns: the size left"""
+        entries = []
+        total = 0
+        for entry in self.directory.glob('*.pickle'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return total
+
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            entry.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes * EVICT_TO:
+                break
+        return total
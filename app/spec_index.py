@@ -0,0 +1,159 @@
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.ref_resolver import RefResolver
+
+HTTP_METHODS = frozenset({'get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace'})
+CRUD_METHODS = frozenset({'get', 'post', 'put', 'patch', 'delete'})
+
+
+class ParameterEntry(NamedTuple):
+    path: str
+    method: str
+    param: Dict[str, Any]
+
+
+class RequestBodyEntry(NamedTuple):
+    path: str
+    method: str
+    request_body: Dict[str, Any]
+
+
+class MediaTypeEntry(NamedTuple):
+    path: str
+    method: str
+    code: Optional[str]  # None for request body content
+    content_type: str
+    content: Dict[str, Any]
+
+
+class ResponseEntry(NamedTuple):
+    path: str
+    method: str
+    code: str
+    response: Dict[str, Any]
+    media_types: Tuple[MediaTypeEntry, ...]
+
+
+class OperationEntry(NamedTuple):
+    path: str
+    method: str  # key as written in the spec
+    verb: str  # lower-cased method
+    operation: Dict[str, Any]
+    parameters: Tuple[ParameterEntry, ...]
+    request_body: Optional[RequestBodyEntry]
+    request_media_types: Tuple[MediaTypeEntry, ...]
+    responses: Tuple[ResponseEntry, ...]
+
+
+class PathEntry(NamedTuple):
+    path: str
+    path_item: Dict[str, Any]
+    operations: Tuple[OperationEntry, ...]
+
+
+class SpecIndex:
+    """Flat, pre-filtered view of every operation, parameter, response and media type in a spec.
+
+    Only keys naming an HTTP method are indexed as operations. Path items,
+    parameters, request bodies and responses given as $refs are indexed as
+    their resolved targets. Malformed nodes (non-dict operations, non-list
+    parameters, ...) are skipped.
+    """
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None, resolver: Optional[RefResolver] = None):
+        self.resolver = resolver if resolver is not None else RefResolver(spec or {})
+        self.paths: List[PathEntry] = []
+        self.operations: List[OperationEntry] = []
+        self.parameters: List[ParameterEntry] = []
+        self.request_bodies: List[RequestBodyEntry] = []
+        self.responses: List[ResponseEntry] = []
+        self.media_types: List[MediaTypeEntry] = []
+        self.responses_by_code: Dict[str, List[ResponseEntry]] = {}
+        self.media_types_by_type: Dict[str, List[MediaTypeEntry]] = {}
+
+        if spec is not None:
+            paths = spec.get('paths', {})
+            if isinstance(paths, dict):
+                for path, path_item in paths.items():
+                    self.add_path(path, path_item)
+
+    def add_path(self, path: str, path_item: Dict[str, Any]) -> Optional[PathEntry]:
+        path_item = self.resolver.resolve(path_item)
+        if not isinstance(path_item, dict):
+            return None
+
+        operations = []
+        for method, operation in path_item.items():
+            verb = method.lower() if isinstance(method, str) else None
+            if verb not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            operations.append(self._add_operation(path, method, verb, operation))
+
+        entry = PathEntry(path, path_item, tuple(operations))
+        self.paths.append(entry)
+        return entry
+
+    def _add_operation(self, path: str, method: str, verb: str, operation: Dict[str, Any]) -> OperationEntry:
+        parameters = []
+        raw_parameters = operation.get('parameters', [])
+        if isinstance(raw_parameters, list):
+            for param in raw_parameters:
+                param = self.resolver.resolve(param)
+                if isinstance(param, dict):
+                    parameters.append(ParameterEntry(path, method, param))
+        self.parameters.extend(parameters)
+
+        request_body = None
+        request_media_types = ()
+        raw_request_body = self.resolver.resolve(operation.get('requestBody'))
+        if isinstance(raw_request_body, dict):
+            request_body = RequestBodyEntry(path, method, raw_request_body)
+            self.request_bodies.append(request_body)
+            request_media_types = self._media_types(path, method, None, request_body.request_body)
+
+        responses = []
+        raw_responses = operation.get('responses', {})
+        if isinstance(raw_responses, dict):
+            for code, response in raw_responses.items():
+                response = self.resolver.resolve(response)
+                if not isinstance(response, dict):
+                    continue
+                code = str(code)
+                entry = ResponseEntry(path, method, code, response, self._media_types(path, method, code, response))
+                responses.append(entry)
+                self.responses_by_code.setdefault(code, []).append(entry)
+        self.responses.extend(responses)
+
+        entry = OperationEntry(path, method, verb, operation, tuple(parameters), request_body,
+                               request_media_types, tuple(responses))
+        self.operations.append(entry)
+        return entry
+
+    def _media_types(self, path: str, method: str, code: Optional[str],
+                     owner: Dict[str, Any]) -> Tuple[MediaTypeEntry, ...]:
+        content = owner.get('content', {})
+        if not isinstance(content, dict):
+            return ()
+
+        entries = []
+        for content_type, media in content.items():
+            if isinstance(media, dict):
+                entry = MediaTypeEntry(path, method, code, content_type, media)
+                entries.append(entry)
+                self.media_types_by_type.setdefault(content_type, []).append(entry)
+        self.media_types.extend(entries)
+        return tuple(entries)
+
+    def operations_for(self, methods: Iterable[str]) -> List[OperationEntry]:
+        methods = frozenset(methods)
+        return [entry for entry in self.operations if entry.verb in methods]
+
+    def operations_lacking_response(self, code: str) -> List[OperationEntry]:
+        return [entry for entry in self.operations
+                if not any(response.code == code for response in entry.responses)]
+
+    def parameters_without(self, key: str) -> List[ParameterEntry]:
+        return [entry for entry in self.parameters if key not in entry.param]
+
+    def media_types_without(self, key: str) -> List[MediaTypeEntry]:
+        return [entry for entry in self.media_types if key not in entry.content]
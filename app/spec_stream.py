@@ -0,0 +1,215 @@
+import json
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+CHUNK_SIZE = 1 << 16
+
+
+class _JsonObjectStream:
+    """Incrementally decode the members of a top-level JSON object from a text file.
+
+    Values are decoded one at a time with `json.JSONDecoder.raw_decode` over a
+    sliding buffer, so memory is bounded by the largest single value decoded.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self.eof:
+            return False
+        # Drop the consumed prefix before growing the buffer
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.file.read(size or CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON document')
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{self.buffer[self.pos]}'")
+        self.pos += 1
+
+    def _value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably truncated by the buffer; read at least as much again so retries stay linear
+                if not self._fill(max(CHUNK_SIZE, len(self.buffer))):
+                    raise
+                continue
+            # A number may have been cut off at the buffer boundary
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Yield keys of the current object; the caller must consume each value."""
+        self._expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self._expect('}')
+            return
+
+    def value(self) -> Any:
+        return self._value()
+
+
+def _iter_json(file, stream_paths: bool) -> Iterator[Tuple[Optional[str], str, Any]]:
+    stream = _JsonObjectStream(file)
+    for key in stream.members():
+        if key == 'paths' and stream.peek() == '{':
+            # The section itself, so that an empty `paths: {}` is seen too; its members follow
+            yield None, 'paths', {}
+            for path in stream.members():
+                path_item = stream.value()
+                yield 'paths', path, path_item if stream_paths else None
+        else:
+            yield None, key, stream.value()
+
+
+def _iter_yaml(file, stream_paths: bool) -> Iterator[Tuple[Optional[str], str, Any]]:
+    import yaml
+
+    # The C loader does not expose node composition, so streaming uses the pure-Python one
+    loader = yaml.SafeLoader(file)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            raise ValueError('Empty YAML document')
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise ValueError('Spec must be a mapping')
+        loader.get_event()
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.construct_object(loader.compose_node(None, None), deep=True)
+            if key == 'paths' and loader.check_event(yaml.MappingStartEvent) \
+                    and loader.peek_event().anchor is None:
+                loader.get_event()
+                yield None, 'paths', {}
+                while not loader.check_event(yaml.MappingEndEvent):
+                    path = loader.construct_object(loader.compose_node(None, None), deep=True)
+                    node = loader.compose_node(None, None)
+                    path_item = loader.construct_object(node, deep=True) if stream_paths else None
+                    # Forget constructed nodes so finished path items can be collected
+                    loader.constructed_objects = {}
+                    yield 'paths', path, path_item
+                loader.get_event()
+            else:
+                yield None, key, loader.construct_object(loader.compose_node(None, None), deep=True)
+    finally:
+        loader.dispose()
+
+
+class StreamingSpec:
+    """Bounded-memory, two-pass reader for a JSON or YAML spec file.
+
+    The first pass keeps every top-level section except `paths`; the second
+    pass yields path items one at a time. Peak memory is bounded by the
+    largest single path item plus the small top-level sections.
+    """
+
+    def __init__(self, source: Union[str, Path]):
+        self.path = Path(source)
+        self.is_json = self._detect_json()
+        self.has_paths = False
+        self.num_paths = 0
+
+    def _detect_json(self) -> bool:
+        if self.path.suffix.lower() == '.json':
+            return True
+        with self.path.open(encoding='utf-8') as file:
+            head = file.read(4096).lstrip()
+        return head.startswith('{')
+
+    def _iter(self, stream_paths: bool) -> Iterator[Tuple[Optional[str], str, Any]]:
+        with self.path.open(encoding='utf-8') as file:
+            reader = _iter_json if self.is_json else _iter_yaml
+            yield from reader(file, stream_paths)
+
+    def load_skeleton(self) -> Dict[str, Any]:
+        """Read every top-level section except `paths` (first pass)."""
+        skeleton = {}
+        self.num_paths = 0
+        for section, key, value in self._iter(stream_paths=False):
+            if section == 'paths':
+                self.has_paths = True
+                self.num_paths += 1
+            elif key == 'paths' and isinstance(value, dict):
+                # A streamed `paths` section starts empty; an anchored YAML one cannot be streamed and is read whole
+                self.has_paths = True
+                self.num_paths += len(value)
+            else:
+                skeleton[key] = value
+        return skeleton
+
+    def iter_paths(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (path, path_item) pairs in document order (second pass)."""
+        for section, key, value in self._iter(stream_paths=True):
+            if section == 'paths':
+                yield key, value
+            elif key == 'paths' and isinstance(value, dict):
+                yield from value.items()
+
+
+def score_streaming(source: Union[str, Path], only: Optional[List[str]] = None,
+                    skip: Optional[List[str]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Validate and score a spec file without holding its `paths` in memory.
+    `only` / `skip` select categories as in OpenAPIScorer.
+    Returns: (results, error) — error is None if successful
+    """
+    from app.open_api_scorer import OpenAPIScorer
+    from app.validator import OpenAPIValidator
+
+    path = Path(source)
+    if not path.exists():
+        return None, f"File not found: {path}"
+
+    stream = StreamingSpec(path)
+    try:
+        skeleton = stream.load_skeleton()
+    except Exception as e:
+        return None, f"Failed to load : {e}"
+
+    if stream.has_paths:
+        errors = OpenAPIValidator.validate_spec_dict({**skeleton, 'paths': {}})
+    else:
+        errors = OpenAPIValidator.validate_spec_dict(skeleton)
+    if errors:
+        return None, '; '.join(errors)
+
+    try:
+        return OpenAPIScorer(skeleton, only=only, skip=skip).score_all(path_items=stream.iter_paths()), None
+    except Exception as e:
+        return None, f"Failed to score : {e}"
@@ -0,0 +1,126 @@
+from typing import Dict, Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.spec_index import HTTP_METHODS, OperationEntry, PathEntry, SpecIndex
+
+
+class DispatchTable(NamedTuple):
+    operation: List
+    parameter: List
+    request_body: List
+    request_media_type: List
+    response: List
+    response_media_type: List
+    leave_operation: List
+
+
+class SpecWalker:
+    """Walk the paths of a spec once, dispatching every node to each interested scorer."""
+
+    def __init__(self, spec: Dict[str, Any], index: Optional[SpecIndex] = None,
+                 wrap_callback: Optional[Callable[[Callable], Callable]] = None,
+                 guard: Optional[Callable[[Callable], Callable]] = None):
+        self.spec = spec
+        self.index = index if index is not None else SpecIndex(spec)
+        # Applied to every callback when the dispatch tables are built (e.g. to count nodes)
+        self.wrap_callback = wrap_callback
+        # Applied to every scorer method the walker calls, begin() included (e.g. to enforce time budgets)
+        self.guard = guard
+        self._path_callbacks: List = []
+        self._tables: Dict[str, DispatchTable] = {}
+
+    def start(self, scorers: Iterable[Any]) -> None:
+        """Begin a run: reset the scorers and precompute per-method dispatch tables."""
+        scorers = list(scorers)
+        for scorer in scorers:
+            scorer.index = self.index
+            if self.guard is not None:
+                self.guard(scorer.begin)()
+            else:
+                scorer.begin()
+
+        self._path_callbacks = self._callbacks(scorers, 'visit_path')
+        self._tables = {}
+        for method in HTTP_METHODS:
+            table = self._dispatch_table(scorers, method)
+            if table is not None:
+                self._tables[method] = table
+
+    def walk(self, scorers: Iterable[Any], path_items: Optional[Iterable[Tuple[str, Any]]] = None) -> None:
+        """
+        Dispatch every indexed path item to the scorers. When `path_items` is
+        given, those are walked instead as they arrive and are not retained.
+        """
+        self.start(scorers)
+        if not self._path_callbacks and not self._tables:
+            return
+
+        if path_items is None:
+            for entry in self.index.paths:
+                self._walk_path(entry)
+        else:
+            for path, path_item in path_items:
+                self.walk_path(path, path_item)
+
+    def walk_path(self, path: str, path_item: Any) -> None:
+        """Dispatch a single path item that is not part of the index (after start())."""
+        # A throwaway index per path item keeps memory bounded by the largest item
+        entry = SpecIndex(resolver=self.index.resolver).add_path(path, path_item)
+        if entry is not None:
+            self._walk_path(entry)
+
+    def _callbacks(self, scorers: List[Any], name: str) -> List:
+        callbacks = [getattr(scorer, name) for scorer in scorers if scorer.handles(name)]
+        if self.guard is not None:
+            callbacks = [self.guard(callback) for callback in callbacks]
+        if self.wrap_callback is not None:
+            callbacks = [self.wrap_callback(callback) for callback in callbacks]
+        return callbacks
+
+    def _dispatch_table(self, scorers: List[Any], method: str) -> Optional[DispatchTable]:
+        interested = [scorer for scorer in scorers if method in scorer.operation_methods]
+        table = DispatchTable(*(self._callbacks(interested, name) for name in (
+            'visit_operation',
+            'visit_parameter',
+            'visit_request_body',
+            'visit_request_media_type',
+            'visit_response',
+            'visit_response_media_type',
+            'leave_operation',
+        )))
+        return table if any(table) else None
+
+    def _walk_path(self, entry: PathEntry) -> None:
+        for callback in self._path_callbacks:
+            callback(entry.path, entry.path_item)
+        for operation in entry.operations:
+            table = self._tables.get(operation.verb)
+            if table is not None:
+                self._walk_operation(operation, table)
+
+    @staticmethod
+    def _walk_operation(entry: OperationEntry, table: DispatchTable) -> None:
+        path, method = entry.path, entry.method
+
+        for callback in table.operation:
+            callback(path, method, entry.operation)
+
+        for param in entry.parameters:
+            for callback in table.parameter:
+                callback(path, method, param.param)
+
+        if entry.request_body is not None:
+            for callback in table.request_body:
+                callback(path, method, entry.request_body.request_body)
+            for media in entry.request_media_types:
+                for callback in table.request_media_type:
+                    callback(path, method, media.content_type, media.content)
+
+        for response in entry.responses:
+            for callback in table.response:
+                callback(path, method, response.code, response.response)
+            for media in response.media_types:
+                for callback in table.response_media_type:
+                    callback(path, method, response.code, media.content_type, media.content)
+
+        for callback in table.leave_operation:
+            callback(path, method, entry.operation)
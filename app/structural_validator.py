@@ -0,0 +1,317 @@
+import gc
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from app.issues import Index, render_location
+from app.openapi_model import Either, Enum, ListOf, MapOf, Named, Obj, Primitive, RefOr, RefString, build_model
+from app.ref_resolver import RefResolver
+
+# A location is built as linked (parent, key) pairs, starting from None at the
+# root, and only turned into a path when an error is reported there
+Location = Optional[Tuple[Any, Any]]
+Check = Callable[[Any, Location, '_Output'], None]
+
+
+class _Output:
+    __slots__ = ('errors', 'refs')
+
+    def __init__(self):
+        self.errors: List[Tuple[Location, str]] = []
+        self.refs: List[Tuple[str, Location]] = []
+
+
+def location_path(location: Location) -> Tuple:
+    keys = []
+    while location is not None:
+        location, key = location
+        keys.append(key)
+    return tuple(reversed(keys))
+
+
+def json_types(desc: Any, model: Dict[str, Any]) -> Optional[Tuple[type, ...]]:
+    """The Python types a description can match, used to pick an Either alternative; None matches anything."""
+    if isinstance(desc, Named):
+        return json_types(model[desc.name], model)
+    if isinstance(desc, Primitive):
+        return desc.types or None
+    if isinstance(desc, (Enum, RefString)):
+        return (str,)
+    if isinstance(desc, ListOf):
+        return (list,)
+    if isinstance(desc, Either):
+        types = [json_types(option, model) for option in desc.options]
+        return None if None in types else tuple(t for option in types for t in option)
+    return (dict,)
+
+
+def describe(desc: Any, model: Dict[str, Any]) -> str:
+    """How an expected value is named in error messages."""
+    if isinstance(desc, Named):
+        return describe(model[desc.name], model)
+    if isinstance(desc, Primitive):
+        return desc.label
+    if isinstance(desc, Enum):
+        return f"one of: {', '.join(desc.values)}"
+    if isinstance(desc, RefString):
+        return 'a string'
+    if isinstance(desc, ListOf):
+        return 'an array'
+    if isinstance(desc, Either):
+        return ' or '.join(describe(option, model) for option in desc.options)
+    return 'an object'
+
+
+class _Compiler:
+    """Turn the object model into one specialized check function per description.
+
+    Every check takes (value, location, output). Type tests, field lookups and
+    messages are resolved while compiling, so checking a spec only runs dict
+    lookups and exact type comparisons.
+    """
+
+    def __init__(self, model: Dict[str, Any]):
+        self.model = model
+        self.named: Dict[str, Check] = {}
+
+    def compile(self, desc: Any) -> Optional[Check]:
+        """The check for `desc`, or None when any value is accepted."""
+        if isinstance(desc, Named):
+            return self._named(desc.name)
+        if isinstance(desc, Primitive):
+            return self._primitive(desc)
+        if isinstance(desc, RefString):
+            return self._ref_string()
+        if isinstance(desc, Enum):
+            return self._enum(desc)
+        if isinstance(desc, Obj):
+            return self._obj(desc)
+        if isinstance(desc, MapOf):
+            return self._map(desc)
+        if isinstance(desc, ListOf):
+            return self._list(desc)
+        if isinstance(desc, RefOr):
+            return self._ref_or(desc)
+        if isinstance(desc, Either):
+            return self._either(desc)
+        raise TypeError(f'Unknown model description: {desc!r}')
+
+    def _named(self, name: str) -> Check:
+        check = self.named.get(name)
+        if check is not None:
+            return check
+        desc = self.model[name]
+        if isinstance(desc, Obj):
+            return self._obj(desc, register=name)
+
+        # Anything else that refers back to itself goes through a forwarder until compiled
+        compiled: List[Check] = []
+
+        def forward(value: Any, location: Location, out: _Output) -> None:
+            compiled[0](value, location, out)
+
+        self.named[name] = forward
+        compiled.append(self.compile(desc))
+        self.named[name] = compiled[0]
+        return compiled[0]
+
+    @staticmethod
+    def _primitive(desc: Primitive) -> Optional[Check]:
+        if not desc.types:
+            return None
+        types, message = desc.types, f'must be {desc.label}'
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) not in types:
+                out.errors.append((location, message))
+        return check
+
+    @staticmethod
+    def _ref_string() -> Check:
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is str:
+                out.refs.append((value, location))
+            else:
+                out.errors.append((location, 'must be a string'))
+        return check
+
+    @staticmethod
+    def _enum(desc: Enum) -> Check:
+        values, message = desc.values, f"must be one of: {', '.join(desc.values)}"
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is not str or value not in values:
+                out.errors.append((location, message))
+        return check
+
+    def _obj(self, desc: Obj, register: Optional[str] = None) -> Check:
+        # One lookup per key: a nested check, or the exact types of a scalar field
+        # (empty for fields that take any value), which are checked inline
+        fields: Dict[str, Any] = {}
+        messages: Dict[str, str] = {}
+        patterned: List[Tuple[Any, Optional[Check]]] = []
+        required, closed, rules = desc.required, desc.closed, desc.rules
+        message = f'must be an object ({desc.name})'
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is not dict:
+                out.errors.append((location, message))
+                return
+            errors = out.errors
+            for key in required:
+                if key not in value:
+                    errors.append((location, f"missing required field '{key}'"))
+            for key, item in value.items():
+                field = fields.get(key)
+                if field is not None:
+                    if type(field) is not tuple:
+                        field(item, (location, key), out)
+                    elif field and type(item) not in field:
+                        errors.append(((location, key), messages[key]))
+                    continue
+                if type(key) is not str:
+                    errors.append(((location, key), 'field names must be strings'))
+                    continue
+                if key.startswith('x-'):
+                    continue
+                for pattern, pattern_check in patterned:
+                    if pattern.match(key):
+                        if pattern_check is not None:
+                            pattern_check(item, (location, key), out)
+                        break
+                else:
+                    if closed:
+                        errors.append(((location, key), 'unknown field'))
+            for rule in rules:
+                violations = rule(value)
+                if violations:
+                    errors.extend((location if key is None else (location, key), violation)
+                                  for violation, key in violations)
+
+        if register is not None:
+            # Registered before the fields are compiled, so that they can refer back to this object
+            self.named[register] = check
+        for key, field in desc.fields.items():
+            if isinstance(field, Primitive):
+                fields[key] = field.types
+                messages[key] = f'must be {field.label}'
+            else:
+                fields[key] = self.compile(field)
+        patterned.extend((pattern, self.compile(field)) for pattern, field in desc.patterned)
+        return check
+
+    def _map(self, desc: MapOf) -> Check:
+        child = self.compile(desc.value)
+        key_pattern = desc.key_pattern
+        key_message = f'keys must match {key_pattern.pattern}' if key_pattern else ''
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is not dict:
+                out.errors.append((location, 'must be an object'))
+                return
+            for key, item in value.items():
+                if type(key) is not str:
+                    out.errors.append(((location, key), 'keys must be strings'))
+                    continue
+                if key_pattern is not None and not key_pattern.match(key):
+                    out.errors.append(((location, key), key_message))
+                if child is not None:
+                    child(item, (location, key), out)
+        return check
+
+    def _list(self, desc: ListOf) -> Check:
+        child = self.compile(desc.item)
+        min_items = desc.min_items
+        min_message = f"must have at least {min_items} item{'s' if min_items != 1 else ''}"
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is not list:
+                out.errors.append((location, 'must be an array'))
+                return
+            if len(value) < min_items:
+                out.errors.append((location, min_message))
+            if child is not None:
+                for i, item in enumerate(value):
+                    child(item, (location, Index(i)), out)
+        return check
+
+    def _ref_or(self, desc: RefOr) -> Check:
+        target = self.compile(desc.target)
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            if type(value) is dict and '$ref' in value:
+                # A Reference Object: its other fields are ignored
+                ref = value['$ref']
+                if type(ref) is str:
+                    out.refs.append((ref, (location, '$ref')))
+                else:
+                    out.errors.append(((location, '$ref'), 'must be a string'))
+            elif target is not None:
+                target(value, location, out)
+        return check
+
+    def _either(self, desc: Either) -> Check:
+        options = [(json_types(option, self.model), self.compile(option)) for option in desc.options]
+        message = f'must be {describe(desc, self.model)}'
+
+        def check(value: Any, location: Location, out: _Output) -> None:
+            value_type = type(value)
+            for types, option in options:
+                if types is None or value_type in types:
+                    if option is not None:
+                        option(value, location, out)
+                    return
+            out.errors.append((location, message))
+        return check
+
+
+_compiled: Dict[str, Check] = {}
+
+
+def compiled_validator(version: str) -> Check:
+    """The compiled check of a whole document for OpenAPI `version`, built once per process."""
+    check = _compiled.get(version)
+    if check is None:
+        check = _compiled[version] = _Compiler(build_model(version)).compile(Named('OpenAPI'))
+    return check
+
+
+def spec_version(spec: Dict[str, Any]) -> str:
+    """The model version a spec is checked against: '3.1' for 3.1.x, '3.0' otherwise."""
+    openapi = spec.get('openapi')
+    return '3.1' if isinstance(openapi, str) and openapi.startswith('3.1') else '3.0'
+
+
+def find_errors(spec: Any) -> List[Tuple[Tuple, str]]:
+    """
+    Check `spec` against the OpenAPI object model of its version and check
+    that every local $ref resolves.
+    Returns: (location, message) pairs, locations as key tuples
+    """
+    if not isinstance(spec, dict):
+        return [((), 'Spec must be a dictionary')]
+    out = _Output()
+    check = compiled_validator(spec_version(spec))
+    # Nothing built here can form a reference cycle, and collections triggered
+    # by the many short-lived location tuples would rescan the whole parsed spec
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        check(spec, None, out)
+        resolver = RefResolver(spec)
+        for ref, location in out.refs:
+            # Only JSON Pointers into this document; external and anchor refs are not followed
+            if (ref == '#' or ref.startswith('#/')) and resolver.resolve_ref(ref) is None:
+                out.errors.append((location, resolver.errors[ref]))
+        return [(location_path(location), message) for location, message in out.errors]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def format_error(location: Tuple, message: str) -> str:
+    path = render_location(location)
+    return f'{path}: {message}' if path else message
+
+
+def validate_structure(spec: Any) -> List[str]:
+    """Every structural error in `spec` as 'location: message'."""
+    return [format_error(location, message) for location, message in find_errors(spec)]
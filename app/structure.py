@@ -0,0 +1,53 @@
+from typing import Any, List
+
+
+def _iterative_repr(node: Any) -> str:
+    parts: List[str] = []
+    # Ids of the containers being written, so that a container inside itself is written as repr() writes it
+    open_ids = set()
+    # (False, text) is written as it is, (True, value) is written as a value
+    stack: List[Any] = [(True, node)]
+    while stack:
+        is_value, item = stack.pop()
+        if not is_value:
+            if type(item) is int:
+                open_ids.discard(item)
+            else:
+                parts.append(item)
+            continue
+        if type(item) is dict or type(item) is list:
+            if id(item) in open_ids:
+                parts.append('{...}' if type(item) is dict else '[...]')
+                continue
+            open_ids.add(id(item))
+            stack.append((False, id(item)))
+            if type(item) is dict:
+                parts.append('{')
+                stack.append((False, '}'))
+                entries = list(item.items())
+                for index in range(len(entries) - 1, -1, -1):
+                    key, value = entries[index]
+                    stack.append((True, value))
+                    stack.append((False, f'{", " if index else ""}{key!r}: '))
+            else:
+                parts.append('[')
+                stack.append((False, ']'))
+                for index in range(len(item) - 1, -1, -1):
+                    stack.append((True, item[index]))
+                    if index:
+                        stack.append((False, ', '))
+        else:
+            parts.append(repr(item))
+    return ''.join(parts)
+
+
+def structure_repr(node: Any) -> str:
+    """
+    repr() of a JSON-like node, at any depth. repr() keeps key order and
+    distinguishes 200 from '200', which makes it a structural key; nesting
+    too deep for it is written out with an explicit stack instead.
+    """
+    try:
+        return repr(node)
+    except RecursionError:
+        return _iterative_repr(node)
@@ -1,9 +1,36 @@
 import json
-import yaml
-import urllib.request
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Any, Optional, Union
 
+from app.budgets import DEFAULT_BUDGET, Budget, check_document, check_size
+from app.spec_cache import SpecCache
+
+FETCH_TIMEOUT = 30
+
+
+@lru_cache(maxsize=None)
+def yaml_loader() -> type:
+    # Imported on first use: JSON specs never pay for PyYAML.
+    # libyaml's C loader is several times faster than the pure-Python one.
+    import yaml
+
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def parse_spec_content(content: str) -> Any:
+    """
+    Parse JSON or YAML spec text, sniffing the format from the content itself.
+    JSON is tried first for documents that look like JSON, with YAML as fallback.
+    """
+    if content.lstrip()[:1] in ('{', '['):
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+    import yaml
+
+    return yaml.load(content, Loader=yaml_loader())
 
 
 class OpenAPIValidator:
@@ -20,11 +47,15 @@ class OpenAPIValidator:
 
         if 'openapi' not in spec:
             errors.append("Missing 'openapi' field")
+        elif not isinstance(spec['openapi'], str):
+            errors.append("'openapi' must be a string")
         elif not spec['openapi'].startswith('3.'):
             errors.append("Only OpenAPI 3.x is supported")
 
         if 'info' not in spec:
             errors.append("Missing 'info' section")
+        elif not isinstance(spec['info'], dict):
+            errors.append("'info' must be an object")
         else:
             if 'title' not in spec['info']:
                 errors.append("Missing 'info.title'")
@@ -36,30 +67,55 @@ class OpenAPIValidator:
 
         return errors
 
-    def load_openapi_spec(source: Union[str, Path]) -> tuple[dict | None, str | None]:
+    @staticmethod
+    def validate_structure(spec: dict) -> list[str]:
+        """
+        Check a parsed spec against the complete OpenAPI 3.0 / 3.1 object model:
+        field types, required and unknown fields, enums, cross-field rules and
+        local $refs. Much stricter than validate_spec_dict(), so it is opt-in.
+        Returns: list of 'location: message' errors
+        """
+        from app.structural_validator import validate_structure
+
+        return validate_structure(spec)
+
+    @staticmethod
+    def load_openapi_spec(source: Union[str, Path], cache: Optional[SpecCache] = None,
+                          budget: Budget = DEFAULT_BUDGET) -> tuple[dict | None, str | None]:
         """
         Load an OpenAPI 3.x spec (YAML or JSON) from local file or URL.
+        With a cache, unchanged content is returned without being parsed again.
+        Specs over the size, value count or depth limits of `budget` are refused.
         Returns: (parsed_spec_dict, error) — error is None if successful
         """
         try:
             if str(source).startswith(('http://', 'https://')):
-                with urllib.request.urlopen(source) as response:
-                    content = response.read().decode('utf-8')
-                    content_type = response.headers.get('Content-Type', '')
+                import urllib.request
+
+                with urllib.request.urlopen(source, timeout=FETCH_TIMEOUT) as response:
+                    raw = response.read() if budget.max_bytes is None else response.read(budget.max_bytes + 1)
             else:
                 path = Path(source)
                 if not path.exists():
                     return None, f"File not found: {path}"
-                content = path.read_text()
-                content_type = path.suffix
+                check_size(path.stat().st_size, budget)
+                raw = path.read_bytes()
+            check_size(len(raw), budget)
 
-            if 'json' in content_type or str(source).endswith('.json'):
-                spec = json.loads(content)
-            else:
-                spec = yaml.safe_load(content)
+            key = None
+            if cache is not None:
+                key = cache.key(raw)
+                spec = cache.get(key)
+                if spec is not None:
+                    return spec, None
+
+            spec = parse_spec_content(raw.decode('utf-8-sig'))
+            check_document(spec, budget)
+
+            if cache is not None:
+                cache.put(key, spec)
 
             return spec, None
 
         except Exception as e:
             return None, f"Failed to load : {e}"
-
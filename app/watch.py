@@ -0,0 +1,286 @@
+import json
+import os
+import select
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, TextIO, Tuple, Union
+
+from app.documents import DocumentStore
+from app.incremental import IncrementalScorer
+from app.spec_cache import SpecCache
+from app.validator import OpenAPIValidator, parse_spec_content
+
+DEBOUNCE = 0.2
+POLL_INTERVAL = 0.5
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = 16  # int wd; uint32 mask, cookie, len
+
+
+class FileWatcher:
+    """Wait for changes to one file, and to the files added with watch_files().
+
+    Uses inotify through ctypes where available, watching the files'
+    directories so that editors which save by writing a new file and renaming
+    it over the old one are noticed too; elsewhere it polls the files' size,
+    mtime and inode. A burst of changes (an editor writing in several chunks,
+    or a quick succession of saves) is reported once, `debounce` seconds after
+    it ends.
+    """
+
+    def __init__(self, path: Union[str, Path], debounce: float = DEBOUNCE, poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.path = Path(path).resolve()
+        self.paths: Set[Path] = {self.path}
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        # inotify watch descriptor -> the directory it watches
+        self._directories: Dict[int, Path] = {}
+        self._libc = None
+        self._fd = self._inotify() if use_inotify else None
+        self._signature = self._stat()
+
+    @property
+    def polling(self) -> bool:
+        return self._fd is None
+
+    def _inotify(self) -> Optional[int]:
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            wd = libc.inotify_add_watch(fd, os.fsencode(self.path.parent), WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                return None
+            self._libc = libc
+            self._directories[wd] = self.path.parent
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def watch_files(self, paths: Iterable[Union[str, Path]]) -> None:
+        """Also report changes to `paths` (replacing those given before), such as the files a spec refers to."""
+        paths = {self.path} | {Path(path).resolve() for path in paths}
+        if paths == self.paths:
+            return
+        self.paths = paths
+        if self._fd is not None:
+            watched = set(self._directories.values())
+            for directory in sorted({path.parent for path in paths} - watched):
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+                # A directory that cannot be watched (yet) just goes unnoticed until the next change elsewhere
+                if wd >= 0:
+                    self._directories[wd] = directory
+        self._signature = self._stat()
+
+    @staticmethod
+    def _stat_one(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _stat(self) -> Tuple[Optional[Tuple[int, int, int]], ...]:
+        return tuple(self._stat_one(path) for path in sorted(self.paths))
+
+    def _changed(self, timeout: Optional[float]) -> bool:
+        """Whether the file changed within `timeout` seconds (None: wait indefinitely)."""
+        if self._fd is None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                signature = self._stat()
+                if signature != self._signature:
+                    self._signature = signature
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                remaining = self.poll_interval if deadline is None else min(self.poll_interval,
+                                                                             deadline - time.monotonic())
+                time.sleep(max(remaining, 0))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        """Drain pending inotify events; whether any of them concerned a watched file."""
+        relevant = False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        while offset + EVENT_HEADER <= len(data):
+            wd = int.from_bytes(data[offset:offset + 4], sys.byteorder, signed=True)
+            length = int.from_bytes(data[offset + 12:offset + 16], sys.byteorder)
+            event_name = data[offset + EVENT_HEADER:offset + EVENT_HEADER + length].rstrip(b'\0')
+            directory = self._directories.get(wd)
+            if directory is not None and event_name:
+                relevant = relevant or directory / os.fsdecode(event_name) in self.paths
+            offset += EVENT_HEADER + length
+        return relevant
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the file has changed and then stayed unchanged for
+        `debounce` seconds. Returns False if nothing changed within `timeout`.
+        """
+        if not self._changed(timeout):
+            return False
+        while self._changed(self.debounce):
+            pass
+        return True
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _issue_keys(results: Dict[str, Any]) -> Counter:
+    return Counter((name, issue['location'], issue['message'], issue['severity'])
+                   for name, category in results.items()
+                   if isinstance(category, dict) for issue in category.get('issues', ()))
+
+
+def _issue_list(keys: Counter) -> List[Dict[str, Any]]:
+    return [{'category': name, 'location': location, 'message': message, 'severity': severity}
+            for (name, location, message, severity), count in keys.items() for _ in range(count)]
+
+
+def issue_diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """What changed between two score_all() results: the total, changed categories and issues added or resolved."""
+    old, new = _issue_keys(before), _issue_keys(after)
+    total, previous = after['total'], before['total']
+    return {
+        'total': {**total, 'change': round(total['score'] - previous['score'], 1)},
+        'categories': {name: {'score': category['score'], 'change': category['score'] - before[name]['score']}
+                       for name, category in after.items()
+                       if name != 'total' and name in before and category['score'] != before[name]['score']},
+        'added': _issue_list(new - old),
+        'resolved': _issue_list(old - new),
+    }
+
+
+class WatchSession:
+    """Score successive versions of one spec file, reusing work between them.
+
+    Unchanged content (a save without edits) is neither parsed nor scored
+    again; with a SpecCache, content seen before (undo) is not parsed again;
+    and scoring goes through an IncrementalScorer, so only path items that
+    changed are walked. External $refs are bundled as in a one-shot run, with
+    the documents read afresh each time; `files` lists the local ones, whose
+    changes count as changes to the spec.
+    """
+
+    def __init__(self, source: Union[str, Path], cache: Optional[SpecCache] = None,
+                 only: Optional[List[str]] = None, skip: Optional[List[str]] = None):
+        self.source = Path(source)
+        self.cache = cache
+        self.scorer = IncrementalScorer(only=only, skip=skip)
+        self.results: Optional[Dict[str, Any]] = None
+        # Local files the spec's external $refs led to on the last load
+        self.files: List[Path] = []
+        self._state: Optional[Tuple] = None
+
+    def _file_state(self, digest: str) -> Tuple:
+        return (digest,) + tuple(FileWatcher._stat_one(path) for path in self.files)
+
+    def rescore(self) -> Optional[Dict[str, Any]]:
+        """
+        Re-read the file. Returns: None if its content is unchanged, the full
+        results on the first successful run, an issue_diff() afterwards, or
+        an 'error' entry when the file cannot be loaded, validated or scored
+        """
+        try:
+            raw = self.source.read_bytes()
+        except OSError as e:
+            return {'error': f'Failed to load : {e}'}
+        digest = SpecCache.key(raw)
+        if self._file_state(digest) == self._state:
+            return None
+        self._state = self._file_state(digest)
+
+        started = time.perf_counter()
+        spec = self.cache.get(digest) if self.cache is not None else None
+        if spec is None:
+            try:
+                spec = parse_spec_content(raw.decode('utf-8-sig'))
+            except Exception as e:
+                # Most likely saved half-way through an edit; keep the last results
+                return {'error': f'Failed to load : {e}'}
+            if self.cache is not None:
+                self.cache.put(digest, spec)
+        if isinstance(spec, dict):
+            # A fresh store, so that edited documents are read again (unchanged ones come from the cache)
+            documents = DocumentStore(self.cache)
+            documents.bundle(spec, self.source)
+            uris = sorted({*documents.documents, *documents.errors})
+            self.files = [Path(uri) for uri in uris if not uri.startswith(('http://', 'https://'))]
+            self._state = self._file_state(digest)
+        parsed = time.perf_counter()
+
+        errors = OpenAPIValidator.validate_spec_dict(spec)
+        if errors:
+            return {'error': 'Validation failed', 'validation_errors': errors}
+
+        try:
+            results = self.scorer.score_all(spec)
+        except Exception as e:
+            # A save half-way through an edit can pass validation and still trip a scorer; keep the last results
+            return {'error': f'Failed to score : {e}'}
+        before, self.results = self.results, results
+        report = dict(results) if before is None else issue_diff(before, results)
+        report['_watch'] = {
+            'parse_seconds': round(parsed - started, 3),
+            'score_seconds': round(time.perf_counter() - parsed, 3),
+            **self.scorer.stats
+        }
+        return report
+
+
+def watch(source: Union[str, Path], out: TextIO = sys.stdout, cache: Optional[SpecCache] = None,
+          only: Optional[List[str]] = None, skip: Optional[List[str]] = None,
+          watcher: Optional[FileWatcher] = None, max_runs: Optional[int] = None) -> int:
+    """Print the results for `source`, then a diff after every change, until interrupted (or `max_runs`)."""
+    session = WatchSession(source, cache, only, skip)
+    watcher = watcher or FileWatcher(source)
+    runs = 0
+    try:
+        report = session.rescore()
+        while True:
+            watcher.watch_files(session.files)
+            if report is not None:
+                out.write(json.dumps(report, indent=2) + '\n')
+                out.flush()
+                runs += 1
+                if max_runs is not None and runs >= max_runs:
+                    return 0
+            watcher.wait()
+            report = session.rescore()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
@@ -0,0 +1,145 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import yaml
+
+from app.open_api_scorer import OpenAPIScorer
+from app.spec_index import SpecIndex
+from app.validator import OpenAPIValidator
+from benchmarks.spec_generator import generate_spec
+
+DEFAULT_SIZES = (10, 100, 1000)
+# generate_spec()'s default; results for other densities are keyed '<size>@<density>'
+DEFAULT_REF_DENSITY = 0.5
+BASELINE = Path(__file__).parent / 'baseline.json'
+# Parsing YAML costs seconds per MB even with libyaml; only time YAML loads up to this size by default
+MAX_YAML_SIZE = 1000
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds, with the GC paused as timeit does."""
+    best = float('inf')
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def result_key(size: int, ref_density: float) -> str:
+    return str(size) if ref_density == DEFAULT_REF_DENSITY else f'{size}@{ref_density:g}'
+
+
+def bench_size(size: int, repeat: int, workdir: Path, max_yaml_size: int = MAX_YAML_SIZE,
+               ref_density: float = DEFAULT_REF_DENSITY) -> Dict[str, float]:
+    spec = generate_spec(size, ref_density=ref_density)
+    timings = {}
+    key = result_key(size, ref_density)
+
+    json_path = workdir / f'spec{key}.json'
+    json_path.write_text(json.dumps(spec))
+    timings['load_json'] = timed(lambda: OpenAPIValidator.load_openapi_spec(json_path), repeat)
+
+    if size <= max_yaml_size:
+        yaml_path = workdir / f'spec{key}.yaml'
+        yaml_path.write_text(yaml.dump(spec, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper)))
+        timings['load_yaml'] = timed(lambda: OpenAPIValidator.load_openapi_spec(yaml_path), repeat)
+
+    timings['validate_spec_dict'] = timed(lambda: OpenAPIValidator.validate_spec_dict(spec), repeat)
+    timings['validate_structure'] = timed(lambda: OpenAPIValidator.validate_structure(spec), repeat)
+    timings['index'] = timed(lambda: SpecIndex(spec), repeat)
+
+    # Built once, so that the scorer stages time the scorers rather than the index
+    index = SpecIndex(spec)
+    for name, scorer in OpenAPIScorer(spec).scorers.items():
+        scorer_class = type(scorer)
+        timings[f'scorer.{name}'] = timed(lambda: scorer_class(spec).get_result(index=index), repeat)
+
+    timings['score_all'] = timed(lambda: OpenAPIScorer(spec).score_all(), repeat)
+    return timings
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 5, max_yaml_size: int = MAX_YAML_SIZE,
+                   ref_densities: Tuple[float, ...] = (DEFAULT_REF_DENSITY,)) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {result_key(size, density): bench_size(size, repeat, Path(tmp), max_yaml_size, density)
+                   for size in sizes for density in ref_densities}
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_seconds: float = 0.005) -> List[Dict[str, Any]]:
+    """
+    Stages slower than baseline by more than `threshold` (0.5 = 50%).
+    Stages under `min_seconds` in the baseline are ignored as timer noise.
+    """
+    regressions = []
+    for size, timings in report['results'].items():
+        for stage, seconds in timings.items():
+            before = baseline.get('results', {}).get(size, {}).get(stage)
+            if before is None or before < min_seconds:
+                continue
+            change = seconds / before - 1
+            if change > threshold:
+                paths, _, density = size.partition('@')
+                regressions.append({'size': int(paths), 'ref_density': float(density or DEFAULT_REF_DENSITY),
+                                    'stage': stage, 'baseline': before, 'current': seconds,
+                                    'change': round(change, 3)})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description='Benchmark the scorer pipeline.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated path counts, e.g. 10,100,1000,100000')
+    parser.add_argument('--ref-densities', default=str(DEFAULT_REF_DENSITY),
+                        help='comma-separated shares of $refs to components, e.g. 0,0.5,1')
+    parser.add_argument('--max-yaml-size', type=int, default=MAX_YAML_SIZE,
+                        help='largest size for which YAML loading is timed')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per stage; the best is kept')
+    parser.add_argument('--baseline', default=str(BASELINE), help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown before flagging')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='ignore stages faster than this in the baseline (timer noise)')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('-o', '--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks([int(size) for size in args.sizes.split(',')], args.repeat, args.max_yaml_size,
+                            tuple(float(density) for density in args.ref_densities.split(',')))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + '\n')
+    elif baseline_path.exists():
+        report['regressions'] = compare(report, json.loads(baseline_path.read_text()), args.threshold,
+                                        args.min_seconds)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import random
+from typing import Dict, Any
+
+METHODS = ('get', 'post', 'put', 'patch', 'delete')
+CONTENT_TYPES = ('application/json', 'application/xml')
+
+
+def generate_spec(num_paths: int, seed: int = 0, ops_per_path: int = 3, params_per_op: int = 3,
+                  num_schemas: int = None, ref_density: float = 0.5, deficiency: float = 0.3) -> Dict[str, Any]:
+    """
+    Build a deterministic synthetic OpenAPI 3.0 spec.
+    `ref_density` is the share of schemas, parameters and responses that are $refs to components,
+    `deficiency` the share of elements missing descriptions, types, examples, ...
+    """
+    rnd = random.Random(seed)
+    num_schemas = num_schemas if num_schemas is not None else max(1, num_paths // 5)
+
+    def lacking() -> bool:
+        return rnd.random() < deficiency
+
+    def use_ref() -> bool:
+        return rnd.random() < ref_density
+
+    schemas = {}
+    for i in range(num_schemas):
+        schema = {
+            'properties': {
+                'id': {'type': 'integer'},
+                'name': {'type': 'string'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+            }
+        }
+        if not lacking():
+            schema['type'] = 'object'
+        if i and use_ref():
+            schema['properties']['parent'] = {'$ref': f'#/components/schemas/Model{rnd.randrange(i)}'}
+        schemas[f'Model{i}'] = schema
+
+    def schema_ref() -> Dict[str, Any]:
+        if use_ref():
+            return {'$ref': f'#/components/schemas/Model{rnd.randrange(num_schemas)}'}
+        return {'type': 'object', 'properties': {'value': {'type': 'string'}}}
+
+    def media() -> Dict[str, Any]:
+        content = {'schema': schema_ref()}
+        if not lacking():
+            content['example'] = {'id': rnd.randrange(1000), 'name': 'example'}
+        return content
+
+    components = {
+        'schemas': schemas,
+        'parameters': {
+            'Limit': {'name': 'limit', 'in': 'query', 'description': 'Max items', 'schema': {'type': 'integer'}},
+            'Offset': {'name': 'offset', 'in': 'query', 'schema': {'type': 'integer'}},
+        },
+        'responses': {
+            'ServerError': {'description': 'Unexpected error', 'content': {'application/json': media()}},
+        },
+        'securitySchemes': {'apiKey': {'type': 'apiKey', 'in': 'header', 'name': 'X-API-Key'}},
+    }
+
+    paths = {}
+    for i in range(num_paths):
+        path = f'/resource{i}' if i % 2 == 0 else f'/resource{i - 1}/{{id}}'
+        path_item = {}
+        for method in rnd.sample(METHODS, min(ops_per_path, len(METHODS))):
+            operation = {'operationId': f'{method}Resource{i}', 'tags': [f'tag{i % 10}']}
+            if not lacking():
+                operation['description'] = f'{method.upper()} resource {i}'
+
+            parameters = []
+            for p in range(params_per_op):
+                if use_ref():
+                    parameters.append({'$ref': '#/components/parameters/Limit' if p % 2 else
+                                       '#/components/parameters/Offset'})
+                    continue
+                param = {'name': f'param{p}', 'in': 'query'}
+                if not lacking():
+                    param['description'] = f'Parameter {p}'
+                if not lacking():
+                    param['schema'] = {'type': 'string'}
+                parameters.append(param)
+            operation['parameters'] = parameters
+
+            if method in ('post', 'put', 'patch'):
+                request_body = {'content': {content_type: media() for content_type in CONTENT_TYPES}}
+                if not lacking():
+                    request_body['description'] = 'Payload'
+                operation['requestBody'] = request_body
+
+            success = {'get': '200', 'post': '201', 'put': '200', 'patch': '200', 'delete': '204'}[method]
+            responses = {}
+            if not lacking():
+                responses[success] = {'description': 'Success', 'content': {'application/json': media()}}
+            responses['400'] = {'description': 'Bad request'} if not lacking() else {}
+            if use_ref():
+                responses['500'] = {'$ref': '#/components/responses/ServerError'}
+            operation['responses'] = responses
+            path_item[method] = operation
+        paths[path] = path_item
+
+    return {
+        'openapi': '3.0.3',
+        'info': {
+            'title': f'Synthetic API {num_paths}',
+            'version': '1.0.0',
+            'description': 'Generated for benchmarking',
+            'contact': {'email': 'api@example.com'},
+        },
+        'servers': [{'url': 'https://api.example.com', 'description': 'Production'}],
+        'tags': [{'name': f'tag{i}', 'description': f'Tag {i}'} for i in range(10)],
+        'security': [{'apiKey': []}],
+        'paths': paths,
+        'components': components,
+    }
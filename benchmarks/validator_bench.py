@@ -0,0 +1,135 @@
+import argparse
+import json
+import sys
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.issues import Index
+from app.openapi_model import Either, Enum, ListOf, MapOf, Named, Obj, Primitive, RefOr, RefString, build_model
+from app.ref_resolver import RefResolver
+from app.structural_validator import describe, find_errors, json_types, spec_version
+from benchmarks.run import timed
+from benchmarks.spec_generator import generate_spec
+
+
+def interpret(spec: Any) -> List[Tuple[Tuple, str]]:
+    """
+    The same checks as app.structural_validator.find_errors(), done by walking
+    the model description alongside the spec on every call. This is the naive
+    approach the compiled validator is measured against.
+    """
+    if not isinstance(spec, dict):
+        return [((), 'Spec must be a dictionary')]
+    model = build_model(spec_version(spec))
+    errors: List[Tuple[Tuple, str]] = []
+    refs: List[Tuple[str, Tuple]] = []
+    _interpret(model, Named('OpenAPI'), spec, (), errors, refs)
+
+    resolver = RefResolver(spec)
+    for ref, location in refs:
+        if (ref == '#' or ref.startswith('#/')) and resolver.resolve_ref(ref) is None:
+            errors.append((location, resolver.errors[ref]))
+    return errors
+
+
+def _interpret(model: Dict[str, Any], desc: Any, value: Any, location: Tuple,
+               errors: List[Tuple[Tuple, str]], refs: List[Tuple[str, Tuple]]) -> None:
+    if isinstance(desc, Named):
+        _interpret(model, model[desc.name], value, location, errors, refs)
+    elif isinstance(desc, Primitive):
+        if desc.types and type(value) not in desc.types:
+            errors.append((location, f'must be {desc.label}'))
+    elif isinstance(desc, RefString):
+        if isinstance(value, str):
+            refs.append((value, location))
+        else:
+            errors.append((location, 'must be a string'))
+    elif isinstance(desc, Enum):
+        if not isinstance(value, str) or value not in desc.values:
+            errors.append((location, f'must be {describe(desc, model)}'))
+    elif isinstance(desc, Obj):
+        if not isinstance(value, dict):
+            errors.append((location, f'must be an object ({desc.name})'))
+            return
+        for key in desc.required:
+            if key not in value:
+                errors.append((location, f"missing required field '{key}'"))
+        for key, item in value.items():
+            if key in desc.fields:
+                _interpret(model, desc.fields[key], item, location + (key,), errors, refs)
+            elif not isinstance(key, str):
+                errors.append((location + (key,), 'field names must be strings'))
+            elif key.startswith('x-'):
+                continue
+            else:
+                for pattern, field in desc.patterned:
+                    if pattern.match(key):
+                        _interpret(model, field, item, location + (key,), errors, refs)
+                        break
+                else:
+                    if desc.closed:
+                        errors.append((location + (key,), 'unknown field'))
+        for rule in desc.rules:
+            for message, key in rule(value) or ():
+                errors.append((location if key is None else location + (key,), message))
+    elif isinstance(desc, MapOf):
+        if not isinstance(value, dict):
+            errors.append((location, 'must be an object'))
+            return
+        for key, item in value.items():
+            if not isinstance(key, str):
+                errors.append((location + (key,), 'keys must be strings'))
+                continue
+            if desc.key_pattern is not None and not desc.key_pattern.match(key):
+                errors.append((location + (key,), f'keys must match {desc.key_pattern.pattern}'))
+            _interpret(model, desc.value, item, location + (key,), errors, refs)
+    elif isinstance(desc, ListOf):
+        if not isinstance(value, list):
+            errors.append((location, 'must be an array'))
+            return
+        if len(value) < desc.min_items:
+            errors.append((location, f"must have at least {desc.min_items} item{'s' if desc.min_items != 1 else ''}"))
+        for i, item in enumerate(value):
+            _interpret(model, desc.item, item, location + (Index(i),), errors, refs)
+    elif isinstance(desc, RefOr):
+        if isinstance(value, dict) and '$ref' in value:
+            if isinstance(value['$ref'], str):
+                refs.append((value['$ref'], location + ('$ref',)))
+            else:
+                errors.append((location + ('$ref',), 'must be a string'))
+        else:
+            _interpret(model, desc.target, value, location, errors, refs)
+    elif isinstance(desc, Either):
+        for option in desc.options:
+            types = json_types(option, model)
+            if types is None or type(value) in types:
+                _interpret(model, option, value, location, errors, refs)
+                return
+        errors.append((location, f'must be {describe(desc, model)}'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.validator_bench',
+                                     description='Compare the compiled structural validator with a naive walk.')
+    parser.add_argument('--paths', type=int, default=34000,
+                        help='path items in the generated spec (3 operations each by default)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per validator; the best is kept')
+    args = parser.parse_args(argv)
+
+    spec = generate_spec(args.paths)
+    find_errors(spec)  # compile outside the timing, as a long-running process would
+    compiled = timed(lambda: find_errors(spec), args.repeat)
+    interpreted = timed(lambda: interpret(spec), args.repeat)
+    operations = sum(1 for item in spec['paths'].values() for key in item if key != 'parameters')
+    print(json.dumps({
+        'paths': args.paths,
+        'operations': operations,
+        'errors': len(find_errors(spec)),
+        'compiled_seconds': round(compiled, 3),
+        'interpreted_seconds': round(interpreted, 3),
+        'speedup': round(interpreted / compiled, 2)
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
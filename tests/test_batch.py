@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.batch import collect_sources, run_batch
+
+SAMPLE = Path(__file__).parent.parent / 'samples' / 'sample1.json'
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / 'nested').mkdir()
+        shutil.copy(SAMPLE, self.tmp / 'good.json')
+        shutil.copy(SAMPLE, self.tmp / 'nested' / 'good2.json')
+        (self.tmp / 'nested' / 'broken.yaml').write_text('openapi: [unclosed')
+        (self.tmp / 'notes.txt').write_text('ignored')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_collect_sources(self):
+        manifest = self.tmp / 'manifest.txt'
+        manifest.write_text('# specs\ngood.json\n\nmissing.json\n')
+
+        sources = collect_sources([str(self.tmp), str(self.tmp / '*.json')], str(manifest))
+
+        self.assertEqual(len([s for s in sources if s.endswith('good.json')]), 1)
+        self.assertTrue(any(s.endswith('broken.yaml') for s in sources))
+        self.assertTrue(sources[-1].endswith('missing.json'))
+        self.assertFalse(any(s.endswith('notes.txt') for s in sources))
+
+    def test_bad_specs_are_isolated(self):
+        sources = collect_sources([str(self.tmp)]) + [str(self.tmp / 'missing.json')]
+        report = run_batch(sources, workers=2, chunksize=1)
+
+        self.assertEqual(report['summary']['count'], 4)
+        self.assertEqual(report['summary']['scored'], 2)
+        self.assertEqual(report['summary']['failed'], 2)
+        self.assertEqual(report['specs'][0]['results'], report['specs'][2]['results'])
+        self.assertIn('File not found', report['specs'][3]['error'])
@@ -0,0 +1,47 @@
+import unittest
+
+from app.open_api_scorer import OpenAPIScorer
+from app.validator import OpenAPIValidator
+from benchmarks.run import compare, run_benchmarks
+from benchmarks.spec_generator import generate_spec
+
+
+class TestSpecGenerator(unittest.TestCase):
+    def test_generated_spec_is_deterministic_and_valid(self):
+        spec = generate_spec(20, seed=3)
+        self.assertEqual(spec, generate_spec(20, seed=3))
+        self.assertNotEqual(spec, generate_spec(20, seed=4))
+        self.assertEqual(len(spec['paths']), 20)
+        self.assertEqual(OpenAPIValidator.validate_spec_dict(spec), [])
+
+    def test_deficiency_lowers_score(self):
+        clean = OpenAPIScorer(generate_spec(30, deficiency=0.0)).score_all()
+        poor = OpenAPIScorer(generate_spec(30, deficiency=0.9)).score_all()
+        self.assertGreater(clean['total']['score'], poor['total']['score'])
+
+
+class TestBenchmarkRun(unittest.TestCase):
+    def test_report_times_every_stage(self):
+        report = run_benchmarks([5], repeat=1)
+        stages = report['results']['5']
+        for stage in ('load_json', 'load_yaml', 'validate_spec_dict', 'index', 'score_all',
+                      'scorer.descriptions', 'scorer.best_practices'):
+            self.assertIn(stage, stages)
+
+    def test_ref_density_axis(self):
+        report = run_benchmarks([5], repeat=1, max_yaml_size=0, ref_densities=(0.5, 1.0))
+        self.assertEqual(list(report['results']), ['5', '5@1'])
+        self.assertIn('scorer.schema_types', report['results']['5@1'])
+
+    def test_compare_flags_only_slowdowns_above_threshold(self):
+        baseline = {'results': {'100': {'a': 0.1, 'b': 0.1, 'c': 0.0001}}}
+        report = {'results': {'100': {'a': 0.2, 'b': 0.11, 'c': 0.01}}}
+        regressions = compare(report, baseline, threshold=0.5)
+        self.assertEqual([r['stage'] for r in regressions], ['a'])
+
+        regressions = compare({'results': {'100@0.9': {'a': 0.2}}}, {'results': {'100@0.9': {'a': 0.1}}}, 0.5)
+        self.assertEqual((regressions[0]['size'], regressions[0]['ref_density']), (100, 0.9))
+
+
+if __name__ == '__main__':
+    unittest.main()
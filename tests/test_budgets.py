@@ -0,0 +1,105 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import yaml
+
+from app.batch import score_source
+from app.budgets import Budget, BudgetExceeded, UNLIMITED, check_document
+from app.open_api_scorer import OpenAPIScorer
+from app.scoring_strategy import ScoringStrategy
+from app.validator import OpenAPIValidator
+
+SAMPLE = Path(__file__).parent.parent / 'samples' / 'sample1.json'
+
+
+class SlowScorer(ScoringStrategy):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.max_score = 10
+        self.operations = 0
+
+    def begin(self):
+        super().begin()
+        self.operations = 0
+
+    def visit_operation(self, path, method, operation):
+        self.operations += 1
+        time.sleep(0.02)
+
+    def finish(self):
+        return self.operations
+
+
+class TestDocumentLimits(unittest.TestCase):
+    def test_values_and_depth(self):
+        document = {'a': [1, 2, {'b': None}], 'c': 'd'}
+        check_document(document, Budget(max_nodes=7, max_depth=3))
+        with self.assertRaisesRegex(BudgetExceeded, 'more than 6 values'):
+            check_document(document, Budget(max_nodes=6))
+        with self.assertRaisesRegex(BudgetExceeded, 'deeper than the limit of 2'):
+            check_document(document, Budget(max_depth=2))
+        check_document(document, UNLIMITED)
+
+    def test_alias_bomb(self):
+        lines = ['a0: &a0 [x, x, x, x, x, x, x, x, x, x]']
+        for level in range(1, 10):
+            lines.append(f'a{level}: &a{level} [' + ', '.join([f'*a{level - 1}'] * 10) + ']')
+        bomb = yaml.safe_load('\n'.join(lines))
+        started = time.perf_counter()
+        with self.assertRaisesRegex(BudgetExceeded, 'aliases expanded'):
+            check_document(bomb, Budget(max_nodes=100_000))
+        self.assertLess(time.perf_counter() - started, 1)
+
+        with self.assertRaisesRegex(BudgetExceeded, 'deeper'):
+            check_document(yaml.safe_load('a: &a [*a]'), Budget())
+
+    def test_loader_refuses_oversized_specs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'spec.json'
+            path.write_text(SAMPLE.read_text())
+            spec, error = OpenAPIValidator.load_openapi_spec(path)
+            self.assertIsNone(error)
+
+            spec, error = OpenAPIValidator.load_openapi_spec(path, budget=Budget(max_bytes=100))
+            self.assertIsNone(spec)
+            self.assertIn('more than the limit of 100', error)
+            _, error = OpenAPIValidator.load_openapi_spec(path, budget=Budget(max_nodes=50))
+            self.assertIn('more than 50 values', error)
+
+        entry = score_source('inline', (json.loads(SAMPLE.read_text()), None), budget=Budget(max_depth=3))
+        self.assertIn('deeper than the limit of 3', entry['error'])
+
+
+class TestScorerTimeBudget(unittest.TestCase):
+    def test_slow_scorers_are_truncated(self):
+        spec = json.loads(SAMPLE.read_text())
+        operations = sum(1 for item in spec['paths'].values() for key in item if key in ('get', 'post', 'delete'))
+        scorer = OpenAPIScorer(spec, budget=Budget(scorer_seconds=0.01))
+        scorer.scorers['slow'] = SlowScorer(spec)
+        results = scorer.score_all()
+
+        self.assertTrue(results['slow']['truncated'])
+        self.assertEqual(results['slow']['score'], 1)
+        self.assertLess(results['slow']['score'], operations)
+        # The other categories are unaffected
+        expected = OpenAPIScorer(spec).score_all()
+        self.assertEqual({name: results[name] for name in expected if name != 'total'},
+                         {name: category for name, category in expected.items() if name != 'total'})
+
+    def test_long_loops_stop_early(self):
+        spec = json.loads(SAMPLE.read_text())
+        spec['components']['schemas'] = {f'S{i}': {} for i in range(1000)}
+        results = OpenAPIScorer(spec, only=['schema_types'], budget=Budget(scorer_seconds=0)).score_all()
+        self.assertTrue(results['schema_types']['truncated'])
+        self.assertEqual(results['schema_types']['issues'], [])
+
+    def test_no_budget_no_flag(self):
+        results = OpenAPIScorer(json.loads(SAMPLE.read_text()), budget=Budget()).score_all()
+        self.assertFalse(any('truncated' in category for category in results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
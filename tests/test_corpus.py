@@ -0,0 +1,100 @@
+import io
+import csv
+import math
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import corpus as corpus_module
+from app.batch import run_batch
+from app.corpus import Corpus, load_corpus
+from app.open_api_scorer import OpenAPIScorer
+from benchmarks.spec_generator import generate_spec
+
+
+def build_corpus():
+    corpus = Corpus()
+    for seed in range(12):
+        spec = generate_spec(8, seed=seed, deficiency=seed / 12)
+        only = ['security', 'examples'] if seed == 5 else None
+        corpus.add(f'spec-{seed}', OpenAPIScorer(spec, only=only).score_all())
+    return corpus
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        self.corpus = build_corpus()
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_columns(self):
+        self.assertEqual(len(self.corpus), 12)
+        descriptions = self.corpus.column('descriptions')
+        self.assertTrue(math.isnan(descriptions[5]))
+        self.assertFalse(math.isnan(descriptions[4]))
+        self.assertEqual(sum(self.corpus.grade_distribution().values()), 12)
+
+        results = OpenAPIScorer(generate_spec(8, seed=3, deficiency=3 / 12)).score_all()
+        issues = [issue for name, category in results.items() if name != 'total' for issue in category['issues']]
+        self.assertEqual(self.corpus.column('issues.low')[3], sum(issue['severity'] == 'low' for issue in issues))
+        self.assertEqual(sum(self.corpus.columns[name][3] for name in self.corpus.columns if name.startswith('code.')),
+                         len(issues))
+        self.assertNotIn('code.OTHER', self.corpus.columns)
+
+    def test_numpy_and_fallback_agree(self):
+        def aggregates():
+            return (self.corpus.percentiles('total', (0, 10, 50, 95, 100)),
+                    self.corpus.percentiles('descriptions'),
+                    self.corpus.histogram('total', bins=5, value_range=(0, 100)),
+                    self.corpus.histogram('issues.medium', bins=3),
+                    self.corpus.top_k('total', 4),
+                    self.corpus.top_k('security', 3, worst=False),
+                    self.corpus.grade_distribution())
+
+        with_numpy = aggregates()
+        with mock.patch.object(corpus_module, 'np', None):
+            fallback = aggregates()
+        for a, b in zip(with_numpy, fallback):
+            if isinstance(a, dict) and a and isinstance(next(iter(a.values())), float):
+                for key in a:
+                    self.assertAlmostEqual(a[key], b[key])
+            elif isinstance(a, tuple):
+                self.assertEqual(a[0], b[0])
+                for x, y in zip(a[1], b[1]):
+                    self.assertAlmostEqual(x, y)
+            else:
+                self.assertEqual(a, b)
+
+    def test_save_load_and_csv(self):
+        path = self.tmp / 'corpus.bin'
+        self.corpus.failed.append(('broken.yaml', 'Validation failed'))
+        self.corpus.save(path)
+        loaded = load_corpus(path)
+        self.assertEqual(loaded.sources, self.corpus.sources)
+        self.assertEqual(loaded.failed, self.corpus.failed)
+        self.assertEqual(loaded.grades, self.corpus.grades)
+        self.assertEqual(list(loaded.columns), list(self.corpus.columns))
+        self.assertEqual(loaded.summary(), self.corpus.summary())
+
+        out = io.StringIO()
+        self.corpus.to_csv(out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[5]['category.descriptions'], '')
+        self.assertEqual(float(rows[0]['total']), self.corpus.column('total')[0])
+
+    def test_from_batch_report(self):
+        spec_path = self.tmp / 'spec.json'
+        spec_path.write_text('{"openapi": "3.0.0", "info": {"title": "T", "version": "1"}, "paths": {}}')
+        (self.tmp / 'bad.json').write_text('{"info": {}}')
+        corpus = Corpus.from_batch(run_batch([str(spec_path), str(self.tmp / 'bad.json')], workers=1))
+        self.assertEqual(corpus.sources, [str(spec_path)])
+        self.assertEqual(corpus.failed, [(str(self.tmp / 'bad.json'), 'Validation failed')])
+
+
+if __name__ == '__main__':
+    unittest.main()
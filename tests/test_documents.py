@@ -0,0 +1,132 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import batch
+from app.batch import run_batch, score_source
+from app.documents import EXTERNAL_DOCUMENTS, DocumentStore, document_id
+from app.open_api_scorer import OpenAPIScorer
+from app.ref_resolver import RefResolver
+from app.structural_validator import find_errors
+
+
+def spec_using(*refs):
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Pets', 'version': '1.0', 'description': 'Pets'},
+        'paths': {
+            f'/pets{index}': {'get': {'responses': {'200': {'description': 'Pets', 'content': {
+                'application/json': {'schema': {'$ref': ref}}
+            }}}}}
+            for index, ref in enumerate(refs)
+        }
+    }
+
+
+class TestDocumentStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / 'schemas').mkdir()
+        (self.tmp / 'schemas' / 'pet.json').write_text(json.dumps({
+            'Pet': {
+                'type': 'object',
+                'properties': {
+                    'owner': {'$ref': 'common.json#/Owner'},
+                    'parent': {'$ref': '#/Pet'}
+                }
+            }
+        }))
+        (self.tmp / 'schemas' / 'common.json').write_text(json.dumps({
+            'Owner': {'type': 'object', 'properties': {'name': {'type': 'string'}}}
+        }))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_spec(self, name, *refs):
+        path = self.tmp / name
+        path.write_text(json.dumps(spec_using(*refs)))
+        return path
+
+    def test_external_refs_resolve_like_local_ones(self):
+        path = self.write_spec('api.json', 'schemas/pet.json#/Pet')
+        spec, error = DocumentStore().load_spec(path)
+        self.assertIsNone(error)
+
+        schema = spec['paths']['/pets0']['get']['responses']['200']['content']['application/json']['schema']
+        pet_id = document_id(str((self.tmp / 'schemas' / 'pet.json').resolve()))
+        self.assertEqual(schema['$ref'], f'#/{EXTERNAL_DOCUMENTS}/{pet_id}/Pet')
+
+        resolver = RefResolver(spec)
+        pet = resolver.resolve(schema)
+        self.assertEqual(pet['type'], 'object')
+        # Refs inside the external documents, relative and local, are followed too
+        self.assertEqual(resolver.resolve(pet['properties']['owner'])['properties']['name'], {'type': 'string'})
+        self.assertIs(resolver.resolve(pet['properties']['parent']), pet)
+        self.assertEqual(resolver.errors, {})
+        self.assertEqual(find_errors(spec), [])
+        self.assertIn('total', OpenAPIScorer(spec).score_all())
+
+    def test_documents_are_loaded_once(self):
+        store = DocumentStore()
+        for index in range(5):
+            path = self.write_spec(f'api{index}.json', 'schemas/pet.json#/Pet', './schemas/common.json#/Owner')
+            spec, error = store.load_spec(path)
+            self.assertIsNone(error)
+            self.assertEqual(len(spec[EXTERNAL_DOCUMENTS]), 2)
+        self.assertEqual(store.stats['loaded'], 2)
+        self.assertEqual(store.stats['reused'], 8)
+
+    def test_missing_documents_stay_unresolved(self):
+        path = self.write_spec('api.json', 'missing.json#/Pet', 'schemas/common.json#/Owner')
+        store = DocumentStore()
+        spec, error = store.load_spec(path)
+        self.assertIsNone(error)
+
+        missing = str((self.tmp / 'missing.json').resolve())
+        self.assertIn(missing, store.errors)
+        content = spec['paths']['/pets0']['get']['responses']['200']['content']['application/json']
+        self.assertEqual(content['schema']['$ref'], 'missing.json#/Pet')
+        resolver = RefResolver(spec)
+        self.assertIsNone(resolver.resolve_ref(content['schema']['$ref']))
+        self.assertEqual(list(resolver.errors), ['missing.json#/Pet'])
+
+    def test_specs_without_external_refs_are_unchanged(self):
+        spec = spec_using('#/components/schemas/Pet')
+        original = json.loads(json.dumps(spec))
+        DocumentStore().bundle(spec, self.tmp / 'api.json')
+        self.assertEqual(spec, original)
+
+    def test_batch_shares_the_store(self):
+        sources = [str(self.write_spec(f'api{index}.json', 'schemas/pet.json#/Pet')) for index in range(3)]
+        store = DocumentStore()
+        entries = [score_source(source, documents=store) for source in sources]
+        self.assertTrue(all('results' in entry for entry in entries))
+        self.assertEqual(store.stats, {'loaded': 2, 'reused': 2})
+
+        report = run_batch(sources, workers=2, chunksize=1)
+        self.assertEqual(report['summary']['scored'], 3)
+        self.assertEqual([entry['results'] for entry in report['specs']],
+                         [entry['results'] for entry in entries])
+
+    def test_following_refs_is_opt_in(self):
+        source = str(self.write_spec('api.json', 'schemas/pet.json#/Pet'))
+        batch._document_stores.clear()
+        self.assertIn('results', score_source(source))
+        self.assertEqual(batch._document_stores, {})
+        self.assertIn('results', score_source(source, external_refs=True))
+        self.assertEqual(batch.document_store().stats['loaded'], 2)
+
+    def test_root_refuses_other_files_and_urls(self):
+        path = self.write_spec('api.json', 'schemas/pet.json#/Pet', '/etc/passwd', 'http://169.254.169.254/latest')
+        store = DocumentStore(root=self.tmp / 'schemas')
+        spec, error = store.load_spec(path)
+        self.assertIsNone(error)
+        self.assertEqual(sorted(store.errors), ['/etc/passwd', 'http://169.254.169.254/latest'])
+        self.assertEqual(store.stats['loaded'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import unittest
+
+from app import example_validator
+from app.example_validator import ExampleValidator
+from app.examples_scorer import ExamplesScorer
+from app.incremental import IncrementalScorer
+from app.open_api_scorer import OpenAPIScorer
+from app.ref_resolver import RefResolver
+
+
+def pet_spec():
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Pets', 'version': '1.0'},
+        'paths': {
+            '/pets': {
+                'get': {
+                    'responses': {
+                        '200': {'description': 'Pets', 'content': {'application/json': {
+                            'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/Pet'}},
+                            'example': [{'name': 'Rex', 'age': 3}]
+                        }}}
+                    }
+                },
+                'post': {
+                    'requestBody': {'content': {'application/json': {
+                        'schema': {'$ref': '#/components/schemas/Pet'},
+                        'examples': {'cat': {'$ref': '#/components/examples/Cat'}}
+                    }}},
+                    'responses': {
+                        '201': {'description': 'Created', 'content': {'application/json': {
+                            'schema': {'$ref': '#/components/schemas/Pet'},
+                            'example': {'name': 'Rex', 'age': 3}
+                        }}}
+                    }
+                }
+            }
+        },
+        'components': {
+            'schemas': {
+                'Pet': {
+                    'type': 'object',
+                    'required': ['name'],
+                    'properties': {
+                        'name': {'type': 'string', 'minLength': 1},
+                        'age': {'type': 'integer', 'minimum': 0},
+                        'parent': {'$ref': '#/components/schemas/Pet'}
+                    },
+                    'additionalProperties': False
+                }
+            },
+            'examples': {'Cat': {'value': {'name': 'Tom'}}}
+        }
+    }
+
+
+class TestExampleValidator(unittest.TestCase):
+    def validator(self, spec=None, openapi='3.0.3'):
+        spec = spec if spec is not None else pet_spec()
+        return ExampleValidator(RefResolver(spec), openapi), spec
+
+    def test_keywords(self):
+        validator, _ = self.validator()
+        cases = [
+            ({'type': 'integer'}, 3, None),
+            ({'type': 'integer'}, 3.0, None),
+            ({'type': 'integer'}, True, "expected 'integer', got boolean"),
+            ({'type': 'string', 'nullable': True}, None, None),
+            ({'type': 'string', 'maxLength': 2}, 'abc', 'string length 3 is above maxLength 2'),
+            ({'type': 'string', 'pattern': '^[a-z]+$'}, 'ab1', "'ab1' does not match '^[a-z]+$'"),
+            ({'enum': [1, 2]}, True, 'True is not one of [1, 2]'),
+            ({'minimum': 0, 'exclusiveMinimum': True}, 0, '0 is below the minimum of 0'),
+            ({'multipleOf': 0.1}, 0.3, None),
+            ({'type': 'array', 'items': {'type': 'string'}, 'maxItems': 3}, ['a', 1], '[1]: expected \'string\', got integer'),
+            ({'oneOf': [{'type': 'integer'}, {'type': 'number'}]}, 1, 'matches 2 schemas in oneOf instead of exactly one'),
+            ({'anyOf': [{'type': 'integer'}, {'type': 'string'}]}, 'x', None),
+            ({'not': {'type': 'string'}}, 'x', 'matches the schema in not'),
+            ({'allOf': [{'required': ['a']}, {'required': ['b']}]}, {'a': 1}, "missing required property 'b'"),
+            ({'additionalProperties': {'type': 'integer'}}, {'a': 1, 'b': 'x'}, "b: expected 'integer', got string"),
+        ]
+        for schema, instance, expected in cases:
+            with self.subTest(schema=schema, instance=instance):
+                self.assertEqual(validator.validate(instance, schema), expected)
+
+    def test_refs_and_recursion(self):
+        validator, spec = self.validator()
+        pet = {'$ref': '#/components/schemas/Pet'}
+        self.assertIsNone(validator.validate({'name': 'Rex', 'parent': {'name': 'Max'}}, pet))
+        self.assertEqual(validator.validate({'name': 'Rex', 'parent': {'name': ''}}, pet),
+                         'parent.name: string length 0 is below minLength 1')
+        self.assertEqual(validator.validate({'name': 'Rex', 'colour': 'red'}, pet),
+                         'colour: additional property is not allowed')
+
+    def test_version_specific_keywords(self):
+        validator, _ = self.validator(openapi='3.1.0')
+        self.assertIsNone(validator.validate(None, {'type': ['string', 'null']}))
+        self.assertEqual(validator.validate(5, {'exclusiveMaximum': 5}), '5 is above the maximum of 5')
+        self.assertEqual(validator.validate(1, False), 'no value is allowed here')
+        self.assertIsNone(validator.validate([1, 'a'], {'prefixItems': [{'type': 'integer'}, {'type': 'string'}]}))
+
+    def test_schemas_compile_once(self):
+        validator, spec = self.validator()
+        compiled = []
+        compile_schema = validator._compile
+
+        def counting(schema):
+            compiled.append(schema)
+            return compile_schema(schema)
+
+        validator._compile = counting
+        pet = spec['components']['schemas']['Pet']
+        for _ in range(50):
+            validator.validate({'name': 'Rex'}, pet)
+            validator.validate({'name': 'Rex'}, {'$ref': '#/components/schemas/Pet'})
+        # Pet and its properties, plus one wrapper per distinct structure
+        self.assertEqual(len([schema for schema in compiled if schema is pet]), 1)
+        self.assertLessEqual(len(compiled), 6)
+
+    def test_guards(self):
+        validator, _ = self.validator()
+        nested = {'$ref': '#/components/schemas/Pet'}
+        deep = {'name': 'a'}
+        for _ in range(200):
+            deep = {'name': 'a', 'parent': deep}
+        # Too deep to check: not reported rather than failing
+        self.assertIsNone(validator.validate(deep, nested))
+
+        loop_spec = {'components': {'schemas': {'A': {'allOf': [{'$ref': '#/components/schemas/A'}]}}}}
+        loop, _ = self.validator(loop_spec)
+        self.assertIsNone(loop.validate(1, {'$ref': '#/components/schemas/A'}))
+
+        huge = ['x'] * (example_validator.MAX_ARRAY_ITEMS + 5) + [1]
+        self.assertIsNone(validator.validate(huge, {'items': {'type': 'string'}}))
+
+    def test_patterns_that_could_backtrack_for_ever_are_skipped(self):
+        validator, _ = self.validator(openapi='3.1.0')
+        # Checked, this takes exponential time in the length of the example
+        for pattern in ('(a+)+$', '^(a|aa)*$', '^(.*)\\1$', '.*a.*b.*c.*d'):
+            self.assertIsNone(validator.validate('a' * 30 + '!', {'type': 'string', 'pattern': pattern}))
+            self.assertIsNone(validator.validate({'a' * 30 + '!': 1}, {
+                'type': 'object', 'patternProperties': {pattern: {'type': 'string'}}, 'additionalProperties': False
+            }))
+        self.assertEqual(validator.validate('abc!', {'pattern': '^[a-z]+$'}), "'abc!' does not match '^[a-z]+$'")
+        long = 'a' * (example_validator.MAX_PATTERN_INPUT + 1) + '!'
+        self.assertIsNone(validator.validate(long, {'pattern': '^[a-z]+$'}))
+
+        spec = pet_spec()
+        spec['components']['schemas']['Pet']['properties']['name']['pattern'] = '(a+)+$'
+        spec['components']['examples']['Cat']['value'] = {'name': 'a' * 30 + '!'}
+        self.assertEqual(OpenAPIScorer(spec).score_all()['examples']['issues'], [])
+
+    def test_deep_schemas_compile(self):
+        validator, _ = self.validator()
+        schema = {'type': 'integer'}
+        for _ in range(1100):
+            schema = {'type': 'object', 'properties': {'a': schema}}
+        # Checked as far as the example goes; deeper than MAX_DEPTH it is left unchecked
+        self.assertEqual(validator.validate({'a': {'a': 'x'}}, schema), "a.a: expected 'object', got string")
+        deep = 1
+        for _ in range(1100):
+            deep = {'a': deep}
+        self.assertIsNone(validator.validate(deep, schema))
+
+        spec = pet_spec()
+        content = spec['paths']['/pets']['get']['responses']['200']['content']['application/json']
+        content['schema'], content['example'] = schema, deep
+        self.assertIn('total', OpenAPIScorer(spec).score_all())
+
+
+class TestExamplesScorer(unittest.TestCase):
+    def test_valid_examples_get_full_credit(self):
+        result = ExamplesScorer(pet_spec()).get_result()
+        self.assertEqual(result['issues'], [])
+        self.assertEqual(result['score'], 10)
+
+    def test_contradicting_examples_are_reported(self):
+        spec = pet_spec()
+        spec['paths']['/pets']['get']['responses']['200']['content']['application/json']['example'] = [{'age': -1}]
+        spec['components']['examples']['Cat']['value'] = {'name': 'Tom', 'lives': 9}
+        result = ExamplesScorer(spec).get_result()
+        self.assertEqual([(issue['location'], issue['message']) for issue in result['issues']], [
+            ('paths./pets.get.responses.200.content.application/json.example',
+             "Response example does not match its schema: [0]: missing required property 'name'"),
+            ('paths./pets.post.requestBody.content.application/json.examples.cat',
+             'Request example does not match its schema: lives: additional property is not allowed'),
+        ])
+        self.assertLess(result['score'], 10)
+
+    def test_incremental_rescoring_follows_schema_changes(self):
+        spec = pet_spec()
+        incremental = IncrementalScorer()
+        self.assertEqual(incremental.score_all(spec), OpenAPIScorer(spec).score_all())
+
+        spec['components']['schemas']['Pet']['properties']['age']['maximum'] = 2
+        self.assertEqual(incremental.score_all(spec), OpenAPIScorer(spec).score_all())
+        self.assertTrue(OpenAPIScorer(spec).score_all()['examples']['issues'])
+
+    def test_incremental_rescoring_follows_the_openapi_version(self):
+        spec = pet_spec()
+        content = spec['paths']['/pets']['get']['responses']['200']['content']['application/json']
+        content['schema'] = {'type': 'string', 'nullable': True}
+        content['example'] = None
+        incremental = IncrementalScorer()
+        self.assertEqual(incremental.score_all(spec), OpenAPIScorer(spec).score_all())
+
+        # nullable means nothing in 3.1, so the same path item now has a bad example
+        spec['openapi'] = '3.1.0'
+        expected = OpenAPIScorer(spec).score_all()
+        self.assertEqual(incremental.score_all(spec), expected)
+        self.assertIn('paths./pets.get.responses.200.content.application/json.example',
+                      [issue['location'] for issue in expected['examples']['issues']])
+
+
+if __name__ == '__main__':
+    unittest.main()
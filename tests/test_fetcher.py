@@ -0,0 +1,127 @@
+import asyncio
+import gzip
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from app.budgets import Budget
+from app.fetcher import AsyncSpecFetcher
+
+SPEC = {'openapi': '3.0.0', 'info': {'title': 'Registry', 'version': '1'}, 'paths': {}}
+
+
+class RegistryHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    etag = '"v1"'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1], self.headers.get('If-None-Match')))
+        if self.path == '/moved':
+            self.send_response(301)
+            self.send_header('Location', '/openapi.json')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/missing':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps(SPEC).encode()
+        if self.path == '/gzip':
+            body = gzip.compress(json.dumps(dict(SPEC, info={'title': 'x' * 1000, 'version': '1'})).encode())
+        self.send_response(200)
+        # Served as text/plain on purpose: the format is sniffed from the body
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('ETag', self.etag)
+        if self.path == '/gzip':
+            self.send_header('Content-Encoding', 'gzip')
+        if self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for start in range(0, len(body), 10):
+                piece = body[start:start + 10]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(piece), piece))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncSpecFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), RegistryHandler)
+        cls.server.requests = []
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def fetch(self, urls, **options):
+        async def run():
+            async with AsyncSpecFetcher(**options) as fetcher:
+                results = []
+                for url in urls:
+                    results.append(await fetcher.fetch(url))
+                return results, fetcher.stats
+        return asyncio.run(run())
+
+    def test_reuses_connection_and_follows_redirects(self):
+        results, stats = self.fetch([f'{self.base}/openapi.json', f'{self.base}/moved', f'{self.base}/chunked'])
+
+        self.assertEqual([spec for spec, _ in results], [SPEC, SPEC, SPEC])
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['connections'], 1)
+
+    def test_not_modified_reuses_cached_parse(self):
+        url = f'{self.base}/openapi.json'
+        self.fetch([url], cache_dir=self.tmp)
+        results, stats = self.fetch([url], cache_dir=self.tmp)
+
+        self.assertEqual(results, [(SPEC, None)])
+        self.assertEqual(stats['not_modified'], 1)
+        self.assertEqual(self.server.requests[-1][2], '"v1"')
+
+    def test_errors_are_returned(self):
+        results, _ = self.fetch([f'{self.base}/missing', 'ftp://example.com/spec.json'])
+
+        self.assertIn('HTTP 404', results[0][1])
+        self.assertIn('Unsupported URL scheme', results[1][1])
+
+    def test_bodies_over_the_budget_are_refused(self):
+        size = len(json.dumps(SPEC))
+        results, _ = self.fetch([f'{self.base}/openapi.json', f'{self.base}/chunked', f'{self.base}/gzip'],
+                                budget=Budget(max_bytes=size - 1))
+        for _, error in results:
+            self.assertIn('more than the limit', error)
+
+        # About 100 bytes compressed, over 1000 once decompressed
+        results, _ = self.fetch([f'{self.base}/openapi.json', f'{self.base}/gzip'], budget=Budget(max_bytes=500))
+        self.assertIsNone(results[0][1])
+        self.assertIn('more than the limit', results[1][1])
+        results, _ = self.fetch([f'{self.base}/gzip'], budget=Budget(max_bytes=2000))
+        self.assertIsNone(results[0][1])
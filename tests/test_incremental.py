@@ -0,0 +1,58 @@
+import copy
+import datetime
+import json
+import unittest
+from pathlib import Path
+
+from app.incremental import IncrementalScorer, structural_hash
+from app.open_api_scorer import OpenAPIScorer
+
+
+class TestIncrementalScorer(unittest.TestCase):
+    def setUp(self):
+        self.spec = json.loads((Path(__file__).parent.parent / 'samples' / 'sample1.json').read_text())
+        self.spec['components'].setdefault('responses', {})['Error'] = {'description': 'Error'}
+        self.spec['paths']['/errors'] = {
+            'get': {'responses': {'500': {'$ref': '#/components/responses/Error'}}}
+        }
+
+    def test_matches_full_rescore_and_reuses_unchanged_paths(self):
+        incremental = IncrementalScorer()
+        self.assertEqual(incremental.score_all(self.spec), OpenAPIScorer(self.spec).score_all())
+
+        edited = copy.deepcopy(self.spec)
+        first_path = next(iter(edited['paths']))
+        edited['paths'][first_path]['get'].pop('description', None)
+        edited['paths']['/new_path'] = {'delete': {}}
+
+        self.assertEqual(incremental.score_all(edited), OpenAPIScorer(edited).score_all())
+        self.assertEqual(incremental.stats['rescored'], 2)
+        self.assertEqual(incremental.stats['reused'], len(edited['paths']) - 2)
+
+    def test_changed_ref_target_invalidates_dependents(self):
+        incremental = IncrementalScorer()
+        incremental.score_all(self.spec)
+
+        edited = copy.deepcopy(self.spec)
+        edited['components']['responses']['Error'] = {}
+
+        self.assertEqual(incremental.score_all(edited), OpenAPIScorer(edited).score_all())
+        self.assertEqual(incremental.stats['rescored'], 1)
+
+    def test_stats_cover_the_last_run(self):
+        incremental = IncrementalScorer()
+        incremental.score_all(self.spec)
+        incremental.score_all(self.spec)
+        self.assertEqual(incremental.stats, {'reused': len(self.spec['paths']), 'rescored': 0})
+
+    def test_structural_hash(self):
+        self.assertNotEqual(structural_hash({'a': 1}), structural_hash({'a': True}))
+        self.assertNotEqual(structural_hash({'a': 1, 'b': 2}), structural_hash({'b': 2, 'a': 1}))
+        self.assertNotEqual(structural_hash({200: {}}), structural_hash({'200': {}}))
+        # Nodes marshal cannot encode are still hashed
+        self.assertNotEqual(structural_hash({'d': datetime.date(2024, 1, 1)}),
+                            structural_hash({'d': datetime.date(2024, 1, 2)}))
+        deep = [{}, {}]
+        for _ in range(5000):
+            deep = [{'x': deep[0]}, {'x': deep[1]}]
+        self.assertEqual(structural_hash(deep[0]), structural_hash(deep[1]))
@@ -0,0 +1,67 @@
+import unittest
+
+from app.descriptions_scorer import DescriptionsScorer
+from app.instrumentation import Instrumentation, InstrumentationHook
+from app.open_api_scorer import OpenAPIScorer
+from benchmarks.spec_generator import generate_spec
+
+
+class RecordingHook(InstrumentationHook):
+    def __init__(self):
+        self.names = []
+
+    def on_span(self, span):
+        self.names.append(span.name)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.spec = generate_spec(20, seed=1)
+
+    def test_metrics_do_not_change_results(self):
+        plain = OpenAPIScorer(self.spec).score_all()
+        self.assertNotIn('_metrics', plain)
+
+        instrumented = OpenAPIScorer(self.spec, instrumentation=Instrumentation()).score_all()
+        metrics = instrumented.pop('_metrics')
+        self.assertEqual(instrumented, plain)
+
+        self.assertEqual(set(metrics), set(plain))
+        for name, category in plain.items():
+            if name == 'total':
+                continue
+            self.assertEqual(metrics[name]['issues'], len(category['issues']))
+            self.assertGreaterEqual(metrics[name]['peak_bytes'], 0)
+        self.assertEqual(metrics['total']['nodes_visited'],
+                         sum(metrics[name]['nodes_visited'] for name in plain if name != 'total'))
+        self.assertGreater(metrics['descriptions']['nodes_visited'], 0)
+
+    def test_hooks_receive_every_span(self):
+        hook = RecordingHook()
+        OpenAPIScorer(self.spec, instrumentation=Instrumentation([hook], trace_memory=False)).score_all()
+        self.assertEqual(hook.names[-1], 'score_all')
+        self.assertEqual(len(hook.names), 8)
+
+    def test_get_result_metrics(self):
+        scorer = DescriptionsScorer(self.spec)
+        plain = scorer.get_result()
+        result = scorer.get_result(Instrumentation(trace_memory=False))
+        metrics = result.pop('_metrics')
+        self.assertEqual(result, plain)
+        self.assertIsNone(metrics['peak_bytes'])
+        self.assertEqual(metrics['issues'], len(plain['issues']))
+
+    def test_nested_span_keeps_outer_peak(self):
+        instrumentation = Instrumentation()
+        with instrumentation.span('outer') as outer:
+            with instrumentation.span('inner') as inner:
+                data = [object() for _ in range(10000)]
+            del data
+            with instrumentation.span('small'):
+                pass
+        self.assertGreaterEqual(outer.peak_bytes, inner.peak_bytes)
+        self.assertGreater(inner.peak_bytes, 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import json
+import unittest
+from pathlib import Path
+
+from app.issue_stream import GatedScorer, parse_threshold, stream_ndjson
+from app.open_api_scorer import OpenAPIScorer
+from benchmarks.spec_generator import generate_spec
+
+
+def read_lines(out):
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestNdjsonStream(unittest.TestCase):
+    def setUp(self):
+        self.spec = json.loads((Path(__file__).parent.parent / 'samples' / 'sample1.json').read_text())
+        self.spec['paths']['/Mixed_case'] = {'get': {'responses': {'200': {'description': 'ok'}}}}
+        self.expected = OpenAPIScorer(self.spec).score_all()
+
+    def test_streams_every_issue_then_summaries(self):
+        out = io.StringIO()
+        stream_ndjson(self.spec, out)
+        lines = read_lines(out)
+
+        issues = [line for line in lines if line['type'] == 'issue']
+        categories = {line['category']: line for line in lines if line['type'] == 'category'}
+        for name, category in self.expected.items():
+            if name == 'total':
+                continue
+            streamed = [{key: issue[key] for key in ('location', 'message', 'severity')}
+                        for issue in issues if issue['category'] == name]
+            self.assertCountEqual(streamed, category['issues'])
+            self.assertEqual(categories[name]['score'], category['score'])
+            self.assertEqual(categories[name]['issues'], len(category['issues']))
+
+        self.assertEqual([line['type'] for line in lines[-2:]], ['total', 'summary'])
+        self.assertEqual({key: lines[-2][key] for key in ('score', 'max', 'grade')}, self.expected['total'])
+        self.assertFalse(lines[-1]['truncated'])
+
+    def test_max_issues(self):
+        out = io.StringIO()
+        _, writer = stream_ndjson(self.spec, out, max_issues=2)
+        lines = read_lines(out)
+        self.assertEqual(sum(line['type'] == 'issue' for line in lines), 2)
+        self.assertTrue(writer.truncated)
+        self.assertEqual(lines[-1]['written'], 2)
+        self.assertGreater(lines[-1]['issues'], 2)
+        self.assertEqual(lines[-2]['score'], self.expected['total']['score'])
+
+
+class TestFailUnder(unittest.TestCase):
+    def test_gate_decision_matches_full_score(self):
+        for seed in range(6):
+            spec = generate_spec(15, seed=seed, deficiency=seed / 6)
+            full = OpenAPIScorer(spec).score_all()
+            for threshold in (0, 20, 45, full['total']['score'], full['total']['score'] + 0.1, 90, 100):
+                gate = GatedScorer(spec, threshold).run()['_gate']
+                self.assertEqual(gate['passed'], full['total']['score'] >= threshold, (seed, threshold))
+                low, high = gate['score_range']
+                self.assertLessEqual(low, full['total']['score'])
+                self.assertGreaterEqual(high, full['total']['score'])
+
+    def test_stops_once_decided(self):
+        spec = generate_spec(15, seed=1)
+        results = GatedScorer(spec, 1).run()
+        self.assertTrue(results['_gate']['passed'])
+        self.assertTrue(results['_gate']['skipped'])
+        self.assertNotIn('total', results)
+        scored = [name for name in results if name != '_gate']
+        self.assertEqual(len(scored) + len(results['_gate']['skipped']), 7)
+        full = OpenAPIScorer(spec).score_all()
+        for name in scored:
+            self.assertEqual(results[name], full[name])
+
+    def test_parse_threshold(self):
+        self.assertEqual(parse_threshold('b'), 81)
+        self.assertEqual(parse_threshold('72.5'), 72.5)
+        with self.assertRaises(ValueError):
+            parse_threshold('excellent')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from app.issues import Index, Issue, IssueCode, Severity, render_location
+
+
+class TestIssue(unittest.TestCase):
+    def test_render_location(self):
+        self.assertEqual(render_location(('servers', Index(0))), 'servers[0]')
+        self.assertEqual(render_location(('paths', '/pets', 'get', 'parameters', 'limit')),
+                         'paths./pets.get.parameters.limit')
+        self.assertEqual(render_location(('paths', '/pets', 'get', 'responses', 200)),
+                         'paths./pets.get.responses.200')
+
+    def test_serializes_to_result_shape(self):
+        issue = Issue(IssueCode.MISSING_EXPECTED_RESPONSE, ('paths', '/pets', 'post', 'responses'), ('201', 'POST'))
+
+        self.assertEqual(issue.severity, Severity.MEDIUM)
+        self.assertEqual(issue.to_dict(), {
+            'location': 'paths./pets.post.responses',
+            'message': 'Missing expected 201 response for POST',
+            'severity': 'medium'
+        })
+
+    def test_is_slotted(self):
+        issue = Issue(IssueCode.NO_TAGS, ('tags',))
+
+        self.assertFalse(hasattr(issue, '__dict__'))
+        self.assertEqual(issue, Issue(IssueCode.NO_TAGS, ('tags',)))
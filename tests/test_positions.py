@@ -0,0 +1,88 @@
+import json
+import unittest
+from pathlib import Path
+
+import yaml
+
+from app.issues import Index
+from app.open_api_scorer import OpenAPIScorer
+from app.positions import PositionIndex, add_positions, issue_pointer, json_offsets
+from app.ref_resolver import RefResolver
+
+SAMPLE = Path(__file__).parent.parent / 'samples' / 'sample1.json'
+
+
+def line_of(text, position):
+    line, column = position
+    return text.splitlines()[line - 1][column - 1:]
+
+
+class TestPositionIndex(unittest.TestCase):
+    def test_json_offsets(self):
+        text = '{\n  "a": [1, {"b~/c": "x"}],\n  "d": {}, "e": [], "f": -1.5e3, "g": null\n}'
+        offsets = json_offsets(text)
+        self.assertEqual(set(offsets), {'', '/a', '/a/0', '/a/1', '/a/1/b~0~1c', '/d', '/e', '/f', '/g'})
+        self.assertEqual(text[offsets['/a/1']], '{')
+        self.assertTrue(text[offsets['/a/1/b~0~1c']:].startswith('"b~/c"'))
+        with self.assertRaises(ValueError):
+            json_offsets('{"a": nope}')
+
+    def test_json_and_yaml_agree(self):
+        spec = json.loads(SAMPLE.read_text())
+        text = yaml.safe_dump(spec, sort_keys=False)
+        json_index, yaml_index = PositionIndex(SAMPLE.read_text()), PositionIndex(text)
+        pointer = '/paths/~1pets/get/parameters/0'
+        self.assertTrue(line_of(SAMPLE.read_text(), json_index.position(pointer)).startswith('{'))
+        self.assertTrue(line_of(text, yaml_index.position(pointer)).startswith('name: limit'))
+        self.assertTrue(line_of(text, yaml_index.position('/paths/~1pets/get')).startswith('get:'))
+        self.assertIsNone(yaml_index.position('/missing'))
+
+    def test_built_lazily(self):
+        index = PositionIndex('{"a": 1}')
+        self.assertIsNone(index._offsets)
+        self.assertEqual(index.position('/a'), (1, 2))
+        self.assertIsNone(index._text)
+
+    def test_unreadable_documents_have_no_positions(self):
+        self.assertIsNone(PositionIndex('a: [unclosed').position(''))
+
+
+class TestIssuePositions(unittest.TestCase):
+    def test_issue_pointer(self):
+        spec = {
+            'paths': {'/a': {'get': {'parameters': [{'$ref': '#/components/parameters/Limit'}, {'name': 'q'}],
+                                     'responses': {200: {'description': 'OK'}}}}},
+            'components': {'parameters': {'Limit': {'name': 'limit'}}}
+        }
+        resolver = RefResolver(spec)
+        self.assertEqual(issue_pointer(spec, ('paths', '/a', 'get', 'parameters', 'limit'), resolver),
+                         '/paths/~1a/get/parameters/0')
+        self.assertEqual(issue_pointer(spec, ('paths', '/a', 'get', 'parameters', Index(1))),
+                         '/paths/~1a/get/parameters/1')
+        self.assertEqual(issue_pointer(spec, ('paths', '/a', 'get', 'responses', '200', 'content')),
+                         '/paths/~1a/get/responses/200')
+        self.assertIsNone(issue_pointer(spec, ('tags',)))
+
+    def test_issues_get_lines(self):
+        text = SAMPLE.read_text()
+        spec = json.loads(text)
+        scorer = OpenAPIScorer(spec)
+        results = add_positions(scorer.score_all(), scorer, PositionIndex(text))
+        lines = text.splitlines()
+
+        issues = [issue for name, category in results.items() if name != 'total' for issue in category['issues']]
+        placed = [issue for issue in issues if 'line' in issue]
+        self.assertTrue(placed)
+        for issue in placed:
+            last = issue['location'].rsplit('.', 1)[-1]
+            with self.subTest(location=issue['location']):
+                source = lines[issue['line'] - 1][issue['column'] - 1:]
+                self.assertTrue(source.startswith((f'"{last}"', '{')), source)
+        # Scores are unaffected
+        self.assertEqual({name: category['score'] for name, category in results.items() if name != 'total'},
+                         {name: category['score'] for name, category in OpenAPIScorer(spec).score_all().items()
+                          if name != 'total'})
+
+
+if __name__ == '__main__':
+    unittest.main()
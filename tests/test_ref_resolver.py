@@ -0,0 +1,60 @@
+import unittest
+
+from app.descriptions_scorer import DescriptionsScorer
+from app.ref_resolver import RefResolver
+
+
+class TestRefResolver(unittest.TestCase):
+    def setUp(self):
+        self.spec = {
+            'info': {'description': 'API'},
+            'components': {
+                'parameters': {
+                    'Limit': {'name': 'limit', 'in': 'query', 'description': 'Max items'},
+                    'Alias': {'$ref': '#/components/parameters/Limit'}
+                },
+                'responses': {
+                    'Error': {'description': 'Error'},
+                    'Loop': {'$ref': '#/components/responses/Loop2'},
+                    'Loop2': {'$ref': '#/components/responses/Loop'}
+                },
+                'schemas': {
+                    'a/b': {'type': 'string'}
+                }
+            },
+            'paths': {
+                '/pets': {
+                    'get': {
+                        'description': 'List pets',
+                        'parameters': [{'$ref': '#/components/parameters/Alias'}],
+                        'responses': {'500': {'$ref': '#/components/responses/Error'}}
+                    }
+                }
+            }
+        }
+
+    def test_resolves_chains_to_shared_node(self):
+        resolver = RefResolver(self.spec)
+        target = resolver.resolve({'$ref': '#/components/parameters/Alias'})
+
+        self.assertIs(target, self.spec['components']['parameters']['Limit'])
+        self.assertIs(resolver.resolve_ref('#/components/parameters/Limit'), target)
+
+    def test_escaped_pointer(self):
+        resolver = RefResolver(self.spec)
+        self.assertEqual(resolver.resolve_ref('#/components/schemas/a~1b'), {'type': 'string'})
+
+    def test_cycles_and_missing_refs_are_reported(self):
+        resolver = RefResolver(self.spec)
+        node = {'$ref': '#/components/responses/Loop'}
+
+        self.assertIs(resolver.resolve(node), node)
+        self.assertIsNone(resolver.resolve_ref('#/components/responses/Missing'))
+        self.assertIn('Circular $ref', resolver.errors['#/components/responses/Loop'])
+        self.assertIn('Unresolvable $ref', resolver.errors['#/components/responses/Missing'])
+
+    def test_scorers_see_ref_targets(self):
+        scorer = DescriptionsScorer(self.spec)
+        scorer.score()
+
+        self.assertEqual(scorer.issues, [])
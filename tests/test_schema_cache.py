@@ -0,0 +1,131 @@
+import copy
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from app import schema_cache
+from app.batch import schema_result_cache, score_source
+from app.budgets import UNLIMITED
+from app.open_api_scorer import OpenAPIScorer
+from app.ref_resolver import RefResolver
+from app.schema_cache import SchemaKeys, SchemaResultCache
+from app.schema_types_scorer import SchemaTypesScorer
+from app.structure import structure_repr
+
+
+def spec_with(schemas):
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Shared', 'version': '1.0'},
+        'paths': {},
+        'components': {'schemas': schemas}
+    }
+
+
+SHARED = {
+    'Error': {'type': 'object', 'properties': {'code': {'type': 'integer'}}},
+    'Untyped': {'properties': {'id': {'type': 'string'}}},
+    'Alias': {'$ref': '#/components/schemas/Untyped'},
+}
+
+
+class TestSchemaKeys(unittest.TestCase):
+    def test_identical_components_share_keys(self):
+        first, second = spec_with(copy.deepcopy(SHARED)), spec_with(copy.deepcopy(SHARED))
+        first_keys, second_keys = SchemaKeys(RefResolver(first)), SchemaKeys(RefResolver(second))
+        for name in SHARED:
+            self.assertEqual(first_keys.key(first['components']['schemas'][name]),
+                             second_keys.key(second['components']['schemas'][name]))
+        self.assertNotEqual(first_keys.key(SHARED['Error']), first_keys.key(SHARED['Untyped']))
+
+    def test_keys_cover_ref_targets(self):
+        first, second = spec_with(copy.deepcopy(SHARED)), spec_with(copy.deepcopy(SHARED))
+        second['components']['schemas']['Untyped']['type'] = 'object'
+        alias = {'$ref': '#/components/schemas/Untyped'}
+        self.assertNotEqual(SchemaKeys(RefResolver(first)).key(alias), SchemaKeys(RefResolver(second)).key(alias))
+
+        looped = spec_with({'A': {'$ref': '#/components/schemas/B'}, 'B': {'$ref': '#/components/schemas/A'}})
+        self.assertTrue(SchemaKeys(RefResolver(looped)).key(looped['components']['schemas']['A']))
+
+    def test_each_schema_is_serialized_once(self):
+        count = 300
+        schemas = {f'S{i}': {'type': 'object', 'properties': {
+            f'p{j}': {'$ref': f'#/components/schemas/S{(i + j) % count}'} for j in range(10)
+        }} for i in range(count)}
+        schemas['Alias'] = {'$ref': '#/components/schemas/S0'}
+        spec = spec_with(schemas)
+        keys = SchemaKeys(RefResolver(spec))
+        with mock.patch.object(schema_cache, 'structure_repr', side_effect=structure_repr) as serialize:
+            all_keys = {keys.key(schema) for schema in schemas.values()}
+        self.assertEqual(len(all_keys), count + 1)
+        self.assertEqual(serialize.call_count, count + 1)
+
+    def test_deep_components(self):
+        deep = {'type': 'string'}
+        for _ in range(5000):
+            deep = {'type': 'object', 'properties': {'child': deep}}
+        spec = spec_with({'Deep': deep, 'Alias': {'$ref': '#/components/schemas/Deep'}})
+        keys = SchemaKeys(RefResolver(spec))
+        self.assertNotEqual(keys.key(deep), keys.key(spec['components']['schemas']['Alias']))
+
+        entry = score_source('deep', (spec, None), budget=UNLIMITED)
+        self.assertEqual(entry['results']['schema_types']['score'], 20)
+
+
+class TestSchemaResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_results_match_uncached_scoring(self):
+        specs = [spec_with(copy.deepcopy(SHARED)) for _ in range(3)]
+        specs[2]['components']['schemas']['Extra'] = {'type': 'string'}
+        expected = [OpenAPIScorer(spec).score_all() for spec in specs]
+
+        cache = SchemaResultCache()
+        checked = []
+        check_component = SchemaTypesScorer.check_component
+
+        def counting(scorer, schema):
+            checked.append(schema)
+            return check_component(scorer, schema)
+
+        SchemaTypesScorer.check_component = counting
+        try:
+            self.assertEqual([OpenAPIScorer(spec, schema_results=cache).score_all() for spec in specs], expected)
+        finally:
+            SchemaTypesScorer.check_component = check_component
+        self.assertEqual(len(checked), len(SHARED) + 1)
+        self.assertEqual(cache.stats, {'hits': 2 * len(SHARED), 'misses': len(SHARED) + 1})
+
+    def test_lru_and_disk_persistence(self):
+        cache = SchemaResultCache(size=2, directory=self.tmp)
+        for key in 'abc':
+            cache.put(key, ((), key == 'b'))
+        self.assertEqual(list(cache._entries), ['b', 'c'])
+
+        # A new process starts empty but finds the entries on disk
+        reloaded = SchemaResultCache(directory=self.tmp)
+        self.assertEqual(reloaded.get('a'), ((), False))
+        self.assertIsNone(reloaded.get('d'))
+        self.assertEqual(reloaded.stats, {'hits': 1, 'misses': 1})
+
+    def test_batch_caches_per_process(self):
+        cache = schema_result_cache(str(self.tmp))
+        self.assertIs(schema_result_cache(str(self.tmp)), cache)
+        self.assertEqual(cache.store.directory, self.tmp / 'schema-results')
+
+        entry = score_source('shared', (spec_with(copy.deepcopy(SHARED)), None), cache_dir=str(self.tmp))
+        self.assertIn('results', entry)
+        self.assertEqual(cache.stats['misses'], len(SHARED))
+        # Only the batch's own scorers use it
+        self.assertIsNone(SchemaTypesScorer.result_cache)
+        self.assertIsNone(OpenAPIScorer(spec_with({})).scorers['schema_types'].result_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
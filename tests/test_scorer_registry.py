@@ -0,0 +1,99 @@
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import scorer_registry
+from app.open_api_scorer import OpenAPIScorer
+from app.scorer_registry import SCORERS, register_scorer, select_scorers
+from app.scoring_strategy import ScoringStrategy
+from benchmarks.spec_generator import generate_spec
+
+PLUGIN_MODULE = '''
+from app.scoring_strategy import ScoringStrategy
+
+
+class TitleScorer(ScoringStrategy):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.max_score = 5
+
+    def finish(self):
+        return 5 if self.spec.get('info', {}).get('title') else 0
+'''
+
+
+class HalfScorer(ScoringStrategy):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.max_score = 20
+
+    def finish(self):
+        return 10
+
+
+class TestScorerRegistry(unittest.TestCase):
+    def setUp(self):
+        self.spec = generate_spec(20, seed=2)
+        self.registered = dict(SCORERS)
+
+    def tearDown(self):
+        for name in set(SCORERS) - set(self.registered):
+            del SCORERS[name]
+            scorer_registry._loaded.pop(name, None)
+
+    def test_selection_skips_unselected_scorers(self):
+        full = OpenAPIScorer(self.spec).score_all()
+
+        scorer = OpenAPIScorer(self.spec, only=['security', 'response_codes'])
+        self.assertEqual(list(scorer.scorers), ['response_codes', 'security'])
+        results = scorer.score_all()
+        self.assertEqual(results['security'], full['security'])
+        self.assertEqual(results['response_codes'], full['response_codes'])
+        self.assertAlmostEqual(results['total']['score'],
+                               round((full['security']['score'] + full['response_codes']['score']) * 4, 1))
+        self.assertEqual(results['total']['max'], 100)
+
+        skipped = OpenAPIScorer(self.spec, skip=['examples']).score_all()
+        self.assertNotIn('examples', skipped)
+        self.assertEqual(len(skipped), len(full) - 1)
+
+    def test_unknown_or_empty_selection(self):
+        with self.assertRaises(ValueError):
+            select_scorers(only=['securty'])
+        with self.assertRaises(ValueError):
+            select_scorers(only=['security'], skip=['security'])
+
+    def test_registered_scorer_is_renormalized(self):
+        register_scorer('half', HalfScorer)
+        results = OpenAPIScorer(self.spec, only=['half']).score_all()
+        self.assertEqual(results['half']['score'], 10)
+        self.assertEqual(results['total']['score'], 50.0)
+        self.assertIn('half', OpenAPIScorer(self.spec).scorers)
+
+    def test_entry_point_plugins_are_discovered(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        (tmp / 'title_plugin.py').write_text(PLUGIN_MODULE)
+        dist = tmp / 'title_plugin-1.0.dist-info'
+        dist.mkdir()
+        (dist / 'METADATA').write_text('Metadata-Version: 2.1\nName: title-plugin\nVersion: 1.0\n')
+        (dist / 'entry_points.txt').write_text(
+            f'[{scorer_registry.ENTRY_POINT_GROUP}]\ntitle = title_plugin:TitleScorer\n'
+            'security = title_plugin:TitleScorer\n')
+
+        sys.path.insert(0, str(tmp))
+        self.addCleanup(sys.path.remove, str(tmp))
+        self.addCleanup(setattr, scorer_registry, '_plugins_discovered', False)
+        scorer_registry._plugins_discovered = False
+
+        self.assertIn('title', scorer_registry.scorer_names())
+        # Built-in names cannot be replaced by a plugin
+        self.assertEqual(SCORERS['security'], self.registered['security'])
+        results = OpenAPIScorer(self.spec, only=['title']).score_all()
+        self.assertEqual(results['total']['score'], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,65 @@ class TestSchemaTypesScorer(unittest.TestCase):
         self.assertEqual(result, scorer.max_score)
         self.assertEqual(len(scorer.issues), 0)
 
+    def test_nested_and_inline_schemas(self):
+        self.spec['components']['schemas'] = {
+            'Pet': {
+                'type': 'object',
+                'properties': {
+                    'name': {'type': 'string'},
+                    'tags': {'type': 'array', 'items': {'properties': {'label': {'type': 'string'}}}},
+                    'owner': {'$ref': '#/components/schemas/Pet'},
+                    'kind': {'enum': ['cat', 'dog']}
+                },
+                'additionalProperties': {'description': 'anything described'},
+                'allOf': [{'$ref': '#/x-shared/Base'}, {'required': ['name']}]
+            }
+        }
+        self.spec['x-shared'] = {'Base': {'type': 'object', 'properties': {'id': {'format': 'uuid'}}}}
+        content = self.spec['paths']['/pets']['get']['requestBody']['content']
+        content['application/json']['schema'] = {'properties': {'id': {'$ref': '#/x-shared/Base'}}}
+        self.spec['paths']['/pets']['get']['responses'] = {'200': {'content': {'application/json': {
+            'schema': {'type': 'array', 'items': {'required': ['id']}}
+        }}}}
+
+        scorer = SchemaTypesScorer(self.spec)
+        scorer.score()
+        self.assertEqual([issue.to_dict()['location'] for issue in scorer.issues], [
+            'components.schemas.Pet.properties.tags.items',
+            'components.schemas.Pet.additionalProperties',
+            'components.schemas.Pet.allOf[1]',
+            'x-shared.Base.properties.id',
+            'paths./pets.get.parameters.offset',
+            'paths./pets.get.requestBody.content.application/json.schema',
+            'paths./pets.get.requestBody.content.application/xml',
+            'paths./pets.get.responses.200.content.application/json.schema.items',
+        ])
+        # The shared target was checked once, although two schemas refer to it
+        self.assertEqual(scorer.num_schemas, 2)
+
+    def test_deep_schemas_do_not_recurse(self):
+        schema = {'format': 'date'}
+        for _ in range(5000):
+            schema = {'type': 'object', 'properties': {'child': schema}}
+        self.spec['components']['schemas'] = {'Deep': schema}
+
+        scorer = SchemaTypesScorer(self.spec)
+        scorer.score()
+        self.assertEqual(scorer.issues[0].location, ('components', 'schemas', 'Deep') + ('properties', 'child') * 5000)
+
+    def test_partials_carry_pending_refs(self):
+        scorer = SchemaTypesScorer(self.spec)
+        scorer.pending_refs.extend(['#/definitions/A', '#/definitions/B'])
+        partial = scorer.take_partial()
+        # The partial holds its own copy; the scorer starts a new list
+        self.assertEqual(partial[1][-1], ('#/definitions/A', '#/definitions/B'))
+        self.assertEqual(scorer.pending_refs, [])
+
+        scorer.merge_partial(partial)
+        scorer.merge_partials([partial, partial])
+        self.assertEqual(scorer.pending_refs, ['#/definitions/A', '#/definitions/B'] * 3)
+        self.assertEqual(partial[1][-1], ('#/definitions/A', '#/definitions/B'))
+
 
 class TestDescriptionsScorer(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.open_api_scorer import OpenAPIScorer
+from app.service import ScoringService, score_content
+from benchmarks.spec_generator import generate_spec
+
+
+class TestScoringServiceHttp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ScoringService(workers=1)
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        host, port = asyncio.run_coroutine_threadsafe(cls.service.start('127.0.0.1', 0), cls.loop).result(60)
+        cls.base = f'http://{host}:{port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.service.close(), cls.loop).result(10)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(10)
+
+    def request(self, path, body=None):
+        request = urllib.request.Request(self.base + path, data=body, method='POST' if body is not None else 'GET')
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_scores_like_score_all_and_caches(self):
+        spec = generate_spec(10, seed=5)
+        body = json.dumps(spec).encode()
+
+        status, results = self.request('/score', body)
+        self.assertEqual(status, 200)
+        self.assertEqual(results, OpenAPIScorer(spec).score_all())
+
+        hits = self.service.stats['cache_hits']
+        self.assertEqual(self.request('/score', body), (200, results))
+        self.assertEqual(self.service.stats['cache_hits'], hits + 1)
+
+        status, metrics = self.request('/metrics')
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics['cache_entries'], 1)
+
+    def test_health_and_errors(self):
+        self.assertEqual(self.request('/health'), (200, {'status': 'ok', 'workers': 1}))
+        self.assertEqual(self.request('/nowhere')[0], 404)
+        self.assertEqual(self.request('/score')[0], 405)
+
+        status, payload = self.request('/score', b'openapi: 2.0.0\ninfo: {}\n')
+        self.assertEqual(status, 422)
+        self.assertEqual(payload['error'], 'Validation failed')
+
+
+class TestScoringServiceLimits(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def slow_service(self, **options):
+        def slow(source, content):
+            time.sleep(0.3)
+            return score_content(source, content)
+
+        service = ScoringService(workers=2, executor=ThreadPoolExecutor(2), **options)
+        service.score_function = slow
+        return service
+
+    def test_timeout(self):
+        service = self.slow_service(timeout=0.05)
+
+        async def run():
+            return await service.handle('POST', '/score', json.dumps(generate_spec(1)).encode())
+
+        status, payload, _ = asyncio.run(run())
+        self.assertEqual(status, 504)
+        self.assertEqual(service.stats['timeouts'], 1)
+
+    def test_backpressure_and_shared_jobs(self):
+        service = self.slow_service(max_pending=1)
+        first = json.dumps(generate_spec(1, seed=1)).encode()
+        second = json.dumps(generate_spec(1, seed=2)).encode()
+
+        async def run():
+            return await asyncio.gather(
+                service.handle('POST', '/score', first),
+                service.handle('POST', '/score', first),
+                service.handle('POST', '/score', second),
+            )
+
+        (a, _, _), (b, _, _), (c, _, headers) = asyncio.run(run())
+        self.assertEqual((a, b, c), (200, 200, 503))
+        self.assertEqual(headers, {'Retry-After': '1'})
+        self.assertEqual(service.stats['shared'], 1)
+
+    def test_file_references_stay_under_root(self):
+        (self.tmp / 'spec.json').write_text(json.dumps(generate_spec(2)))
+        service = ScoringService(workers=1, executor=ThreadPoolExecutor(1), spec_root=str(self.tmp))
+        disabled = ScoringService(workers=1, executor=ThreadPoolExecutor(1))
+
+        async def run():
+            return (await service.handle('POST', '/score?path=spec.json', b''),
+                    await service.handle('POST', '/score?path=../etc/passwd', b''),
+                    await disabled.handle('POST', '/score?path=spec.json', b''))
+
+        ok, outside, off = asyncio.run(run())
+        self.assertEqual(ok[0], 200)
+        self.assertEqual(outside[0], 403)
+        self.assertEqual(off[0], 403)
+
+    def test_external_refs_stay_under_root(self):
+        secret = self.tmp / 'secret'
+        secret.mkdir()
+        (secret / 'pet.json').write_text(json.dumps({'Pet': {'type': 'object'}}))
+        root = self.tmp / 'root'
+        root.mkdir()
+        (root / 'pet.json').write_text(json.dumps({'Pet': {'type': 'object'}}))
+
+        def spec_using(ref):
+            spec = generate_spec(2)
+            spec['components']['schemas']['Ref'] = {'$ref': ref}
+            return json.dumps(spec)
+
+        (root / 'inside.json').write_text(spec_using('pet.json#/Pet'))
+        (root / 'outside.json').write_text(spec_using('../secret/pet.json#/Pet'))
+        (root / 'remote.json').write_text(spec_using('http://169.254.169.254/pet.json#/Pet'))
+        service = ScoringService(workers=1, executor=ThreadPoolExecutor(1), spec_root=str(root))
+        posted = spec_using(str(secret / 'pet.json') + '#/Pet').encode()
+
+        async def run():
+            return [(await service.handle('POST', f'/score?path={name}.json', b''))[1]
+                    for name in ('inside', 'outside', 'remote')] + [(await service.handle('POST', '/score', posted))[1]]
+
+        inside, outside, remote, request = asyncio.run(run())
+        # A $ref that is not followed leaves the component without a type
+        def untyped(results):
+            return 'components.schemas.Ref' in [issue['location'] for issue in results['schema_types']['issues']]
+
+        self.assertFalse(untyped(inside))
+        self.assertTrue(untyped(outside))
+        self.assertTrue(untyped(remote))
+        self.assertTrue(untyped(request))
+
+    def test_cached_results_follow_referenced_files(self):
+        (self.tmp / 'pet.json').write_text(json.dumps({'Pet': {'type': 'object'}}))
+        spec = generate_spec(2)
+        spec['components']['schemas']['Ref'] = {'$ref': 'pet.json#/Pet'}
+        (self.tmp / 'spec.json').write_text(json.dumps(spec))
+        service = ScoringService(workers=1, executor=ThreadPoolExecutor(1), spec_root=str(self.tmp))
+
+        def untyped():
+            status, results, _ = asyncio.run(service.handle('POST', '/score?path=spec.json', b''))
+            self.assertEqual(status, 200)
+            return 'components.schemas.Ref' in [issue['location'] for issue in results['schema_types']['issues']]
+
+        self.assertFalse(untyped())
+        self.assertFalse(untyped())
+        self.assertEqual(service.stats['cache_hits'], 1)
+
+        # Only the referenced file changes; the spec itself is the same
+        (self.tmp / 'pet.json').write_text(json.dumps({'Pet': {'description': 'no type'}}))
+        self.assertTrue(untyped())
+        self.assertEqual(service.stats['scored'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
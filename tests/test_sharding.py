@@ -0,0 +1,39 @@
+import json
+import pickle
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import sharding
+from app.issues import Index, Issue, IssueCode
+from app.open_api_scorer import OpenAPIScorer
+from app.sharding import score_sharded
+from benchmarks.spec_generator import generate_spec
+
+
+class TestShardedScoring(unittest.TestCase):
+    def setUp(self):
+        self.sample = json.loads((Path(__file__).parent.parent / 'samples' / 'sample1.json').read_text())
+
+    def test_matches_single_process(self):
+        for spec in (self.sample, generate_spec(40, seed=7)):
+            expected = OpenAPIScorer(spec).score_all()
+            with mock.patch.object(sharding, 'MIN_PATHS_PER_WORKER', 1):
+                self.assertEqual(score_sharded(spec, workers=2, shard_size=3), expected)
+            self.assertEqual(score_sharded(spec, workers=1), expected)
+
+    def test_selection(self):
+        spec = generate_spec(20, seed=8)
+        expected = OpenAPIScorer(spec, only=['descriptions', 'response_codes']).score_all()
+        with mock.patch.object(sharding, 'MIN_PATHS_PER_WORKER', 1):
+            self.assertEqual(score_sharded(spec, workers=2, only=['descriptions', 'response_codes']), expected)
+
+    def test_issue_pickles(self):
+        issue = Issue(IssueCode.MISSING_EXPECTED_RESPONSE, ('paths', '/a', 'get', Index(0)), ('200', 'GET'))
+        copy = pickle.loads(pickle.dumps(issue))
+        self.assertEqual(copy, issue)
+        self.assertIsInstance(copy.location[3], Index)
+
+
+if __name__ == '__main__':
+    unittest.main()
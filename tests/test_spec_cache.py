@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import validator
+from app.spec_cache import SpecCache
+from app.validator import OpenAPIValidator, parse_spec_content
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_unchanged_content_skips_parsing(self):
+        spec_path = self.tmp / 'spec.yaml'
+        spec_path.write_text('openapi: 3.0.0\ninfo: {title: T, version: "1"}\npaths: {}\n')
+        cache = SpecCache(self.tmp / 'cache')
+
+        first, error = OpenAPIValidator.load_openapi_spec(spec_path, cache)
+        self.assertIsNone(error)
+
+        with mock.patch.object(validator, 'parse_spec_content') as parse:
+            second, _ = OpenAPIValidator.load_openapi_spec(spec_path, cache)
+            parse.assert_not_called()
+        self.assertEqual(first, second)
+
+        spec_path.write_text('openapi: 3.1.0\ninfo: {title: T, version: "1"}\npaths: {}\n')
+        third, _ = OpenAPIValidator.load_openapi_spec(spec_path, cache)
+        self.assertEqual(third['openapi'], '3.1.0')
+
+    def test_evicts_least_recently_used(self):
+        cache = SpecCache(self.tmp / 'cache', max_bytes=2500)
+        payload = 'x' * 1000
+        cache.put('old', payload)
+        cache.put('recent', payload)
+        os.utime(cache.directory / 'old.pickle', (0, 0))
+
+        cache.put('new', payload)
+
+        self.assertIsNone(cache.get('old'))
+        self.assertEqual(cache.get('recent'), payload)
+        self.assertEqual(cache.get('new'), payload)
+
+    def test_directory_is_scanned_only_past_the_limit(self):
+        cache = SpecCache(self.tmp / 'cache', max_bytes=20000)
+        evict = cache.evict
+        with mock.patch.object(cache, 'evict', side_effect=evict) as scans:
+            for index in range(30):
+                cache.put(str(index), 'x' * 1000)
+        # Once to learn the size, then each time the running total crosses the limit
+        self.assertLessEqual(scans.call_count, 1 + 6)
+        self.assertLessEqual(sum(entry.stat().st_size for entry in cache.directory.glob('*.pickle')), 20000)
+        self.assertIsNone(cache.get('0'))
+        self.assertEqual(cache.get('29'), 'x' * 1000)
+
+    def test_content_sniffing(self):
+        self.assertEqual(parse_spec_content('  {"a": [1, 2]}'), {'a': [1, 2]})
+        self.assertEqual(parse_spec_content('a: [1, 2]\n'), {'a': [1, 2]})
+        # Flow-style YAML that is not valid JSON still parses
+        self.assertEqual(parse_spec_content('{a: 1}'), {'a': 1})
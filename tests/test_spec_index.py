@@ -0,0 +1,42 @@
+import unittest
+
+from app.spec_index import SpecIndex, CRUD_METHODS
+
+
+class TestSpecIndex(unittest.TestCase):
+    def setUp(self):
+        self.spec = {
+            'paths': {
+                '/pets': {
+                    'parameters': [],
+                    'get': {
+                        'parameters': [
+                            {'name': 'limit', 'schema': {'type': 'integer'}},
+                            {'name': 'offset'}
+                        ],
+                        'responses': {
+                            '200': {'content': {'application/json': {}}},
+                            '500': {}
+                        }
+                    },
+                    'POST': {
+                        'requestBody': {'content': {'application/xml': {}}},
+                        'responses': {'201': {}}
+                    },
+                    'options': {'responses': {'200': {}}}
+                }
+            }
+        }
+        self.index = SpecIndex(self.spec)
+
+    def test_indexes_only_http_methods(self):
+        self.assertEqual([entry.verb for entry in self.index.operations], ['get', 'post', 'options'])
+        self.assertEqual(len(self.index.operations_for(CRUD_METHODS)), 2)
+
+    def test_queries(self):
+        self.assertEqual([entry.method for entry in self.index.operations_lacking_response('500')],
+                         ['POST', 'options'])
+        self.assertEqual([entry.param['name'] for entry in self.index.parameters_without('schema')], ['offset'])
+        self.assertEqual(len(self.index.responses_by_code['200']), 2)
+        self.assertEqual(list(self.index.media_types_by_type), ['application/json', 'application/xml'])
+        self.assertIsNone(self.index.media_types_by_type['application/xml'][0].code)
@@ -0,0 +1,112 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import yaml
+
+from app import spec_stream
+from app.open_api_scorer import OpenAPIScorer
+from app.spec_stream import StreamingSpec, score_streaming
+
+
+def build_spec(num_paths):
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Big', 'version': '1.0'},
+        'paths': {
+            f'/items{i}': {
+                'get': {
+                    'description': 'List' if i % 2 else '',
+                    'parameters': [{'name': 'limit', 'description': 'x' * 200}],
+                    'responses': {'200': {'description': 'OK', 'content': {'application/json': {
+                        'schema': {'$ref': '#/components/schemas/Item'}}}}}
+                }
+            } for i in range(num_paths)
+        },
+        # Deliberately after paths: the skeleton pass must still see it
+        'components': {'schemas': {'Item': {'type': 'object'}, 'Untyped': {}}}
+    }
+
+
+class TestStreamingSpec(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_matches_full_load_for_json_and_yaml(self):
+        spec = build_spec(50)
+        expected = OpenAPIScorer(spec).score_all()
+
+        json_path = self.tmp / 'spec.json'
+        json_path.write_text(json.dumps(spec, indent=1))
+        yaml_path = self.tmp / 'spec.yaml'
+        yaml_path.write_text(yaml.safe_dump(spec, sort_keys=False))
+
+        for path in (json_path, yaml_path):
+            results, error = score_streaming(path)
+            self.assertIsNone(error)
+            self.assertEqual(results, expected)
+
+    def test_empty_paths(self):
+        spec = build_spec(0)
+        expected = OpenAPIScorer(spec).score_all()
+        json_path = self.tmp / 'spec.json'
+        json_path.write_text(json.dumps(spec))
+        yaml_path = self.tmp / 'spec.yaml'
+        yaml_path.write_text(yaml.safe_dump(spec, sort_keys=False))
+
+        for path in (json_path, yaml_path):
+            results, error = score_streaming(path)
+            self.assertIsNone(error)
+            self.assertEqual(results, expected)
+
+    def test_cli_errors_go_to_stderr(self):
+        path = self.tmp / 'spec.json'
+        path.write_text(json.dumps({'info': {'title': 'No version'}, 'paths': {}}))
+        result = subprocess.run([sys.executable, '-m', 'app.main', str(path), '--stream'],
+                                cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stdout, '')
+        self.assertIn('Error: ', result.stderr)
+
+    def test_small_buffer_and_skeleton(self):
+        json_path = self.tmp / 'spec.json'
+        json_path.write_text(json.dumps(build_spec(20)))
+        original = spec_stream.CHUNK_SIZE
+        spec_stream.CHUNK_SIZE = 7
+        try:
+            stream = StreamingSpec(json_path)
+            skeleton = stream.load_skeleton()
+            items = list(stream.iter_paths())
+        finally:
+            spec_stream.CHUNK_SIZE = original
+
+        self.assertNotIn('paths', skeleton)
+        self.assertIn('components', skeleton)
+        self.assertEqual(stream.num_paths, 20)
+        self.assertEqual([path for path, _ in items][:2], ['/items0', '/items1'])
+
+    def test_peak_memory_is_bounded_by_path_item(self):
+        spec = build_spec(400)
+        for path_item in spec['paths'].values():
+            path_item['get']['summary'] = 'x' * 10000
+        json_path = self.tmp / 'spec.json'
+        json_path.write_text(json.dumps(spec))
+
+        OpenAPIScorer({}).score_all()  # warm up imports outside the measurement
+        tracemalloc.start()
+        score_streaming(json_path)
+        _, streaming_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        OpenAPIScorer(json.loads(json_path.read_text())).score_all()
+        _, full_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertLess(streaming_peak, full_peak / 3)
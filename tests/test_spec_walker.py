@@ -0,0 +1,59 @@
+import json
+import unittest
+from pathlib import Path
+
+from app.open_api_scorer import OpenAPIScorer
+from app.scoring_strategy import ScoringStrategy
+from app.spec_index import CRUD_METHODS
+from app.spec_walker import SpecWalker
+
+
+class RecordingScorer(ScoringStrategy):
+    operation_methods = CRUD_METHODS
+
+    def begin(self):
+        super().begin()
+        self.visited = []
+
+    def visit_path(self, path, path_item):
+        self.visited.append(('path', path))
+
+    def visit_operation(self, path, method, operation):
+        self.visited.append(('operation', path, method))
+
+    def visit_response(self, path, method, code, response):
+        self.visited.append(('response', path, method, code))
+
+    def finish(self):
+        return 0
+
+
+class TestSpecWalker(unittest.TestCase):
+    def setUp(self):
+        self.spec = {
+            'paths': {
+                '/pets': {
+                    'summary': 'Pets',
+                    'get': {'responses': {'200': {}, '500': {}}},
+                    'head': {'responses': {'200': {}}}
+                }
+            }
+        }
+
+    def test_dispatches_only_filtered_methods(self):
+        scorer = RecordingScorer(self.spec)
+        SpecWalker(self.spec).walk([scorer])
+
+        self.assertEqual(scorer.visited, [
+            ('path', '/pets'),
+            ('operation', '/pets', 'get'),
+            ('response', '/pets', 'get', '200'),
+            ('response', '/pets', 'get', '500'),
+        ])
+
+    def test_single_pass_matches_individual_scorers(self):
+        spec = json.loads((Path(__file__).parent.parent / 'samples' / 'sample1.json').read_text())
+        results = OpenAPIScorer(spec).score_all()
+
+        for name, scorer in OpenAPIScorer(spec).scorers.items():
+            self.assertEqual(results[name], scorer.get_result())
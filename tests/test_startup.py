@@ -0,0 +1,57 @@
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.scorer_registry import SCORERS
+
+# Cumulative `-X importtime` of app.main, best of several runs. It was ~180ms
+# with yaml, urllib.request and every scorer imported eagerly.
+STARTUP_BUDGET_MS = 120
+HEAVY_MODULES = ['yaml', 'urllib.request', 'http.client', 'tracemalloc', 'tempfile']
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_python(code, *args):
+    return subprocess.run([sys.executable, *args, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+class TestStartup(unittest.TestCase):
+    def test_cli_import_skips_heavy_modules(self):
+        modules = HEAVY_MODULES + [target.partition(':')[0] for target in SCORERS.values()]
+        code = f'import sys, app.main; print([m for m in {modules!r} if m in sys.modules])'
+        self.assertEqual(run_python(code).stdout.strip(), '[]')
+
+    def test_json_spec_is_scored_without_yaml(self):
+        spec = {'openapi': '3.0.0', 'info': {'title': 'T', 'version': '1'}, 'paths': {}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'spec.json'
+            path.write_text(json.dumps(spec))
+            code = ('import sys; sys.argv = ["app.main", sys.argv[1]]; from app.main import main; main(); '
+                    'print("yaml" in sys.modules)')
+            result = subprocess.run([sys.executable, '-c', code, str(path)], cwd=ROOT,
+                                    capture_output=True, text=True, check=True)
+        self.assertTrue(result.stdout.endswith('False\n'))
+        self.assertIn('"total"', result.stdout)
+
+    def test_import_time_budget(self):
+        timings = []
+        for _ in range(3):
+            stderr = run_python('import app.main', '-X', 'importtime').stderr
+            timings.append(int(re.search(r'\|\s*(\d+) \| app\.main$', stderr, re.M).group(1)) / 1000)
+        self.assertLess(min(timings), STARTUP_BUDGET_MS,
+                        f'importing app.main took {min(timings):.1f}ms (budget {STARTUP_BUDGET_MS}ms)')
+
+    def test_legacy_scorer_imports(self):
+        from app.open_api_scorer import SchemaTypesScorer
+        from app.schema_types_scorer import SchemaTypesScorer as direct
+        self.assertIs(SchemaTypesScorer, direct)
+        with self.assertRaises(ImportError):
+            from app.open_api_scorer import NoSuchScorer  # noqa: F401
+
+
+if __name__ == '__main__':
+    unittest.main()
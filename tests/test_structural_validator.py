@@ -0,0 +1,142 @@
+import copy
+import random
+import unittest
+from unittest import mock
+
+from app.batch import score_source
+from app.budgets import UNLIMITED
+from app.open_api_scorer import OpenAPIScorer
+from app.structural_validator import find_errors
+from app.validator import OpenAPIValidator
+from benchmarks.spec_generator import generate_spec
+from benchmarks.validator_bench import interpret
+
+
+def minimal_spec(version='3.0.3'):
+    return {
+        'openapi': version,
+        'info': {'title': 'Pets', 'version': '1.0'},
+        'paths': {
+            '/pets/{id}': {
+                'get': {
+                    'parameters': [{'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'string'}}],
+                    'responses': {'200': {'description': 'A pet'}}
+                }
+            }
+        },
+        'components': {'schemas': {'Pet': {'type': 'object', 'properties': {'name': {'type': 'string'}}}}}
+    }
+
+
+class TestStructuralValidator(unittest.TestCase):
+    def test_valid_specs_have_no_errors(self):
+        self.assertEqual(OpenAPIValidator.validate_structure(minimal_spec()), [])
+        self.assertEqual(OpenAPIValidator.validate_structure(minimal_spec('3.1.0')), [])
+
+    def test_errors_carry_their_location(self):
+        spec = minimal_spec()
+        operation = spec['paths']['/pets/{id}']['get']
+        operation['parameters'][0]['required'] = False
+        operation['parameters'].append({'name': 'q', 'in': 'body', 'schema': {'type': 'string'}})
+        operation['responses']['200'] = {}
+        operation['deprecated'] = 'yes'
+        operation['colour'] = 'red'
+        operation['x-internal'] = True
+        spec['components']['schemas']['Pet']['properties']['tags'] = {'type': 'array'}
+        spec['components']['schemas']['Bad name'] = {'$ref': '#/components/schemas/Missing'}
+
+        self.assertEqual(OpenAPIValidator.validate_structure(spec), [
+            "paths./pets/{id}.get.parameters[0].required: path parameters must have 'required: true'",
+            'paths./pets/{id}.get.parameters[1].in: must be one of: query, header, path, cookie',
+            "paths./pets/{id}.get.responses.200: missing required field 'description'",
+            'paths./pets/{id}.get.deprecated: must be a boolean',
+            'paths./pets/{id}.get.colour: unknown field',
+            "components.schemas.Pet.properties.tags: schemas of type 'array' must define 'items'",
+            'components.schemas.Bad name: keys must match ^[a-zA-Z0-9.\\-_]+$',
+            'components.schemas.Bad name.$ref: Unresolvable $ref: #/components/schemas/Missing',
+        ])
+
+    def test_versions_differ(self):
+        spec = minimal_spec()
+        spec['components']['schemas']['Pet']['type'] = ['object', 'null']
+        spec['components']['schemas']['Any'] = True
+        del spec['paths']
+        errors_30 = OpenAPIValidator.validate_structure(spec)
+        self.assertIn("missing required field 'paths'", errors_30)
+        self.assertIn('components.schemas.Pet.type: must be one of: array, boolean, integer, number, object, string',
+                      errors_30)
+        self.assertIn('components.schemas.Any: must be an object (Schema)', errors_30)
+
+        spec['openapi'] = '3.1.0'
+        self.assertEqual(OpenAPIValidator.validate_structure(spec), [])
+
+    def test_circular_refs(self):
+        spec = minimal_spec()
+        spec['components']['responses'] = {
+            'A': {'$ref': '#/components/responses/B'},
+            'B': {'$ref': '#/components/responses/A'}
+        }
+        errors = OpenAPIValidator.validate_structure(spec)
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(all('Circular $ref' in error for error in errors))
+
+    def test_compiled_matches_interpreted(self):
+        spec = generate_spec(60, deficiency=0.5)
+        self.assertTrue(find_errors(spec))
+        self.assertEqual(find_errors(spec), interpret(spec))
+
+    def test_never_crashes_on_malformed_specs(self):
+        rng = random.Random(7)
+        junk = [None, 1, True, 'x', [], {}, [1, {}], {'$ref': 3}, {1: 'a'}]
+        base = generate_spec(5, deficiency=0.5)
+        for _ in range(300):
+            spec = copy.deepcopy(base)
+            for _ in range(3):
+                node = spec
+                while isinstance(node, (dict, list)) and node and rng.random() < 0.8:
+                    key = rng.choice(list(node) if isinstance(node, dict) else range(len(node)))
+                    if not isinstance(node[key], (dict, list)) or not node[key]:
+                        node[key] = rng.choice(junk)
+                        break
+                    node = node[key]
+            self.assertEqual(find_errors(spec), interpret(spec))
+
+
+class TestBasicValidation(unittest.TestCase):
+    def test_wrong_types_are_reported_not_raised(self):
+        errors = OpenAPIValidator.validate_spec_dict({'openapi': 3.0, 'info': 'API', 'paths': {}})
+        self.assertEqual(errors, ["'openapi' must be a string", "'info' must be an object"])
+
+    def test_unnamed_parameters_are_scored(self):
+        spec = minimal_spec()
+        spec['paths']['/pets/{id}']['get']['parameters'].append({'in': 'query'})
+        results = OpenAPIScorer(spec).score_all()
+        locations = [issue['location'] for issue in results['descriptions']['issues']]
+        self.assertIn('paths./pets/{id}.get.parameters.<unnamed>', locations)
+
+    def test_strict_batch_entries(self):
+        spec = minimal_spec()
+        self.assertIn('results', score_source('inline', (spec, None), strict=True))
+        spec['info']['contact'] = []
+        entry = score_source('inline', (spec, None), strict=True)
+        self.assertEqual(entry['validation_errors'], ['info.contact: must be an object (Contact)'])
+        self.assertIn('results', score_source('inline', (spec, None)))
+
+    def test_batch_entries_for_specs_too_deep_to_check(self):
+        spec = minimal_spec()
+        deep = {'type': 'string'}
+        for _ in range(5000):
+            deep = {'type': 'object', 'properties': {'child': deep}}
+        spec['components'] = {'schemas': {'Deep': deep}}
+        errors = ['Spec structure could not be checked : RecursionError']
+
+        entry = score_source('inline', (spec, None), strict=True, budget=UNLIMITED)
+        self.assertEqual(entry['validation_errors'], errors)
+        with mock.patch.object(OpenAPIScorer, 'score_all', side_effect=KeyError('paths')):
+            entry = score_source('inline', (spec, None), budget=UNLIMITED)
+        self.assertEqual(entry['error'], "Failed to score : 'paths'")
+        self.assertEqual(entry['validation_errors'], errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from app.structure import _iterative_repr, structure_repr
+
+
+class TestStructureRepr(unittest.TestCase):
+    def test_matches_repr(self):
+        shared = {'type': 'string'}
+        node = {'a': [1, '1', 1.5, None, True, shared, shared, [], {}], 200: {'b': (1, 2)}, '200': 'x'}
+        recursive = {'name': 'loop', 'items': []}
+        recursive['items'].append(recursive)
+        for value in (node, recursive, [recursive, [recursive]], 'plain', 3):
+            self.assertEqual(_iterative_repr(value), repr(value))
+
+    def test_any_depth(self):
+        deep = {'type': 'string'}
+        for _ in range(100000):
+            deep = {'properties': {'a': deep}}
+        text = structure_repr(deep)
+        self.assertTrue(text.startswith("{'properties': {'a': {'properties'"))
+        self.assertTrue(text.endswith("{'type': 'string'}" + '}}' * 100000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app.batch import score_source
+from app.open_api_scorer import OpenAPIScorer
+from app.watch import FileWatcher, WatchSession, issue_diff, watch
+
+SAMPLE = Path(__file__).parent.parent / 'samples' / 'sample1.json'
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'spec.json'
+        self.path.write_text('{}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_later(self, *contents, delay=0.05, gap=0.02, replace=False):
+        def run():
+            time.sleep(delay)
+            for content in contents:
+                if replace:
+                    # Like editors that save to a temporary file and rename it over the original
+                    temporary = self.path.with_suffix('.tmp')
+                    temporary.write_text(content)
+                    os.replace(temporary, self.path)
+                else:
+                    self.path.write_text(content)
+                time.sleep(gap)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def check_watcher(self, watcher):
+        try:
+            self.assertFalse(watcher.wait(timeout=0.1))
+            # A burst of saves is reported once
+            thread = self.write_later('{"a": 1}', '{"a": 2}', '{"a": 3}')
+            self.assertTrue(watcher.wait(timeout=5))
+            thread.join()
+            self.assertFalse(watcher.wait(timeout=0.3))
+
+            thread = self.write_later('{"b": 1}', replace=True)
+            self.assertTrue(watcher.wait(timeout=5))
+            thread.join()
+        finally:
+            watcher.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_inotify(self):
+        watcher = FileWatcher(self.path, debounce=0.15)
+        self.assertFalse(watcher.polling)
+        self.check_watcher(watcher)
+
+    def test_polling(self):
+        watcher = FileWatcher(self.path, debounce=0.15, poll_interval=0.01, use_inotify=False)
+        self.assertTrue(watcher.polling)
+        self.check_watcher(watcher)
+
+    def check_referenced_file(self, watcher):
+        referenced = Path(self.tmp.name) / 'schemas' / 'pet.json'
+        referenced.parent.mkdir()
+        referenced.write_text('{}')
+        try:
+            watcher.watch_files([referenced])
+            self.assertFalse(watcher.wait(timeout=0.1))
+            thread = threading.Thread(target=lambda: (time.sleep(0.05), referenced.write_text('{"a": 1}')))
+            thread.start()
+            self.assertTrue(watcher.wait(timeout=5))
+            thread.join()
+        finally:
+            watcher.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_referenced_files_with_inotify(self):
+        self.check_referenced_file(FileWatcher(self.path, debounce=0.05))
+
+    def test_referenced_files_with_polling(self):
+        self.check_referenced_file(FileWatcher(self.path, debounce=0.05, poll_interval=0.01, use_inotify=False))
+
+    def test_other_files_are_ignored(self):
+        watcher = FileWatcher(self.path, debounce=0.05)
+        try:
+            (Path(self.tmp.name) / 'other.json').write_text('{}')
+            self.assertFalse(watcher.wait(timeout=0.2))
+        finally:
+            watcher.close()
+
+
+class TestWatchSession(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'spec.json'
+        self.spec = json.loads(SAMPLE.read_text())
+        self.path.write_text(json.dumps(self.spec))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rescoring_reuses_unchanged_work(self):
+        session = WatchSession(self.path)
+        first = session.rescore()
+        self.assertEqual(first.pop('_watch')['rescored'], len(self.spec['paths']))
+        self.assertEqual(first, OpenAPIScorer(self.spec).score_all())
+
+        # Saved without changes: nothing to do
+        self.path.write_text(json.dumps(self.spec))
+        self.assertIsNone(session.rescore())
+
+        path = next(iter(self.spec['paths']))
+        self.spec['paths'][path]['get'].pop('description', None)
+        self.spec['info'].pop('description', None)
+        self.path.write_text(json.dumps(self.spec))
+        diff = session.rescore()
+        self.assertEqual(diff['_watch']['rescored'], 1)
+        self.assertEqual(diff['_watch']['reused'], len(self.spec['paths']) - 1)
+        self.assertEqual(diff['total']['score'], OpenAPIScorer(self.spec).score_all()['total']['score'])
+        self.assertIn({'category': 'descriptions', 'location': 'info', 'message': 'API missing general description',
+                       'severity': 'medium'}, diff['added'])
+        self.assertEqual(diff['resolved'], [])
+
+    def test_broken_saves_keep_the_last_results(self):
+        session = WatchSession(self.path)
+        session.rescore()
+        self.path.write_text('{"openapi": "3.0.0", "info": ')
+        self.assertTrue(session.rescore()['error'].startswith('Failed to load'))
+        self.assertIsNotNone(session.results)
+
+        self.path.write_text(json.dumps(self.spec))
+        diff = session.rescore()
+        self.assertEqual((diff['added'], diff['resolved'], diff['total']['change']), ([], [], 0))
+
+    def test_scoring_errors_keep_the_last_results(self):
+        session = WatchSession(self.path)
+        session.rescore()
+        previous = session.results
+        self.path.write_text(json.dumps({**self.spec, 'components': None}))
+        self.assertTrue(session.rescore()['error'].startswith('Failed to score'))
+        self.assertIs(session.results, previous)
+
+        self.path.write_text(json.dumps(self.spec))
+        diff = session.rescore()
+        self.assertEqual((diff['added'], diff['resolved'], diff['total']['change']), ([], [], 0))
+
+    def test_external_refs_are_bundled_and_followed(self):
+        schemas = Path(self.tmp.name) / 'schemas.json'
+        schemas.write_text(json.dumps({'Pet': {'type': 'object'}}))
+        self.spec.setdefault('components', {}).setdefault('schemas', {})['Pet'] = {'$ref': 'schemas.json#/Pet'}
+        self.path.write_text(json.dumps(self.spec))
+
+        session = WatchSession(self.path)
+        first = session.rescore()
+        first.pop('_watch')
+        self.assertEqual(first, score_source(str(self.path), external_refs=True)['results'])
+        self.assertEqual(session.files, [schemas.resolve()])
+        self.assertIsNone(session.rescore())
+
+        # An edit to the referenced file alone is a change to the spec
+        schemas.write_text(json.dumps({'Pet': {'description': 'No type'}}))
+        diff = session.rescore()
+        self.assertIn({'category': 'schema_types', 'location': 'components.schemas.Pet',
+                       'message': 'Schema missing type definition', 'severity': 'high'}, diff['added'])
+
+    def test_issue_diff(self):
+        before = OpenAPIScorer(self.spec).score_all()
+        self.assertEqual(issue_diff(before, before)['categories'], {})
+
+    def test_watch_loop(self):
+        class Changes:
+            def __init__(self, test):
+                self.test = test
+                self.closed = False
+
+            def wait(self, timeout=None):
+                self.test.spec['info']['title'] = 'Changed'
+                self.test.spec['servers'] = []
+                self.test.path.write_text(json.dumps(self.test.spec))
+                return True
+
+            def watch_files(self, paths):
+                pass
+
+            def close(self):
+                self.closed = True
+
+        out = io.StringIO()
+        watcher = Changes(self)
+        self.assertEqual(watch(self.path, out, watcher=watcher, max_runs=2), 0)
+        self.assertTrue(watcher.closed)
+        decoder, text, reports = json.JSONDecoder(), out.getvalue(), []
+        position = 0
+        while text[position:].strip():
+            report, position = decoder.raw_decode(text, position)
+            reports.append(report)
+            position += 1
+        self.assertEqual(len(reports), 2)
+        self.assertIn('descriptions', reports[0])
+        self.assertIn('added', reports[1])
+
+
+if __name__ == '__main__':
+    unittest.main()